@@ -1,6 +1,116 @@
 /**
  * Quizify Local Frontend Application
  */
+
+// Files at or above this size are uploaded in parallel, checksummed parts
+const MULTIPART_THRESHOLD = 16 * 1024 * 1024;
+const MULTIPART_PART_SIZE = 8 * 1024 * 1024;
+const MULTIPART_CONCURRENCY = 4;
+const MULTIPART_PART_RETRIES = 3;
+
+// Completed quizzes are cached in IndexedDB and revalidated with ETags
+const QUIZ_CACHE_DB = 'quizify';
+const QUIZ_CACHE_STORE = 'quizzes';
+
+// Question cards rendered per animation frame, so large quizzes don't block the page
+const RENDER_CHUNK_SIZE = 25;
+
+/**
+ * IndexedDB store of completed quizzes keyed by upload_id.
+ * Every method resolves (to null when unavailable) rather than rejecting,
+ * so the app works unchanged where IndexedDB is blocked.
+ */
+class QuizCache {
+    constructor() {
+        this.dbPromise = this.open();
+    }
+
+    open() {
+        return new Promise(resolve => {
+            try {
+                const request = indexedDB.open(QUIZ_CACHE_DB, 1);
+                request.onupgradeneeded = () => {
+                    request.result.createObjectStore(QUIZ_CACHE_STORE, { keyPath: 'upload_id' });
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+            } catch (error) {
+                resolve(null);
+            }
+        });
+    }
+
+    async get(uploadId) {
+        const db = await this.dbPromise;
+        if (!db) return null;
+
+        return new Promise(resolve => {
+            const request = db.transaction(QUIZ_CACHE_STORE).objectStore(QUIZ_CACHE_STORE).get(uploadId);
+            request.onsuccess = () => resolve(request.result || null);
+            request.onerror = () => resolve(null);
+        });
+    }
+
+    async put(uploadId, etag, data) {
+        const db = await this.dbPromise;
+        if (!db) return;
+
+        return new Promise(resolve => {
+            const transaction = db.transaction(QUIZ_CACHE_STORE, 'readwrite');
+            transaction.objectStore(QUIZ_CACHE_STORE).put({ upload_id: uploadId, etag, data, cached_at: Date.now() });
+            transaction.oncomplete = () => resolve();
+            transaction.onerror = () => resolve();
+        });
+    }
+}
+
+/**
+ * Page-level timings. Each measurement is also a performance.measure entry
+ * (visible in DevTools); run quizifyTimings.report() in the console for a summary.
+ */
+const pageTimings = {
+    samples: {},
+
+    start() {
+        return performance.now();
+    },
+
+    end(name, start) {
+        const duration = performance.now() - start;
+        (this.samples[name] = this.samples[name] || []).push(duration);
+        if (performance.measure) {
+            try {
+                performance.measure(`quizify:${name}`, { start, duration });
+            } catch (error) {
+                // Older browsers only support named marks
+            }
+        }
+        return duration;
+    },
+
+    report() {
+        const rows = {};
+        const navigation = performance.getEntriesByType('navigation')[0];
+        if (navigation) {
+            rows['page load'] = { count: 1, avg_ms: +navigation.duration.toFixed(1), p95_ms: +navigation.duration.toFixed(1), max_ms: +navigation.duration.toFixed(1) };
+        }
+
+        Object.entries(this.samples).forEach(([name, samples]) => {
+            const sorted = [...samples].sort((a, b) => a - b);
+            rows[name] = {
+                count: sorted.length,
+                avg_ms: +(sorted.reduce((sum, value) => sum + value, 0) / sorted.length).toFixed(1),
+                p95_ms: +sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * 0.95))].toFixed(1),
+                max_ms: +sorted[sorted.length - 1].toFixed(1)
+            };
+        });
+
+        console.table(rows);
+        return rows;
+    }
+};
+window.quizifyTimings = pageTimings;
+
 class QuizifyApp {
     constructor() {
         // DOM Elements
@@ -26,6 +136,9 @@ class QuizifyApp {
         // State
         this.selectedFile = null;
         this.currentUploadId = null;
+        this.quizCache = new QuizCache();
+        this.uploadItems = new Map();
+        this.renderToken = 0;
 
         // API URL - use config if available, otherwise fallback to localhost
         this.apiUrl = (typeof QUIZIFY_CONFIG !== 'undefined' && QUIZIFY_CONFIG.API_URL)
@@ -63,6 +176,14 @@ class QuizifyApp {
 
         // New upload button
         this.newUploadBtn.addEventListener('click', () => this.resetToUpload());
+
+        // Past uploads (one delegated handler, since items are updated in place)
+        this.pastUploadsContainer.addEventListener('click', (e) => {
+            const item = e.target.closest('.upload-item');
+            if (item) {
+                this.loadUploadQuestions(item.dataset.uploadId);
+            }
+        });
     }
 
     handleDragOver(e) {
@@ -119,32 +240,12 @@ class QuizifyApp {
         if (!this.selectedFile) return;
 
         try {
-            // Step 1: Get presigned URL
-            this.showStatus('Preparing upload...');
-            const presignedResponse = await fetch(`${this.apiUrl}/presigned-url?filename=${encodeURIComponent(this.selectedFile.name)}`);
-
-            if (!presignedResponse.ok) {
-                throw new Error('Failed to get upload URL');
-            }
-
-            const presignedData = await presignedResponse.json();
-            const { upload_url, upload_id } = presignedData;
+            // Steps 1-2: Upload file directly to S3
+            const upload_id = this.selectedFile.size >= MULTIPART_THRESHOLD
+                ? await this.uploadMultipart(this.selectedFile)
+                : await this.uploadSingle(this.selectedFile);
             this.currentUploadId = upload_id;
 
-            // Step 2: Upload file directly to S3
-            this.showStatus('Uploading file...');
-            const uploadResponse = await fetch(upload_url, {
-                method: 'PUT',
-                body: this.selectedFile,
-                headers: {
-                    'Content-Type': this.selectedFile.type || 'application/octet-stream'
-                }
-            });
-
-            if (!uploadResponse.ok) {
-                throw new Error('File upload failed');
-            }
-
             // Step 3: Poll for results
             this.showStatus('Processing and generating questions...');
             await this.pollForQuestions(upload_id);
@@ -156,6 +257,138 @@ class QuizifyApp {
         }
     }
 
+    async uploadSingle(file) {
+        // Step 1: Get presigned URL
+        this.showStatus('Preparing upload...');
+        const presignedResponse = await fetch(`${this.apiUrl}/presigned-url?filename=${encodeURIComponent(file.name)}`);
+
+        if (!presignedResponse.ok) {
+            throw new Error('Failed to get upload URL');
+        }
+
+        const { upload_url, upload_id } = await presignedResponse.json();
+
+        // Step 2: Upload file directly to S3
+        this.showStatus('Uploading file...');
+        const uploadResponse = await fetch(upload_url, {
+            method: 'PUT',
+            body: file,
+            headers: {
+                'Content-Type': file.type || 'application/octet-stream'
+            }
+        });
+
+        if (!uploadResponse.ok) {
+            throw new Error('File upload failed');
+        }
+
+        return upload_id;
+    }
+
+    async uploadMultipart(file) {
+        // Step 1: Checksum each part and get presigned part URLs
+        this.showStatus('Preparing upload...');
+        const partCount = Math.ceil(file.size / MULTIPART_PART_SIZE);
+        const blobs = Array.from({ length: partCount }, (_, i) =>
+            file.slice(i * MULTIPART_PART_SIZE, (i + 1) * MULTIPART_PART_SIZE));
+        const checksums = await this.mapWithConcurrency(blobs, MULTIPART_CONCURRENCY, blob => this.sha256Base64(blob));
+
+        const session = await this.postJson('/multipart-upload', {
+            filename: file.name,
+            size: file.size,
+            part_size: MULTIPART_PART_SIZE,
+            part_checksums: checksums
+        });
+
+        try {
+            // Step 2: Upload parts in parallel, retrying failed parts
+            let uploaded = 0;
+            this.showStatus(`Uploading file... 0/${partCount} parts`);
+
+            const parts = await this.mapWithConcurrency(session.parts, MULTIPART_CONCURRENCY, async (part, i) => {
+                const etag = await this.uploadPart(part.upload_url, blobs[i], checksums[i]);
+                uploaded++;
+                this.showStatus(`Uploading file... ${uploaded}/${partCount} parts`);
+                return { part_number: part.part_number, etag, checksum_sha256: checksums[i] };
+            });
+
+            await this.postJson('/multipart-upload/complete', {
+                s3_key: session.s3_key,
+                multipart_upload_id: session.multipart_upload_id,
+                parts
+            });
+        } catch (error) {
+            // Discard uploaded parts so they don't linger in the bucket
+            this.postJson('/multipart-upload/abort', {
+                s3_key: session.s3_key,
+                multipart_upload_id: session.multipart_upload_id
+            }).catch(abortError => console.error('Abort error:', abortError));
+            throw error;
+        }
+
+        return session.upload_id;
+    }
+
+    async uploadPart(url, blob, checksum) {
+        for (let attempt = 1; ; attempt++) {
+            try {
+                const response = await fetch(url, {
+                    method: 'PUT',
+                    body: blob,
+                    headers: { 'x-amz-checksum-sha256': checksum }
+                });
+
+                if (!response.ok) {
+                    throw new Error(`Part upload failed (${response.status})`);
+                }
+
+                return response.headers.get('ETag');
+
+            } catch (error) {
+                if (attempt >= MULTIPART_PART_RETRIES) {
+                    throw new Error('File upload failed');
+                }
+                await new Promise(resolve => setTimeout(resolve, 1000 * attempt));
+            }
+        }
+    }
+
+    async sha256Base64(blob) {
+        const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+        return btoa(String.fromCharCode(...new Uint8Array(digest)));
+    }
+
+    async mapWithConcurrency(items, limit, fn) {
+        // Run fn over items with at most `limit` calls in flight, keeping order
+        const results = new Array(items.length);
+        let next = 0;
+
+        const worker = async () => {
+            while (next < items.length) {
+                const index = next++;
+                results[index] = await fn(items[index], index);
+            }
+        };
+
+        await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+        return results;
+    }
+
+    async postJson(path, body) {
+        const response = await fetch(`${this.apiUrl}${path}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error || 'Request failed');
+        }
+
+        return data;
+    }
+
     async pollForQuestions(uploadId, maxAttempts = 60) {
         for (let attempt = 0; attempt < maxAttempts; attempt++) {
             try {
@@ -166,6 +399,8 @@ class QuizifyApp {
                     return;
                 } else if (data.status === 'failed') {
                     throw new Error(data.error || 'Question generation failed');
+                } else if (data.queue && data.queue.queued > 0) {
+                    this.showStatus(`Server is busy: ${data.queue.queued} uploads queued (about ${data.queue.estimated_wait_seconds}s wait)...`);
                 }
 
                 // Wait 2 seconds before next attempt
@@ -181,15 +416,33 @@ class QuizifyApp {
         throw new Error('Question generation timed out. Please try refreshing the page.');
     }
 
-    async fetchQuestions(uploadId) {
-        const response = await fetch(`${this.apiUrl}/questions/${uploadId}`);
+    async fetchQuestions(uploadId, cached = null) {
+        const start = pageTimings.start();
+        const response = await fetch(`${this.apiUrl}/questions/${uploadId}`, {
+            headers: cached ? { 'If-None-Match': cached.etag } : {}
+        });
+
+        // Cached copy is still current
+        if (response.status === 304 && cached) {
+            pageTimings.end('quiz fetch (not modified)', start);
+            return cached.data;
+        }
 
         if (!response.ok) {
             const error = await response.json();
             throw new Error(error.error || 'Failed to fetch questions');
         }
 
-        return response.json();
+        const data = await response.json();
+        pageTimings.end('quiz fetch', start);
+
+        // Only completed quizzes are cached; in-progress ones are still changing
+        const etag = response.headers.get('ETag');
+        if (data.status === 'completed' && etag) {
+            this.quizCache.put(uploadId, etag, data);
+        }
+
+        return data;
     }
 
     displayQuestions(data) {
@@ -202,28 +455,57 @@ class QuizifyApp {
         this.topicTitle.textContent = data.topic || 'Generated Questions';
         this.fileInfo.textContent = `From: ${data.filename} | ${data.total_questions} questions`;
 
-        // Display MCQs
-        this.mcqContainer.innerHTML = '';
-        if (data.mcqs && data.mcqs.length > 0) {
-            data.mcqs.forEach((mcq, index) => {
-                this.mcqContainer.appendChild(this.createMCQCard(mcq, index + 1));
-            });
-        } else {
-            this.mcqContainer.innerHTML = '<p class="empty-text">No MCQs generated</p>';
-        }
-
-        // Display short questions
-        this.shortContainer.innerHTML = '';
-        if (data.short_questions && data.short_questions.length > 0) {
-            data.short_questions.forEach((sq, index) => {
-                this.shortContainer.appendChild(this.createShortQuestionCard(sq, index + 1));
-            });
-        } else {
-            this.shortContainer.innerHTML = '<p class="empty-text">No short questions generated</p>';
-        }
+        // A newer render supersedes any still in progress
+        const token = ++this.renderToken;
+        const start = pageTimings.start();
 
         // Initialize tab switching
         this.initTabs();
+
+        return Promise.all([
+            this.renderCards(this.mcqContainer, data.mcqs, (mcq, number) => this.createMCQCard(mcq, number), 'No MCQs generated', token),
+            this.renderCards(this.shortContainer, data.short_questions, (sq, number) => this.createShortQuestionCard(sq, number), 'No short questions generated', token)
+        ]).then(() => {
+            if (token === this.renderToken) {
+                pageTimings.end('quiz render', start);
+            }
+        });
+    }
+
+    renderCards(container, items, createCard, emptyText, token) {
+        container.textContent = '';
+
+        if (!items || items.length === 0) {
+            container.innerHTML = `<p class="empty-text">${emptyText}</p>`;
+            return Promise.resolve();
+        }
+
+        // Build cards off-DOM in chunks, appending one fragment per frame
+        return new Promise(resolve => {
+            let index = 0;
+
+            const renderChunk = () => {
+                if (token !== this.renderToken) {
+                    resolve();
+                    return;
+                }
+
+                const fragment = document.createDocumentFragment();
+                const end = Math.min(index + RENDER_CHUNK_SIZE, items.length);
+                for (; index < end; index++) {
+                    fragment.appendChild(createCard(items[index], index + 1));
+                }
+                container.appendChild(fragment);
+
+                if (index < items.length) {
+                    requestAnimationFrame(renderChunk);
+                } else {
+                    resolve();
+                }
+            };
+
+            renderChunk();
+        });
     }
 
     createMCQCard(mcq, number) {
@@ -312,6 +594,7 @@ class QuizifyApp {
 
     async loadPastUploads() {
         try {
+            const start = pageTimings.start();
             const response = await fetch(`${this.apiUrl}/uploads`);
 
             if (!response.ok) {
@@ -319,48 +602,109 @@ class QuizifyApp {
             }
 
             const data = await response.json();
+            pageTimings.end('uploads fetch', start);
             this.displayPastUploads(data.uploads || []);
 
         } catch (error) {
             console.error('Error loading past uploads:', error);
-            this.pastUploadsContainer.innerHTML = '<p class="empty-text">Unable to load recent uploads</p>';
+            this.showPastUploadsMessage('Unable to load recent uploads');
         }
     }
 
     displayPastUploads(uploads) {
         if (uploads.length === 0) {
-            this.pastUploadsContainer.innerHTML = '<p class="empty-text">No uploads yet</p>';
+            this.showPastUploadsMessage('No uploads yet');
             return;
         }
 
-        this.pastUploadsContainer.innerHTML = uploads.map(upload => `
-            <div class="upload-item" data-upload-id="${upload.upload_id}">
-                <div class="upload-item-info">
-                    <div class="upload-item-name">${this.escapeHtml(upload.filename || 'Unknown file')}</div>
-                    <div class="upload-item-meta">${this.formatDate(upload.created_at)} ${upload.topic ? `- ${upload.topic}` : ''}</div>
-                </div>
-                <span class="upload-item-status ${upload.status}">${upload.status}</span>
-            </div>
-        `).join('');
+        const start = pageTimings.start();
+        this.pastUploadsContainer.querySelectorAll('.empty-text').forEach(el => el.remove());
+
+        // Update the list in place: create new items, patch changed ones,
+        // move only out-of-place ones and drop ones no longer listed
+        const listed = new Set();
+        let previous = null;
+
+        uploads.forEach(upload => {
+            listed.add(upload.upload_id);
+            const signature = [upload.filename, upload.created_at, upload.topic, upload.status].join('|');
+            let entry = this.uploadItems.get(upload.upload_id);
+
+            if (!entry) {
+                entry = { element: this.createUploadItem(upload), signature };
+                this.uploadItems.set(upload.upload_id, entry);
+            } else if (entry.signature !== signature) {
+                this.updateUploadItem(entry.element, upload);
+                entry.signature = signature;
+            }
 
-        // Add click handlers
-        this.pastUploadsContainer.querySelectorAll('.upload-item').forEach(item => {
-            item.addEventListener('click', () => {
-                const uploadId = item.dataset.uploadId;
-                this.loadUploadQuestions(uploadId);
-            });
+            const expected = previous ? previous.nextSibling : this.pastUploadsContainer.firstChild;
+            if (entry.element !== expected) {
+                this.pastUploadsContainer.insertBefore(entry.element, expected);
+            }
+            previous = entry.element;
         });
+
+        this.uploadItems.forEach((entry, uploadId) => {
+            if (!listed.has(uploadId)) {
+                entry.element.remove();
+                this.uploadItems.delete(uploadId);
+            }
+        });
+
+        pageTimings.end('uploads render', start);
+    }
+
+    showPastUploadsMessage(message) {
+        this.uploadItems.clear();
+        this.pastUploadsContainer.innerHTML = `<p class="empty-text">${message}</p>`;
+    }
+
+    createUploadItem(upload) {
+        const item = document.createElement('div');
+        item.className = 'upload-item';
+        item.dataset.uploadId = upload.upload_id;
+        item.innerHTML = `
+            <div class="upload-item-info">
+                <div class="upload-item-name"></div>
+                <div class="upload-item-meta"></div>
+            </div>
+            <span class="upload-item-status"></span>
+        `;
+        this.updateUploadItem(item, upload);
+        return item;
+    }
+
+    updateUploadItem(item, upload) {
+        item.querySelector('.upload-item-name').textContent = upload.filename || 'Unknown file';
+        item.querySelector('.upload-item-meta').textContent = `${this.formatDate(upload.created_at)} ${upload.topic ? `- ${upload.topic}` : ''}`;
+
+        const status = item.querySelector('.upload-item-status');
+        status.className = `upload-item-status ${upload.status}`;
+        status.textContent = upload.status;
     }
 
     async loadUploadQuestions(uploadId) {
         try {
-            this.showStatus('Loading questions...');
-            const data = await this.fetchQuestions(uploadId);
+            // Show a cached quiz immediately, then revalidate it
+            const cached = await this.quizCache.get(uploadId);
+            if (cached) {
+                this.displayQuestions(cached.data);
+            } else {
+                this.showStatus('Loading questions...');
+            }
+
+            const data = await this.fetchQuestions(uploadId, cached);
+            if (cached && data === cached.data) {
+                return;
+            }
 
             if (data.status === 'completed') {
                 this.displayQuestions(data);
             } else if (data.status === 'failed') {
                 this.showError(data.error || 'Question generation failed');
+            } else if (data.status === 'archived') {
+                this.showError(`This quiz was archived. Restore it with POST /uploads/${uploadId}/restore to view its questions.`);
             } else {
                 this.showStatus('Questions are still being generated...');
             }
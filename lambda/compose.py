@@ -0,0 +1,131 @@
+"""Cross-upload quiz composition, shared by the API handlers.
+
+Candidate questions come from the topic index (an SQLite index locally, a
+DynamoDB GSI on AWS) instead of a scan of the question bank. Only their IDs
+are read, and a reservoir sample picks the quiz from that stream, so just
+the chosen questions are loaded in full however many match.
+"""
+import random
+from typing import Callable, Iterable, List, Tuple
+
+from export import QUESTION_TYPES
+from utils import normalize_topic
+
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+MAX_COMPOSE_QUESTIONS = 100
+MAX_COMPOSE_TOPICS = 10
+
+# Candidates drawn per requested question, so questions repeated across
+# uploads (the same document uploaded twice) can be dropped
+OVERSAMPLE = 2
+
+
+def parse_compose_request(body: dict) -> dict:
+    """Validate a quiz composition request body.
+
+    Args:
+        body: topics (list) or topic, and optional type, difficulty, count
+            (default 10) and seed (for a reproducible quiz)
+
+    Returns:
+        dict with topics (normalized topic keys), type, difficulty, count and seed
+
+    Raises:
+        ValueError: If the body is invalid
+    """
+    body = body or {}
+    topics = body.get('topics', [body['topic']] if body.get('topic') else None)
+    if not isinstance(topics, list) or not topics or not all(isinstance(t, str) and t.strip() for t in topics):
+        raise ValueError("topics must be a non-empty list of topic names")
+    if len(topics) > MAX_COMPOSE_TOPICS:
+        raise ValueError(f"At most {MAX_COMPOSE_TOPICS} topics per quiz")
+
+    question_type = body.get('type')
+    if question_type is not None:
+        if not isinstance(question_type, str) or question_type.upper() not in QUESTION_TYPES:
+            raise ValueError(f"type must be one of: {', '.join(QUESTION_TYPES)}")
+        question_type = question_type.upper()
+
+    difficulty = body.get('difficulty')
+    if difficulty is not None:
+        if not isinstance(difficulty, str) or difficulty.lower() not in DIFFICULTIES:
+            raise ValueError(f"difficulty must be one of: {', '.join(DIFFICULTIES)}")
+        if question_type == 'MCQ':
+            raise ValueError("difficulty only applies to SHORT questions")
+        # Only short questions have a difficulty
+        difficulty, question_type = difficulty.lower(), 'SHORT'
+
+    count = body.get('count', 10)
+    if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= MAX_COMPOSE_QUESTIONS:
+        raise ValueError(f"count must be an integer between 1 and {MAX_COMPOSE_QUESTIONS}")
+
+    seed = body.get('seed')
+    if seed is not None and (not isinstance(seed, (int, str)) or isinstance(seed, bool)):
+        raise ValueError("seed must be an integer or string")
+
+    return {
+        'topics': list(dict.fromkeys(normalize_topic(t) for t in topics)),
+        'type': question_type,
+        'difficulty': difficulty,
+        'count': count,
+        'seed': seed
+    }
+
+
+def reservoir_sample(items: Iterable, k: int, rng: random.Random) -> Tuple[list, int]:
+    """Uniform random sample of k items from a stream of unknown length.
+
+    Returns:
+        Tuple of (sample in random order, number of items seen)
+    """
+    sample = []
+    seen = 0
+    for seen, item in enumerate(items, 1):
+        if len(sample) < k:
+            sample.append(item)
+        else:
+            # Keep the new item with probability k / seen
+            index = rng.randrange(seen)
+            if index < k:
+                sample[index] = item
+    rng.shuffle(sample)
+    return sample, seen
+
+
+def compose_quiz(spec: dict, candidate_ids: Iterable, load_questions: Callable[[list], dict]) -> dict:
+    """Sample a quiz from the candidates matching a parsed request.
+
+    Args:
+        spec: Parsed request (see parse_compose_request)
+        candidate_ids: IDs of every matching question, from the topic index
+        load_questions: Loads questions by ID, returning a dict of ID -> question
+
+    Returns:
+        dict with topics, questions, count and available (matching questions)
+    """
+    rng = random.Random(spec['seed'])
+    sample, available = reservoir_sample(candidate_ids, spec['count'] * OVERSAMPLE, rng)
+    loaded = load_questions(sample)
+
+    questions: List[dict] = []
+    seen_text = set()
+    for question_id in sample:
+        question = loaded.get(question_id) or loaded.get(str(question_id))
+        if not question:
+            continue
+        text = ' '.join(question['question'].lower().split())
+        if text in seen_text:
+            continue
+        seen_text.add(text)
+        questions.append(question)
+        if len(questions) == spec['count']:
+            break
+
+    return {
+        'topics': spec['topics'],
+        'questions': questions,
+        'count': len(questions),
+        'available': available
+    }
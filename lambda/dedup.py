@@ -0,0 +1,130 @@
+"""Near-duplicate question detection using word shingling."""
+import math
+import os
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+
+def validate_threshold(threshold: float) -> float:
+    """Check a Jaccard similarity threshold is in (0, 1].
+
+    Raises:
+        ValueError: If it is not
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Duplicate threshold must be greater than 0 and at most 1, got {threshold}")
+    return threshold
+
+
+DEDUP_THRESHOLD = validate_threshold(float(os.environ.get('DEDUP_THRESHOLD', '0.8')))
+
+
+def shingle(text: str) -> frozenset:
+    """Normalize question text into a set of lowercase word shingles."""
+    return frozenset(re.findall(r'\w+', text.lower()))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def find_duplicates(texts: list, threshold: float = DEDUP_THRESHOLD, keep: int = 0) -> set:
+    """Find texts that are near-duplicates of an earlier text.
+
+    Uses prefix filtering: shingles are ordered rarest-first, and two sets
+    with Jaccard >= threshold must share a shingle within their first
+    ``len - ceil(threshold * len) + 1`` entries. Only those prefixes are
+    indexed, so candidate pairs stay few even for thousands of texts and
+    each candidate is verified with an exact Jaccard comparison.
+
+    Args:
+        texts: Texts in priority order (earlier texts are kept)
+        threshold: Jaccard similarity at or above which texts are duplicates
+        keep: Number of leading texts that are never reported as duplicates
+
+    Returns:
+        Set of indexes into texts that duplicate an earlier kept text
+
+    Raises:
+        ValueError: If threshold is not in (0, 1]
+    """
+    validate_threshold(threshold)
+    sets = [shingle(text) for text in texts]
+    frequency = Counter(token for s in sets for token in s)
+
+    index = {}
+    kept_sets = {}
+    exact = {}
+    duplicates = set()
+
+    for i, tokens in enumerate(sets):
+        if tokens in exact:
+            if i >= keep:
+                duplicates.add(i)
+                continue
+
+        ordered = sorted(tokens, key=lambda token: (frequency[token], token))
+        prefix = ordered[:len(ordered) - math.ceil(threshold * len(ordered)) + 1]
+
+        if i >= keep:
+            candidates = set()
+            for token in prefix:
+                candidates.update(index.get(token, ()))
+
+            size = len(tokens)
+            is_duplicate = False
+            for j in candidates:
+                other = kept_sets[j]
+                if not threshold * size <= len(other) <= size / threshold:
+                    continue
+                if jaccard(tokens, other) >= threshold:
+                    is_duplicate = True
+                    break
+
+            if is_duplicate:
+                duplicates.add(i)
+                continue
+
+        kept_sets[i] = tokens
+        exact.setdefault(tokens, i)
+        for token in prefix:
+            index.setdefault(token, []).append(i)
+
+    return duplicates
+
+
+def deduplicate_questions(
+    questions_data: dict,
+    existing: Optional[Iterable[str]] = None,
+    threshold: float = DEDUP_THRESHOLD
+) -> tuple:
+    """Drop near-duplicate MCQs and short questions.
+
+    Each question is compared against earlier questions of the same type
+    and against any question texts already saved for the upload.
+
+    Args:
+        questions_data: Dict containing 'mcqs', 'short_questions', and 'topic'
+        existing: Question texts already saved for the upload (optional)
+        threshold: Jaccard similarity at or above which questions are duplicates
+
+    Returns:
+        Tuple of (deduplicated questions_data, number of questions dropped)
+    """
+    existing = list(existing or [])
+    result = dict(questions_data)
+    dropped = 0
+
+    for key in ('mcqs', 'short_questions'):
+        questions = questions_data.get(key, [])
+        texts = existing + [q['question'] for q in questions]
+        duplicates = find_duplicates(texts, threshold, keep=len(existing))
+
+        result[key] = [q for i, q in enumerate(questions, len(existing)) if i not in duplicates]
+        dropped += len(questions) - len(result[key])
+
+    return result, dropped
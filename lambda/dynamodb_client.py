@@ -1,14 +1,46 @@
 """DynamoDB client operations for Quizify."""
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import boto3
-from boto3.dynamodb.conditions import Key
-from utils import generate_uuid, get_timestamp
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from utils import generate_stable_uuid, get_timestamp, normalize_topic
 
 
 dynamodb = boto3.resource('dynamodb')
 
 QUESTIONS_TABLE = os.environ.get('DYNAMODB_TABLE', 'quizify-dev-questions')
 UPLOADS_TABLE = os.environ.get('UPLOADS_TABLE', 'quizify-dev-uploads')
+CONTENT_HASH_TABLE = os.environ.get('CONTENT_HASH_TABLE', 'quizify-dev-content-hashes')
+BATCHES_TABLE = os.environ.get('BATCHES_TABLE', 'quizify-dev-batches')
+GENERATION_SLOTS_TABLE = os.environ.get('GENERATION_SLOTS_TABLE', 'quizify-dev-generation-slots')
+
+# Gemini calls in flight at once across all invocations (0: no limit)
+MAX_GENERATION_CONCURRENCY = int(os.environ.get('MAX_GENERATION_CONCURRENCY', '6'))
+
+# Attributes returned for upload list views (status is a reserved word)
+UPLOAD_SUMMARY_ATTRIBUTES = ['upload_id', 'filename', '#status', 'topic', 'error_message', 'created_at', 'updated_at']
+
+# Items expire (DynamoDB TTL on expires_at) this many days after upload;
+# uploads are archived first, starting ARCHIVE_LEAD_DAYS before expiry
+RETENTION_DAYS = int(os.environ.get('UPLOAD_RETENTION_DAYS', '180'))
+ARCHIVE_LEAD_DAYS = 7
+
+# Keys-only index of uploads by the day they become due for archival
+ARCHIVE_INDEX = 'archive_day-index'
+
+# Keys-only index of questions by normalized topic, then type and difficulty
+TOPIC_INDEX = 'topic_key-type_difficulty-index'
+
+# Concurrent queries when loading several uploads' questions
+QUERY_CONCURRENCY = 8
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_RETRIES = 5
 
 
 def get_questions_table():
@@ -21,7 +53,39 @@ def get_uploads_table():
     return dynamodb.Table(UPLOADS_TABLE)
 
 
-def save_upload(upload_id: str, filename: str, s3_key: str, status: str = 'processing') -> dict:
+def get_content_hash_table():
+    """Get the content hash -> upload index DynamoDB table."""
+    return dynamodb.Table(CONTENT_HASH_TABLE)
+
+
+def get_batches_table():
+    """Get the multi-file upload batches DynamoDB table."""
+    return dynamodb.Table(BATCHES_TABLE)
+
+
+def get_generation_slots_table():
+    """Get the generation slots DynamoDB table."""
+    return dynamodb.Table(GENERATION_SLOTS_TABLE)
+
+
+def expiry_time(days: int = None) -> int:
+    """TTL value (epoch seconds) for an item written now, kept ``days`` (default RETENTION_DAYS)."""
+    return int(time.time()) + (RETENTION_DAYS if days is None else days) * 86400
+
+
+def archive_day(expires_at: int) -> str:
+    """Day (YYYY-MM-DD, UTC) an upload expiring at ``expires_at`` becomes due for archival."""
+    due = datetime.fromtimestamp(expires_at, timezone.utc) - timedelta(days=ARCHIVE_LEAD_DAYS)
+    return due.date().isoformat()
+
+
+def save_upload(
+    upload_id: str,
+    filename: str,
+    s3_key: str,
+    status: str = 'processing',
+    content_hash: str = None
+) -> dict:
     """Save upload metadata to DynamoDB.
 
     Args:
@@ -29,12 +93,14 @@ def save_upload(upload_id: str, filename: str, s3_key: str, status: str = 'proce
         filename: Original filename
         s3_key: S3 object key
         status: Upload status (processing, completed, failed)
+        content_hash: Hash identifying the uploaded bytes (optional)
 
     Returns:
         The saved upload item
     """
     table = get_uploads_table()
     timestamp = get_timestamp()
+    expires_at = expiry_time()
 
     item = {
         'upload_id': upload_id,
@@ -42,21 +108,195 @@ def save_upload(upload_id: str, filename: str, s3_key: str, status: str = 'proce
         's3_key': s3_key,
         'status': status,
         'created_at': timestamp,
-        'updated_at': timestamp
+        'updated_at': timestamp,
+        'expires_at': expires_at,
+        'archive_day': archive_day(expires_at)
     }
+    if content_hash:
+        item['content_hash'] = content_hash
 
     table.put_item(Item=item)
     return item
 
 
-def update_upload_status(upload_id: str, status: str, topic: str = None, error: str = None) -> None:
+def acquire_processing_lease(
+    upload_id: str,
+    filename: str,
+    s3_key: str,
+    owner: str,
+    lease_seconds: float,
+    content_hash: str = None
+) -> dict:
+    """Claim an upload for processing with a conditional write.
+
+    S3 notifications are delivered at least once, so the same object can
+    trigger several invocations. The claim succeeds only if the upload has
+    no record yet, the caller already holds the lease (a retry of the same
+    request), or the holder's lease expired without finishing (the
+    invocation died or failed retryably). Finished uploads carry no lease
+    and are never reclaimed.
+
+    Args:
+        upload_id: Unique upload identifier
+        filename: Original filename
+        s3_key: S3 object key
+        owner: Identifier of the claiming invocation
+        lease_seconds: How long the claim is held before others may take over
+        content_hash: Hash identifying the uploaded bytes (optional)
+
+    Returns:
+        The claimed upload item (including any stage checkpoint from an
+        earlier attempt), or None if another invocation holds the lease or
+        the upload was already processed
+    """
+    table = get_uploads_table()
+    timestamp = get_timestamp()
+    now = int(time.time())
+
+    update_expr = (
+        'SET filename = :filename, s3_key = :s3_key, #status = :status, '
+        'lease_owner = :owner, lease_expires_at = :expires, updated_at = :updated_at, '
+        'created_at = if_not_exists(created_at, :updated_at), '
+        'expires_at = if_not_exists(expires_at, :ttl), archive_day = if_not_exists(archive_day, :archive_day)'
+    )
+    ttl = expiry_time()
+    expr_values = {
+        ':filename': filename,
+        ':s3_key': s3_key,
+        ':status': 'processing',
+        ':owner': owner,
+        ':expires': now + int(lease_seconds),
+        ':updated_at': timestamp,
+        ':now': now,
+        ':ttl': ttl,
+        ':archive_day': archive_day(ttl)
+    }
+    if content_hash:
+        update_expr += ', content_hash = :content_hash'
+        expr_values[':content_hash'] = content_hash
+
+    # Clear the error left by a failed attempt being taken over
+    update_expr += ' REMOVE error_message'
+
+    try:
+        response = table.update_item(
+            Key={'upload_id': upload_id},
+            UpdateExpression=update_expr,
+            ConditionExpression=(
+                'attribute_not_exists(upload_id) OR lease_owner = :owner OR lease_expires_at < :now'
+            ),
+            ExpressionAttributeValues=expr_values,
+            ExpressionAttributeNames={'#status': 'status'},
+            ReturnValues='ALL_NEW'
+        )
+        return response['Attributes']
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return None
+        raise
+
+
+def acquire_generation_slot(owner: str, lease_seconds: float) -> str:
+    """Claim one of MAX_GENERATION_CONCURRENCY generation slots with a conditional write.
+
+    A slot is free if it has never been taken, was released, or its
+    holder's lease expired (the invocation died while generating). Slots
+    are tried in random order so concurrent callers rarely collide.
+
+    Args:
+        owner: Identifier of the claiming invocation
+        lease_seconds: How long the slot is held before others may take over
+
+    Returns:
+        The claimed slot's id, or None if every slot is taken
+    """
+    table = get_generation_slots_table()
+    now = int(time.time())
+
+    for index in random.sample(range(MAX_GENERATION_CONCURRENCY), MAX_GENERATION_CONCURRENCY):
+        slot_id = f"slot-{index}"
+        try:
+            table.update_item(
+                Key={'slot_id': slot_id},
+                UpdateExpression='SET lease_owner = :owner, lease_expires_at = :expires',
+                ConditionExpression=(
+                    'attribute_not_exists(lease_owner) OR lease_owner = :owner OR lease_expires_at < :now'
+                ),
+                ExpressionAttributeValues={
+                    ':owner': owner,
+                    ':expires': now + int(lease_seconds),
+                    ':now': now
+                }
+            )
+            return slot_id
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+    return None
+
+
+def release_generation_slot(slot_id: str, owner: str) -> None:
+    """Free a generation slot, unless its lease already passed to another invocation."""
+    try:
+        get_generation_slots_table().update_item(
+            Key={'slot_id': slot_id},
+            UpdateExpression='REMOVE lease_owner, lease_expires_at',
+            ConditionExpression='lease_owner = :owner',
+            ExpressionAttributeValues={':owner': owner}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+
+def record_upload_stage(upload_id: str, stage: str, stage_timings: dict, skipped_pages: list = None) -> None:
+    """Mark a processing stage complete so a retry can resume after it.
+
+    Args:
+        upload_id: Upload identifier
+        stage: Last completed stage
+        stage_timings: Milliseconds spent in each stage so far
+        skipped_pages: PDF pages skipped for exceeding the time budget
+    """
+    update_expr = 'SET #stage = :stage, stage_timings = :stage_timings, updated_at = :updated_at'
+    expr_values = {
+        ':stage': stage,
+        ':stage_timings': stage_timings,
+        ':updated_at': get_timestamp()
+    }
+
+    if skipped_pages:
+        update_expr += ', skipped_pages = :skipped_pages'
+        expr_values[':skipped_pages'] = skipped_pages
+
+    get_uploads_table().update_item(
+        Key={'upload_id': upload_id},
+        UpdateExpression=update_expr,
+        ExpressionAttributeValues=expr_values,
+        ExpressionAttributeNames={'#stage': 'stage'}
+    )
+
+
+def update_upload_status(
+    upload_id: str,
+    status: str,
+    topic: str = None,
+    error: str = None,
+    skipped_pages: list = None,
+    retryable: bool = False
+) -> None:
     """Update the status of an upload.
 
+    Moving out of 'processing' also releases any processing lease.
+
     Args:
         upload_id: Upload identifier
         status: New status
         topic: Detected topic (if completed)
         error: Error message (if failed)
+        skipped_pages: PDF pages skipped for exceeding the time budget
+        retryable: Expire the processing lease instead of releasing it, so
+            a retry or redelivered event can take over and resume
     """
     table = get_uploads_table()
     timestamp = get_timestamp()
@@ -76,6 +316,16 @@ def update_upload_status(upload_id: str, status: str, topic: str = None, error:
         update_expr += ', error_message = :error'
         expr_values[':error'] = error
 
+    if skipped_pages:
+        update_expr += ', skipped_pages = :skipped_pages'
+        expr_values[':skipped_pages'] = skipped_pages
+
+    if retryable:
+        update_expr += ', lease_expires_at = :expired'
+        expr_values[':expired'] = 0
+    elif status != 'processing':
+        update_expr += ' REMOVE lease_owner, lease_expires_at'
+
     table.update_item(
         Key={'upload_id': upload_id},
         UpdateExpression=update_expr,
@@ -84,53 +334,76 @@ def update_upload_status(upload_id: str, status: str, topic: str = None, error:
     )
 
 
-def save_questions(upload_id: str, filename: str, questions_data: dict) -> list:
+def type_difficulty(question_type: str, difficulty: str = None) -> str:
+    """Sort key of the topic index: type, then difficulty for short questions."""
+    return f"{question_type}#{difficulty or ''}" if question_type == 'SHORT' else f"{question_type}#"
+
+
+def save_questions(
+    upload_id: str,
+    filename: str,
+    questions_data: dict,
+    generation_id: str = 'initial'
+) -> list:
     """Save generated questions to DynamoDB.
 
+    Question IDs are derived from the upload, generation and position, so
+    saving the same generation again overwrites its questions instead of
+    adding duplicates.
+
     Args:
         upload_id: Upload identifier
         filename: Source filename
         questions_data: Dict containing 'mcqs', 'short_questions', and 'topic'
+        generation_id: Identifies this set of questions among the upload's
+            generations (the first is 'initial')
 
     Returns:
         List of saved question items
     """
     table = get_questions_table()
     timestamp = get_timestamp()
+    expires_at = expiry_time()
     topic = questions_data.get('topic', 'General')
     saved_items = []
 
     # Save MCQs
-    for mcq in questions_data.get('mcqs', []):
-        question_id = generate_uuid()
+    for index, mcq in enumerate(questions_data.get('mcqs', [])):
+        question_id = generate_stable_uuid(upload_id, generation_id, 'MCQ', index)
         item = {
             'question_id': question_id,
             'upload_id': upload_id,
             'type': 'MCQ',
             'topic': topic,
+            'topic_key': normalize_topic(topic),
+            'type_difficulty': type_difficulty('MCQ'),
             'question': mcq['question'],
             'options': mcq.get('options', []),
             'correct_answer': mcq.get('correct_answer', ''),
             'explanation': mcq.get('explanation', ''),
             'filename': filename,
-            'created_at': timestamp
+            'created_at': timestamp,
+            'expires_at': expires_at
         }
         table.put_item(Item=item)
         saved_items.append(item)
 
     # Save short questions
-    for sq in questions_data.get('short_questions', []):
-        question_id = generate_uuid()
+    for index, sq in enumerate(questions_data.get('short_questions', [])):
+        question_id = generate_stable_uuid(upload_id, generation_id, 'SHORT', index)
         item = {
             'question_id': question_id,
             'upload_id': upload_id,
             'type': 'SHORT',
             'topic': topic,
+            'topic_key': normalize_topic(topic),
+            'type_difficulty': type_difficulty('SHORT', sq.get('difficulty', 'medium')),
             'question': sq['question'],
             'expected_points': sq.get('expected_points', []),
             'difficulty': sq.get('difficulty', 'medium'),
             'filename': filename,
-            'created_at': timestamp
+            'created_at': timestamp,
+            'expires_at': expires_at
         }
         table.put_item(Item=item)
         saved_items.append(item)
@@ -138,6 +411,98 @@ def save_questions(upload_id: str, filename: str, questions_data: dict) -> list:
     return saved_items
 
 
+def clone_questions(source_upload_id: str, upload_id: str, filename: str) -> list:
+    """Copy another upload's questions to a new upload in one batched write.
+
+    Args:
+        source_upload_id: Upload whose questions are copied
+        upload_id: Upload identifier the copies belong to
+        filename: Source filename for the new upload
+
+    Returns:
+        List of saved question items
+    """
+    table = get_questions_table()
+    timestamp = get_timestamp()
+    expires_at = expiry_time()
+    saved_items = []
+
+    with table.batch_writer() as batch:
+        for question in get_questions_by_upload_id(source_upload_id):
+            item = dict(
+                question,
+                question_id=generate_stable_uuid(upload_id, 'clone', question['question_id']),
+                upload_id=upload_id,
+                filename=filename,
+                created_at=timestamp,
+                expires_at=expires_at,
+                topic_key=normalize_topic(question.get('topic')),
+                type_difficulty=type_difficulty(question.get('type'), question.get('difficulty'))
+            )
+            batch.put_item(Item=item)
+            saved_items.append(item)
+
+    return saved_items
+
+
+def register_content_hash(content_hash: str, upload_id: str) -> None:
+    """Record a completed upload as the canonical result for its content.
+
+    Args:
+        content_hash: Hash identifying the uploaded bytes
+        upload_id: Completed upload identifier
+    """
+    get_content_hash_table().put_item(Item={
+        'content_hash': content_hash,
+        'upload_id': upload_id,
+        'created_at': get_timestamp(),
+        'expires_at': expiry_time()
+    })
+
+
+def find_completed_upload_by_hash(content_hash: str) -> dict:
+    """Find a completed upload with the same content.
+
+    Args:
+        content_hash: Hash identifying the uploaded bytes
+
+    Returns:
+        Upload item or None
+    """
+    response = get_content_hash_table().get_item(Key={'content_hash': content_hash})
+    entry = response.get('Item')
+    if not entry:
+        return None
+
+    upload = get_upload_by_id(entry['upload_id'])
+    if upload and upload.get('status') == 'completed':
+        return upload
+    return None
+
+
+def query_all(**kwargs) -> list:
+    """Run a Query to completion, following LastEvaluatedKey across pages.
+
+    Uses the resource's low-level client, which unlike Table objects is
+    safe to share between threads.
+
+    Args:
+        **kwargs: Query parameters, including TableName
+
+    Returns:
+        List of all matching items
+    """
+    client = dynamodb.meta.client
+    items = []
+
+    while True:
+        response = client.query(**kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
 def get_questions_by_upload_id(upload_id: str) -> list:
     """Get all questions for a specific upload.
 
@@ -147,14 +512,28 @@ def get_questions_by_upload_id(upload_id: str) -> list:
     Returns:
         List of question items
     """
-    table = get_questions_table()
-
-    response = table.query(
+    return query_all(
+        TableName=QUESTIONS_TABLE,
         IndexName='upload_id-created_at-index',
         KeyConditionExpression=Key('upload_id').eq(upload_id)
     )
 
-    return response.get('Items', [])
+
+def get_questions_by_upload_ids(upload_ids: list) -> dict:
+    """Get the questions of several uploads with concurrent queries.
+
+    Args:
+        upload_ids: Upload identifiers
+
+    Returns:
+        Dict of upload_id -> list of question items
+    """
+    unique_ids = list(dict.fromkeys(upload_ids))
+    if not unique_ids:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(QUERY_CONCURRENCY, len(unique_ids))) as executor:
+        return dict(zip(unique_ids, executor.map(get_questions_by_upload_id, unique_ids)))
 
 
 def get_upload_by_id(upload_id: str) -> dict:
@@ -172,9 +551,254 @@ def get_upload_by_id(upload_id: str) -> dict:
     return response.get('Item')
 
 
+def iter_question_ids_by_topic(topic_keys: list, question_type: str = None, difficulty: str = None):
+    """Iterate over the IDs of questions with the given topic keys.
+
+    Queries the keys-only topic index, one topic at a time, so only the
+    matching index entries are read and never the question items.
+
+    Args:
+        topic_keys: Normalized topics (see utils.normalize_topic)
+        question_type: Only MCQ or SHORT questions
+        difficulty: Only short questions of this difficulty
+
+    Yields:
+        Question IDs
+    """
+    table = get_questions_table()
+
+    for topic_key in topic_keys:
+        condition = Key('topic_key').eq(topic_key)
+        if difficulty:
+            condition = condition & Key('type_difficulty').eq(type_difficulty('SHORT', difficulty))
+        elif question_type:
+            condition = condition & Key('type_difficulty').begins_with(f"{question_type}#")
+
+        query_kwargs = {'IndexName': TOPIC_INDEX, 'KeyConditionExpression': condition}
+        while True:
+            response = table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                yield item['question_id']
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def backfill_topic_index(start_key: dict = None, deadline: float = None) -> dict:
+    """Add topic index keys to questions saved before the index existed.
+
+    Args:
+        start_key: LastEvaluatedKey to resume a previous run from
+        deadline: time.monotonic() value to stop at, returning where it got to
+
+    Returns:
+        dict with updated (questions keyed in this run) and start_key (None when done)
+    """
+    table = get_questions_table()
+    scan_kwargs = {
+        'FilterExpression': Attr('topic_key').not_exists(),
+        'ProjectionExpression': 'question_id, topic, #type, difficulty',
+        'ExpressionAttributeNames': {'#type': 'type'}
+    }
+    updated = 0
+
+    while True:
+        if start_key:
+            scan_kwargs['ExclusiveStartKey'] = start_key
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            table.update_item(
+                Key={'question_id': item['question_id']},
+                UpdateExpression='SET topic_key = :topic_key, type_difficulty = :type_difficulty',
+                ExpressionAttributeValues={
+                    ':topic_key': normalize_topic(item.get('topic')),
+                    ':type_difficulty': type_difficulty(item.get('type'), item.get('difficulty'))
+                }
+            )
+            updated += 1
+
+        start_key = response.get('LastEvaluatedKey')
+        if not start_key or (deadline and time.monotonic() >= deadline):
+            return {'updated': updated, 'start_key': start_key}
+
+
+def iter_upload_ids_due_for_archival(today: str = None):
+    """Iterate over the IDs of uploads due for archival by ``today`` (YYYY-MM-DD).
+
+    Queries the keys-only archive-day index for each day from
+    ARCHIVE_LEAD_DAYS ago (uploads due earlier have already expired) up to
+    today, so a missed run is caught up by the next one.
+    """
+    table = get_uploads_table()
+    end = datetime.fromisoformat(today).date() if today else datetime.now(timezone.utc).date()
+
+    for offset in range(ARCHIVE_LEAD_DAYS, -1, -1):
+        day = (end - timedelta(days=offset)).isoformat()
+        query_kwargs = {'IndexName': ARCHIVE_INDEX, 'KeyConditionExpression': Key('archive_day').eq(day)}
+        while True:
+            response = table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                yield item['upload_id']
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def replace_with_archive_record(upload: dict, archive: dict, expires_at: int) -> bool:
+    """Replace an upload with a small record pointing at its archive.
+
+    The record keeps what upload lists show, has no archive_day (so it
+    leaves the archive-day index) and expires at ``expires_at``.
+
+    Args:
+        upload: The upload item as archived
+        archive: key, offset and length of the upload's archive member
+        expires_at: TTL of the record (epoch seconds)
+
+    Returns:
+        False if the upload changed since it was read (it is left as is)
+    """
+    timestamp = get_timestamp()
+    item = {
+        'upload_id': upload['upload_id'],
+        'filename': upload.get('filename', ''),
+        'status': 'archived',
+        'created_at': upload.get('created_at', timestamp),
+        'updated_at': timestamp,
+        'archived_at': timestamp,
+        'archive': archive,
+        'expires_at': expires_at
+    }
+    if upload.get('topic'):
+        item['topic'] = upload['topic']
+
+    try:
+        get_uploads_table().put_item(
+            Item=item,
+            ConditionExpression='updated_at = :updated_at',
+            ExpressionAttributeValues={':updated_at': upload.get('updated_at')}
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+
+def remove_from_archival(upload_id: str) -> None:
+    """Take an upload with nothing to archive (never completed) out of the archive-day index."""
+    get_uploads_table().update_item(
+        Key={'upload_id': upload_id},
+        UpdateExpression='REMOVE archive_day'
+    )
+
+
+def delete_questions(question_ids: list) -> None:
+    """Delete questions in batched writes."""
+    with get_questions_table().batch_writer() as batch:
+        for question_id in question_ids:
+            batch.delete_item(Key={'question_id': question_id})
+
+
+def restore_upload_items(upload: dict, questions: list) -> bool:
+    """Write an archived upload and its questions back, with a fresh retention period.
+
+    The upload replaces its archive record only while that is still
+    archived, so of two concurrent restores one reports the upload restored
+    and the other gets False. Both write the same question items, so the
+    loser's writes change nothing.
+
+    Args:
+        upload: Upload item from the archive
+        questions: Question items from the archive
+
+    Returns:
+        False if the upload was no longer archived (it is left as is)
+    """
+    expires_at = expiry_time()
+    timestamp = get_timestamp()
+
+    with get_questions_table().batch_writer() as batch:
+        for question in questions:
+            batch.put_item(Item=dict(question, expires_at=expires_at))
+
+    try:
+        get_uploads_table().put_item(
+            Item=dict(
+                upload,
+                status='completed',
+                updated_at=timestamp,
+                restored_at=timestamp,
+                expires_at=expires_at,
+                archive_day=archive_day(expires_at)
+            ),
+            ConditionExpression='#status = :archived',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={':archived': 'archived'}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+    return True
+
+
+def iter_question_pages(
+    topic: str = None,
+    question_type: str = None,
+    since: str = None,
+    before: str = None,
+    start_key: dict = None,
+    page_size: int = 500
+):
+    """Scan the questions table page by page with optional filters.
+
+    Args:
+        topic: Only questions with this topic
+        question_type: Only MCQ or SHORT questions
+        since: Only questions created at or after this ISO timestamp
+        before: Only questions created before this ISO timestamp
+        start_key: LastEvaluatedKey to resume a previous scan from
+        page_size: Items evaluated per Scan request
+
+    Yields:
+        Tuple of (matching items, LastEvaluatedKey or None after the last page)
+    """
+    table = get_questions_table()
+
+    conditions = []
+    if topic:
+        conditions.append(Attr('topic').eq(topic))
+    if question_type:
+        conditions.append(Attr('type').eq(question_type))
+    if since:
+        conditions.append(Attr('created_at').gte(since))
+    if before:
+        conditions.append(Attr('created_at').lt(before))
+
+    scan_kwargs = {'Limit': page_size}
+    if conditions:
+        filter_expression = conditions[0]
+        for condition in conditions[1:]:
+            filter_expression = filter_expression & condition
+        scan_kwargs['FilterExpression'] = filter_expression
+
+    while True:
+        if start_key:
+            scan_kwargs['ExclusiveStartKey'] = start_key
+        response = table.scan(**scan_kwargs)
+        start_key = response.get('LastEvaluatedKey')
+        yield response.get('Items', []), start_key
+        if not start_key:
+            return
+
+
 def list_uploads(limit: int = 50) -> list:
     """List recent uploads.
 
+    Scans every page (fetching only the summary attributes) so the newest
+    uploads are found wherever they sit in the table.
+
     Args:
         limit: Maximum number of uploads to return
 
@@ -183,10 +807,116 @@ def list_uploads(limit: int = 50) -> list:
     """
     table = get_uploads_table()
 
-    response = table.scan(Limit=limit)
-    items = response.get('Items', [])
+    scan_kwargs = {
+        'ProjectionExpression': ', '.join(UPLOAD_SUMMARY_ATTRIBUTES),
+        'ExpressionAttributeNames': {'#status': 'status'}
+    }
+    items = []
+    while True:
+        response = table.scan(**scan_kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
     # Sort by created_at descending
     items.sort(key=lambda x: x.get('created_at', ''), reverse=True)
 
     return items[:limit]
+
+
+def save_batch(batch_id: str, uploads: list) -> dict:
+    """Save a multi-file upload batch.
+
+    Args:
+        batch_id: Unique batch identifier
+        uploads: List of dicts with upload_id and filename for each file
+
+    Returns:
+        The saved batch item
+    """
+    item = {
+        'batch_id': batch_id,
+        'uploads': [{'upload_id': u['upload_id'], 'filename': u['filename']} for u in uploads],
+        'total': len(uploads),
+        'created_at': get_timestamp(),
+        'expires_at': expiry_time()
+    }
+    get_batches_table().put_item(Item=item)
+    return item
+
+
+def get_batch(batch_id: str) -> dict:
+    """Get a batch by ID.
+
+    Args:
+        batch_id: Batch identifier
+
+    Returns:
+        Batch item or None
+    """
+    response = get_batches_table().get_item(Key={'batch_id': batch_id})
+    return response.get('Item')
+
+
+def batch_get_items(table_name: str, key_name: str, keys: list, projection: str = None) -> dict:
+    """Get items by key with BatchGetItem instead of one GetItem each.
+
+    Args:
+        table_name: Table to read
+        key_name: Name of the table's hash key
+        keys: Hash key values
+        projection: Optional ProjectionExpression (must include the key)
+
+    Returns:
+        Dict of key -> item (missing items are left out)
+    """
+    items = {}
+    unique_keys = list(dict.fromkeys(keys))
+
+    for start in range(0, len(unique_keys), BATCH_GET_MAX_KEYS):
+        request = {table_name: {
+            'Keys': [{key_name: key} for key in unique_keys[start:start + BATCH_GET_MAX_KEYS]]
+        }}
+        if projection:
+            request[table_name]['ProjectionExpression'] = projection
+
+        for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(table_name, []):
+                items[item[key_name]] = item
+
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+            # Throttled keys come back unprocessed; back off before retrying
+            time.sleep(min(0.05 * 2 ** attempt, 1.0))
+        else:
+            raise RuntimeError(f"Could not read {len(request[table_name]['Keys'])} items from {table_name} after retries")
+
+    return items
+
+
+def get_uploads_by_ids(upload_ids: list) -> dict:
+    """Get several uploads with BatchGetItem.
+
+    Args:
+        upload_ids: Upload identifiers
+
+    Returns:
+        Dict of upload_id -> upload item (missing uploads are left out)
+    """
+    return batch_get_items(UPLOADS_TABLE, 'upload_id', upload_ids)
+
+
+def get_questions_by_ids(question_ids: list, projection: str = None) -> dict:
+    """Get several questions with BatchGetItem.
+
+    Args:
+        question_ids: Question identifiers
+        projection: Optional ProjectionExpression (must include question_id)
+
+    Returns:
+        Dict of question_id -> question item (missing questions are left out)
+    """
+    return batch_get_items(QUESTIONS_TABLE, 'question_id', question_ids, projection)
@@ -0,0 +1,107 @@
+"""Question bank export as NDJSON or CSV, shared by the API handlers."""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from serialization import dumps
+
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+# Public question fields, in CSV column order; storage-only fields
+# (index keys such as topic_key, expires_at) are left out of exports
+EXPORT_FIELDS = [
+    'question_id', 'upload_id', 'filename', 'type', 'topic', 'difficulty',
+    'question', 'options', 'correct_answer', 'explanation', 'expected_points',
+    'created_at'
+]
+
+QUESTION_TYPES = ('MCQ', 'SHORT')
+
+
+def parse_export_filters(params: dict) -> dict:
+    """Validate export query parameters.
+
+    Args:
+        params: Query parameters (format, topic, type, since, before)
+
+    Returns:
+        dict with format, topic, type, since and before (None when not given)
+
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    params = params or {}
+    filters = {'format': params.get('format') or 'ndjson'}
+    if filters['format'] not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    question_type = params.get('type')
+    if question_type and question_type.upper() not in QUESTION_TYPES:
+        raise ValueError(f"type must be one of: {', '.join(QUESTION_TYPES)}")
+    filters['type'] = question_type.upper() if question_type else None
+
+    filters['topic'] = params.get('topic') or None
+
+    # created_at is stored as ISO 8601, so date bounds compare as strings
+    for name in ('since', 'before'):
+        value = params.get(name) or None
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"{name} must be an ISO 8601 date or datetime")
+        filters[name] = value
+
+    return filters
+
+
+def iter_ndjson(questions: Iterable[dict]) -> Iterator[bytes]:
+    """Encode questions as newline-delimited JSON, one line per question."""
+    for question in questions:
+        yield dumps({field: question[field] for field in EXPORT_FIELDS if field in question}) + b'\n'
+
+
+def iter_csv(questions: Iterable[dict], header: bool = True) -> Iterator[bytes]:
+    """Encode questions as CSV rows; list fields are JSON-encoded."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+
+    if header:
+        writer.writeheader()
+
+    for question in questions:
+        row = dict(question)
+        for field in ('options', 'expected_points'):
+            if isinstance(row.get(field), (list, tuple)):
+                row[field] = json.dumps(row[field], ensure_ascii=False)
+        writer.writerow(row)
+
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header-only export when there were no questions
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_export(questions: Iterable[dict], export_format: str, header: bool = True) -> Iterator[bytes]:
+    """Encode questions in an export format as a stream of byte chunks.
+
+    Args:
+        questions: Questions to export (consumed lazily)
+        export_format: 'ndjson' or 'csv'
+        header: Whether to start CSV output with a header row
+
+    Returns:
+        Iterator of encoded chunks
+    """
+    if export_format == 'csv':
+        return iter_csv(questions, header=header)
+    return iter_ndjson(questions)
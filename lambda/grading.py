@@ -0,0 +1,208 @@
+"""Short-answer grading against expected points, shared by the API handlers.
+
+Answers are graded locally, without model calls. Each expected point is
+compared with the answer by character n-grams, so different word forms
+("photosynthetic", "photosynthesis") still match. A point's coverage is the
+share of its n-gram weight that also appears in the answer. N-grams are
+weighted by inverse document frequency over the question's points, so text
+that every point shares counts for less than what sets a point apart.
+
+A whole batch is scored with a few NumPy array operations: n-grams are
+packed into integers, matched by sorting and summed per point with
+np.bincount.
+"""
+import os
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+# Byte n-gram lengths compared between points and answers
+NGRAM_SIZES = (3, 4, 5)
+
+# Coverage at which a point earns full credit; lower coverage earns partial credit
+COVERAGE_THRESHOLD = float(os.environ.get('GRADE_COVERAGE_THRESHOLD', '0.6'))
+
+# Answers per request (point_coverage handles up to 65536)
+MAX_GRADE_ANSWERS = min(int(os.environ.get('MAX_GRADE_ANSWERS', '5000')), 65536)
+MAX_ANSWER_CHARS = 5000
+
+WORD_PATTERN = re.compile(r'\w+')
+
+STOPWORDS = frozenset((
+    'a an and are as at be been but by can do does for from had has have how i if in into is it its '
+    'of on or so than that the their them then there these they this to was were what when which '
+    'while who why will with would you your'
+).split())
+
+
+def parse_grade_request(body: dict) -> List[dict]:
+    """Validate a grading request body.
+
+    Args:
+        body: {"answers": [...]}, where each answer has an "answer" text and
+            either a "question_id" or its own "expected_points" list
+
+    Returns:
+        List of dicts with question_id (or None), answer and expected_points
+        (None when it should be loaded from the question)
+
+    Raises:
+        ValueError: If the body is invalid
+    """
+    answers = (body or {}).get('answers')
+    if not isinstance(answers, list) or not answers:
+        raise ValueError("answers must be a non-empty list")
+    if len(answers) > MAX_GRADE_ANSWERS:
+        raise ValueError(f"At most {MAX_GRADE_ANSWERS} answers per request")
+
+    items = []
+    for index, entry in enumerate(answers):
+        if not isinstance(entry, dict):
+            raise ValueError(f"answers[{index}] must be an object")
+
+        answer = entry.get('answer')
+        if answer is None:
+            answer = ''
+        if not isinstance(answer, str):
+            raise ValueError(f"answers[{index}].answer must be a string")
+        if len(answer) > MAX_ANSWER_CHARS:
+            raise ValueError(f"answers[{index}].answer is longer than {MAX_ANSWER_CHARS} characters")
+
+        points = entry.get('expected_points')
+        if points is not None and (
+            not isinstance(points, list) or not points or not all(isinstance(p, str) for p in points)
+        ):
+            raise ValueError(f"answers[{index}].expected_points must be a non-empty list of strings")
+
+        question_id = entry.get('question_id')
+        if points is None and question_id in (None, ''):
+            raise ValueError(f"answers[{index}] needs a question_id or expected_points")
+
+        items.append({'question_id': question_id, 'answer': answer, 'expected_points': points})
+
+    return items
+
+
+def normalize(text: str) -> bytes:
+    """Distinct lowercase words without stopwords, space-separated and padded, as UTF-8."""
+    words = dict.fromkeys(word for word in WORD_PATTERN.findall((text or '').lower()) if word not in STOPWORDS)
+    return f" {' '.join(words)} ".encode('utf-8')
+
+
+def ngram_rows(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Byte n-grams of each text.
+
+    Returns:
+        (rows, codes): text index and packed n-gram (at most 48 bits) of
+        every n-gram occurrence
+    """
+    encoded = [normalize(text) for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+    owner = np.repeat(np.arange(len(encoded), dtype=np.uint64), lengths)
+
+    rows, codes = [np.empty(0, dtype=np.uint64)], [np.empty(0, dtype=np.uint64)]
+    for n in NGRAM_SIZES:
+        count = len(data) - n + 1
+        if count <= 0:
+            continue
+        # Pack the length and the n bytes into one integer
+        code = np.full(count, n, dtype=np.uint64)
+        for offset in range(n):
+            code = (code << np.uint64(8)) | data[offset:offset + count]
+        # Keep only windows that lie within one text
+        inside = owner[:count] == owner[n - 1:]
+        rows.append(owner[:count][inside])
+        codes.append(code[inside])
+
+    return np.concatenate(rows), np.concatenate(codes)
+
+
+def point_coverage(answers: Sequence[str], points: Sequence[Sequence[str]]) -> List[np.ndarray]:
+    """Coverage of each expected point by its answer.
+
+    Args:
+        answers: Answer texts (at most 65536)
+        points: Expected points for each answer
+
+    Returns:
+        For each answer, an array with the coverage (0-1) of each of its points
+    """
+    if not answers:
+        return []
+
+    counts = np.fromiter(map(len, points), dtype=np.int64, count=len(points))
+    point_texts = [point for answer_points in points for point in answer_points]
+    point_answer = np.repeat(np.arange(len(answers), dtype=np.uint64), counts)
+
+    # Key every n-gram by the answer it is matched against; n-gram codes
+    # take 48 bits, leaving the top 16 for the answer index
+    answer_rows, answer_codes = ngram_rows(answers)
+    answer_keys = (answer_rows << np.uint64(48)) | answer_codes
+
+    point_rows, point_codes = ngram_rows(point_texts)
+    point_keys = (point_answer[point_rows] << np.uint64(48)) | point_codes
+
+    # Inverse document frequency among the points graded against the same
+    # answer (repeated words are dropped by normalize, so an n-gram rarely
+    # occurs twice in one point)
+    unique_keys, inverse, frequency = np.unique(point_keys, return_inverse=True, return_counts=True)
+    documents = counts[point_answer[point_rows]]
+    weights = np.log((1 + documents) / (1 + frequency[inverse])) + 1
+
+    # Keys in both sets are the adjacent equal pairs once the two distinct
+    # key sets are sorted together; only those are looked up
+    answer_keys = np.sort(answer_keys)
+    distinct = np.ones(len(answer_keys), dtype=bool)
+    distinct[1:] = answer_keys[1:] != answer_keys[:-1]
+    answer_keys = answer_keys[distinct]
+    merged = np.sort(np.concatenate((unique_keys, answer_keys)))
+    shared = merged[1:][merged[1:] == merged[:-1]]
+    present = np.zeros(len(unique_keys), dtype=bool)
+    present[np.searchsorted(unique_keys, shared)] = True
+    found = present[inverse]
+
+    total = np.bincount(point_rows, weights=weights, minlength=len(point_texts))
+    matched = np.bincount(point_rows, weights=weights * found, minlength=len(point_texts))
+    coverage = np.divide(matched, total, out=np.zeros(len(total)), where=total > 0)
+    return np.split(coverage, np.cumsum(counts)[:-1])
+
+
+def grade_answers(items: List[dict], expected_points: Dict[str, list]) -> List[dict]:
+    """Grade parsed answers (see parse_grade_request).
+
+    Args:
+        items: Parsed answers
+        expected_points: Expected points of the referenced questions, keyed by
+            question ID as a string
+
+    Returns:
+        One result per answer, in order: question_id, score (0-1) and each
+        point's coverage, or an error if the question has no expected points
+    """
+    results = [None] * len(items)
+    gradable = []
+    for index, item in enumerate(items):
+        points = item['expected_points'] or expected_points.get(str(item['question_id']))
+        if not points:
+            results[index] = {'question_id': item['question_id'], 'error': 'Question not found or has no expected points'}
+        else:
+            gradable.append((index, points))
+
+    coverages = point_coverage([items[i]['answer'] for i, _ in gradable], [points for _, points in gradable])
+
+    for (index, points), coverage in zip(gradable, coverages):
+        # Full credit for a point at COVERAGE_THRESHOLD, proportionally less below it
+        credit = np.minimum(coverage / COVERAGE_THRESHOLD, 1.0)
+        results[index] = {
+            'question_id': items[index]['question_id'],
+            'score': round(float(credit.mean()), 3),
+            'points': [
+                {'point': point, 'coverage': round(float(c), 3), 'covered': bool(c >= COVERAGE_THRESHOLD)}
+                for point, c in zip(points, coverage)
+            ]
+        }
+
+    return results
@@ -1,24 +1,126 @@
 """Main Lambda handler for Quizify."""
+import base64
+import hashlib
 import json
+import math
 import os
+import random
+import re
+import threading
+import time
 import urllib.parse
+from contextlib import contextmanager
 
-from s3_client import download_file_to_tmp, generate_presigned_url, get_object_content
-from text_extractor import extract_text, TextExtractionError
+import boto3
+from botocore.exceptions import ClientError
+
+from s3_client import (
+    download_file_to_tmp,
+    generate_presigned_url,
+    get_object_content,
+    open_object,
+    RANGED_READ_THRESHOLD,
+    put_extracted_text,
+    get_extracted_text,
+    has_extracted_text,
+    object_exists,
+    put_generated_questions,
+    get_generated_questions,
+    copy_extracted_text,
+    get_content_hash,
+    create_multipart_upload,
+    complete_multipart_upload,
+    abort_multipart_upload,
+    MIN_PART_SIZE,
+    MAX_PART_SIZE,
+    MAX_PARTS
+)
+from text_extractor import (
+    extract_text,
+    TextExtractionError,
+    ExtractionBudget,
+    EXTRACTION_TIMEOUT,
+    PAGE_TIMEOUT
+)
 from question_generator import generate_questions, QuestionGenerationError
+from dedup import deduplicate_questions
+from serialization import dumps, loads, compress
+from export import EXPORT_FORMATS, parse_export_filters, iter_export
+from grading import parse_grade_request, grade_answers
+from compose import parse_compose_request, compose_quiz
+from lifecycle import archive_due_uploads, restore_upload
 from dynamodb_client import (
-    save_upload,
+    acquire_processing_lease,
+    acquire_generation_slot,
+    release_generation_slot,
+    MAX_GENERATION_CONCURRENCY,
+    record_upload_stage,
     update_upload_status,
     save_questions,
     get_questions_by_upload_id,
     get_upload_by_id,
-    list_uploads
+    list_uploads,
+    clone_questions,
+    register_content_hash,
+    find_completed_upload_by_hash,
+    save_batch,
+    get_batch,
+    get_uploads_by_ids,
+    get_questions_by_upload_ids,
+    get_questions_by_ids,
+    iter_question_ids_by_topic,
+    backfill_topic_index,
+    iter_question_pages
 )
-from utils import get_file_extension
+from sqs_client import (
+    LARGE_JOB_QUEUE_URL, LARGE_JOB_MIN_SECONDS,
+    check_admission, get_queue_status, send_to_large_job_queue
+)
+from scheduling import estimate_cost, pdf_page_count
+from utils import generate_uuid, get_file_extension
 
 
 UPLOADS_BUCKET = os.environ.get('UPLOADS_BUCKET', '')
 
+lambda_client = boto3.client('lambda')
+
+MAX_QUESTIONS_PER_TYPE = 20
+
+MAX_BATCH_FILES = 50
+
+# Most uploads GET /questions?ids= returns in one response
+MAX_BATCH_QUESTION_UPLOADS = 25
+
+# API Gateway can't stream, so exports are returned in pages of about this many questions
+EXPORT_PAGE_SIZE = int(os.environ.get('EXPORT_PAGE_SIZE', '2000'))
+
+# A narrow filter can match few items per Scan page, so an export page also
+# ends after this many Scan pages or seconds (API Gateway gives up at 29 s)
+EXPORT_MAX_SCAN_PAGES = int(os.environ.get('EXPORT_MAX_SCAN_PAGES', '10'))
+EXPORT_TIME_BUDGET_SECONDS = float(os.environ.get('EXPORT_TIME_BUDGET_SECONDS', '20'))
+
+ALLOWED_EXTENSIONS = ['pdf', 'docx', 'doc', 'txt']
+
+UPLOAD_KEY_PATTERN = re.compile(r'^uploads/[0-9a-f-]{36}/[^/]+$')
+
+# Time kept back from extraction for question generation and saving
+GENERATION_RESERVE_SECONDS = float(os.environ.get('GENERATION_RESERVE_SECONDS', '90'))
+
+# Longest wait for a free generation slot before giving the message back to
+# the queue (a redelivery resumes after extraction)
+GENERATION_SLOT_WAIT_SECONDS = float(os.environ.get('GENERATION_SLOT_WAIT_SECONDS', '60'))
+
+# The timeout watchdog marks an upload failed this long before Lambda's deadline
+WATCHDOG_MARGIN_SECONDS = 5
+
+# Checkpointed processing stages, in order
+PIPELINE_STAGES = ('extract', 'generate', 'persist')
+
+# A processing lease outlives its invocation by this long before others may take over
+LEASE_MARGIN_SECONDS = 30
+# Lease length when there is no Lambda context (Lambda's maximum timeout)
+DEFAULT_LEASE_SECONDS = 900
+
 
 def lambda_handler(event, context):
     """Main entry point - routes to appropriate handler."""
@@ -28,21 +130,163 @@ def lambda_handler(event, context):
     if 'Records' in event and event['Records']:
         record = event['Records'][0]
         if record.get('eventSource') == 'aws:s3':
-            return handle_s3_event(event)
+            return handle_s3_event(event, context)
+        if record.get('eventSource') == 'aws:sqs':
+            return handle_queue_event(event, context)
 
     # API Gateway event
     if 'requestContext' in event:
-        return handle_api_event(event)
+        return handle_api_event(event, context)
+
+    # Daily EventBridge schedule: archive uploads nearing expiry
+    if event.get('source') == 'aws.events':
+        return success_response(archive_due_uploads(get_deadline(context)))
 
     # Direct invocation (for testing)
     if 'action' in event:
-        return handle_direct_event(event)
+        return handle_direct_event(event, context)
 
     return error_response(400, "Unknown event type")
 
 
-def handle_s3_event(event):
-    """Process uploaded file from S3 trigger."""
+def handle_queue_event(event, context=None):
+    """Process S3 upload notifications delivered through the processing queue.
+
+    Uploads estimated to be slow are moved from the main queue to the
+    large-job queue instead of being processed here. Retryable failures
+    propagate, so SQS redelivers the message after its visibility timeout
+    (and moves it to the dead-letter queue after repeated failures).
+    """
+    processed = moved = 0
+    for message in event['Records']:
+        notification = json.loads(message['body'])
+
+        # S3 sends a test message when the notification is first configured
+        if notification.get('Event') == 's3:TestEvent':
+            continue
+
+        for record in notification.get('Records') or []:
+            if LARGE_JOB_QUEUE_URL and notification.get('lane') != 'large':
+                cost = estimate_upload_cost(record)
+                if cost >= LARGE_JOB_MIN_SECONDS:
+                    print(f"Moving {record['s3']['object']['key']} (about {cost:.0f}s) to the large-job queue")
+                    send_to_large_job_queue(record)
+                    moved += 1
+                    continue
+
+            handle_s3_event({'Records': [record]}, context)
+            processed += 1
+
+    return {'statusCode': 200, 'body': json.dumps({'processed': processed, 'moved': moved})}
+
+
+def estimate_upload_cost(record: dict) -> float:
+    """Estimate the processing seconds of an S3 upload notification record.
+
+    PDF page counts are read from the trailer with a few ranged GETs.
+    """
+    s3_object = record['s3']['object']
+    key = urllib.parse.unquote_plus(s3_object['key'])
+    size = s3_object.get('size', 0)
+    extension = get_file_extension(key)
+
+    pages = None
+    if extension == 'pdf' and size:
+        pages = pdf_page_count(open_object(record['s3']['bucket']['name'], key, size))
+    return estimate_cost(size, extension, pages)
+
+
+def start_timeout_watchdog(upload_id: str, context, regenerating: bool = False):
+    """Mark the upload failed shortly before Lambda kills the invocation.
+
+    Runs on a timer thread, so it fires even if the main thread is stuck
+    in a parser or a model call. Cancel it once processing finishes. When
+    regenerating, an upload that already has questions is put back to
+    completed instead (see end_failed_regeneration).
+    """
+    if context is None:
+        return None
+
+    delay = context.get_remaining_time_in_millis() / 1000 - WATCHDOG_MARGIN_SECONDS
+
+    def on_timeout():
+        if regenerating:
+            print(f"Invocation about to time out, ending regeneration of upload {upload_id}")
+            end_failed_regeneration(upload_id, 'Regeneration timed out')
+            return
+        print(f"Invocation about to time out, marking upload {upload_id} failed")
+        update_upload_status(upload_id, 'failed', error='Processing timed out', retryable=True)
+
+    watchdog = threading.Timer(max(delay, 0), on_timeout)
+    watchdog.daemon = True
+    watchdog.start()
+    return watchdog
+
+
+def get_lease_seconds(context) -> float:
+    """How long to hold a processing lease: this invocation's remaining time plus a margin."""
+    if context is None:
+        return DEFAULT_LEASE_SECONDS
+    return context.get_remaining_time_in_millis() / 1000 + LEASE_MARGIN_SECONDS
+
+
+@contextmanager
+def generation_slot(context):
+    """Hold one of MAX_GENERATION_CONCURRENCY generation slots around a model call.
+
+    The SQS event sources cap whole uploads in flight; this caps the Gemini
+    calls among them, so a burst of uploads extracts in parallel but
+    doesn't exceed the model quota. While every slot is taken the caller
+    waits with backoff. If none frees up in time (GENERATION_SLOT_WAIT_SECONDS,
+    leaving time to generate), QuestionGenerationError is raised, which
+    processing treats as retryable.
+    """
+    if MAX_GENERATION_CONCURRENCY <= 0:
+        yield
+        return
+
+    owner = getattr(context, 'aws_request_id', None) or generate_uuid()
+    deadline = time.monotonic() + GENERATION_SLOT_WAIT_SECONDS
+    lambda_deadline = get_deadline(context, margin_seconds=GENERATION_RESERVE_SECONDS)
+    if lambda_deadline is not None:
+        deadline = min(deadline, lambda_deadline)
+
+    delay = 0.5
+    while True:
+        slot_id = acquire_generation_slot(owner, get_lease_seconds(context))
+        if slot_id:
+            break
+        if time.monotonic() + delay >= deadline:
+            raise QuestionGenerationError("Too many question generations in progress, try again shortly")
+        time.sleep(delay * random.uniform(0.5, 1.5))
+        delay = min(delay * 2, 5)
+
+    try:
+        yield
+    finally:
+        release_generation_slot(slot_id, owner)
+
+
+def get_extraction_budget(context) -> ExtractionBudget:
+    """Extraction time limits, leaving time for generation and saving."""
+    total = EXTRACTION_TIMEOUT
+    if context is not None:
+        remaining = context.get_remaining_time_in_millis() / 1000 - GENERATION_RESERVE_SECONDS
+        total = min(total, max(remaining, 1))
+    return ExtractionBudget(total_seconds=total, page_seconds=PAGE_TIMEOUT)
+
+
+def handle_s3_event(event, context=None):
+    """Process uploaded file from S3 trigger.
+
+    Processing runs in stages (fetch + extract, generate, persist), each
+    checkpointed: extracted text and raw model output go to S3 and the last
+    completed stage is recorded on the upload. An invocation that takes
+    over an upload (a Lambda retry or a redelivered event) resumes after
+    the last completed stage instead of starting over.
+    """
+    watchdog = None
+    upload = None
     try:
         record = event['Records'][0]
         bucket = record['s3']['bucket']['name']
@@ -58,64 +302,180 @@ def handle_s3_event(event):
 
         upload_id = key_parts[1]
         filename = key_parts[2]
+        content_hash = get_content_hash(bucket, key, record['s3']['object'])
 
-        # Save upload record
-        save_upload(upload_id, filename, key, status='processing')
+        # Claim the upload; duplicate deliveries of the same event stop here
+        owner = getattr(context, 'aws_request_id', None) or generate_uuid()
+        upload = acquire_processing_lease(
+            upload_id, filename, key, owner, get_lease_seconds(context), content_hash=content_hash
+        )
+        if not upload:
+            print(f"Upload {upload_id} is already processed or being processed, skipping duplicate event")
+            return {'statusCode': 200, 'body': 'Duplicate event skipped'}
+        watchdog = start_timeout_watchdog(upload_id, context)
 
-        # Download and extract text
-        print("Downloading file...")
-        file_content = get_object_content(bucket, key)
+        stage = upload.get('stage')
+        completed = PIPELINE_STAGES.index(stage) + 1 if stage in PIPELINE_STAGES else 0
+        timings = {name: int(ms) for name, ms in (upload.get('stage_timings') or {}).items()}
+        skipped_pages = [int(page) for page in upload.get('skipped_pages') or []]
 
-        print("Extracting text...")
-        text = extract_text(file_content=file_content, filename=filename)
-        print(f"Extracted {len(text)} characters")
+        if completed:
+            print(f"Resuming upload {upload_id} after stage '{stage}'")
+        else:
+            # Byte-identical document already processed: reuse its questions
+            source = find_completed_upload_by_hash(content_hash)
+            if source:
+                return reuse_upload_questions(source, upload_id, filename, bucket)
 
-        if len(text) < 50:
-            raise TextExtractionError("Extracted text is too short. Please upload a document with more content.")
+        # Checkpoints are reused only if their stage completed; a missing
+        # checkpoint just means redoing that stage
+        questions_data = get_generated_questions(upload_id, bucket=bucket) if completed >= 2 else None
 
-        # Generate questions
-        print("Generating questions...")
-        questions_data = generate_questions(text)
-        print(f"Generated {len(questions_data.get('mcqs', []))} MCQs and {len(questions_data.get('short_questions', []))} short questions")
+        if questions_data is None:
+            text = get_extracted_text(upload_id, bucket=bucket) if completed >= 1 else None
+
+            # Stage: fetch + extract (checkpoint: extracted text)
+            if text is None:
+                text, skipped_pages = extract_stage(bucket, key, filename, record['s3']['object'], context, timings)
+                put_extracted_text(upload_id, text, bucket=bucket)
+                record_upload_stage(upload_id, 'extract', timings, skipped_pages=skipped_pages)
+
+            # Stage: generate (checkpoint: raw model output)
+            print("Generating questions...")
+            start = time.monotonic()
+            with generation_slot(context):
+                questions_data = generate_questions(text)
+            timings['generate'] = elapsed_ms(start)
+            print(f"Generated {len(questions_data.get('mcqs', []))} MCQs and {len(questions_data.get('short_questions', []))} short questions")
+            put_generated_questions(upload_id, questions_data, bucket=bucket)
+            record_upload_stage(upload_id, 'generate', timings)
+
+        # Stage: persist (question ids are deterministic, so re-saving is safe)
+        start = time.monotonic()
+        questions_data, dropped = deduplicate_questions(questions_data)
+        print(f"Dropped {dropped} near-duplicate questions")
 
-        # Save questions to DynamoDB
         print("Saving questions...")
         saved = save_questions(upload_id, filename, questions_data)
         print(f"Saved {len(saved)} questions")
+        timings['persist'] = elapsed_ms(start)
+        record_upload_stage(upload_id, 'persist', timings)
+        print(f"Stage timings (ms): {json.dumps(timings)}")
 
         # Update upload status
-        update_upload_status(upload_id, 'completed', topic=questions_data.get('topic'))
+        update_upload_status(
+            upload_id,
+            'completed',
+            topic=questions_data.get('topic'),
+            skipped_pages=skipped_pages
+        )
+        register_content_hash(content_hash, upload_id)
 
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Questions generated successfully',
                 'upload_id': upload_id,
-                'questions_count': len(saved)
+                'questions_count': len(saved),
+                'duplicates_dropped': dropped,
+                'stage_timings': timings
             })
         }
 
     except TextExtractionError as e:
         print(f"Text extraction error: {str(e)}")
-        if 'upload_id' in locals():
+        if upload:
             update_upload_status(upload_id, 'failed', error=str(e))
         return error_response(400, f"Text extraction failed: {str(e)}")
 
     except QuestionGenerationError as e:
+        # Raise so Lambda retries the event; the retry resumes from the checkpoint
         print(f"Question generation error: {str(e)}")
-        if 'upload_id' in locals():
-            update_upload_status(upload_id, 'failed', error=str(e))
-        return error_response(500, f"Question generation failed: {str(e)}")
+        if upload:
+            update_upload_status(upload_id, 'failed', error=str(e), retryable=True)
+        raise
 
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
-        if 'upload_id' in locals():
-            update_upload_status(upload_id, 'failed', error=str(e))
-        return error_response(500, f"Processing failed: {str(e)}")
+        if upload:
+            update_upload_status(upload_id, 'failed', error=str(e), retryable=True)
+        raise
+
+    finally:
+        if watchdog:
+            watchdog.cancel()
+
+
+def extract_stage(bucket: str, key: str, filename: str, s3_object: dict, context, timings: dict):
+    """Fetch an uploaded file and extract its text.
+
+    Large PDFs are parsed through ranged reads, so their fetch time is
+    mostly counted under extract.
+
+    Returns:
+        Tuple of (extracted text, skipped page numbers)
+    """
+    start = time.monotonic()
+    size = s3_object.get('size') or 0
+    if get_file_extension(filename) == 'pdf' and size > RANGED_READ_THRESHOLD:
+        # Large PDFs: parse via ranged reads, fetching only what PyPDF2 touches
+        print("Opening file for ranged reads...")
+        file_content = open_object(bucket, key, size=size)
+    else:
+        print("Downloading file...")
+        file_content = get_object_content(bucket, key)
+    timings['fetch'] = elapsed_ms(start)
+
+    print("Extracting text...")
+    start = time.monotonic()
+    budget = get_extraction_budget(context)
+    text = extract_text(file_content=file_content, filename=filename, budget=budget)
+    timings['extract'] = elapsed_ms(start)
+    print(f"Extracted {len(text)} characters")
+    if budget.skipped_pages:
+        print(f"Skipped slow pages: {budget.skipped_pages}")
+    if hasattr(file_content, 'raw'):
+        print(f"Ranged read stats: {json.dumps(file_content.raw.stats())}")
+
+    if len(text) < 50:
+        raise TextExtractionError("Extracted text is too short. Please upload a document with more content.")
+
+    return text, budget.skipped_pages
+
 
+def elapsed_ms(start: float) -> int:
+    """Milliseconds since a time.monotonic() reading."""
+    return int((time.monotonic() - start) * 1000)
 
-def handle_api_event(event):
+
+def reuse_upload_questions(source: dict, upload_id: str, filename: str, bucket: str):
+    """Complete an upload by copying questions from an identical upload."""
+    source_upload_id = source['upload_id']
+    print(f"Duplicate of upload {source_upload_id}, reusing its questions")
+
+    saved = clone_questions(source_upload_id, upload_id, filename)
+    copy_extracted_text(source_upload_id, upload_id, bucket=bucket)
+    update_upload_status(upload_id, 'completed', topic=source.get('topic'))
+    print(f"Copied {len(saved)} questions")
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({
+            'message': 'Questions reused from identical upload',
+            'upload_id': upload_id,
+            'source_upload_id': source_upload_id,
+            'questions_count': len(saved)
+        })
+    }
+
+
+def handle_api_event(event, context=None):
     """Handle API Gateway requests."""
+    return compress_response(route_api_event(event, context), event)
+
+
+def route_api_event(event, context=None):
+    """Dispatch an API Gateway request to its route handler."""
     method = event.get('httpMethod', event.get('requestContext', {}).get('http', {}).get('method', ''))
     path = event.get('path', event.get('rawPath', ''))
 
@@ -125,10 +485,49 @@ def handle_api_event(event):
     if '/presigned-url' in path and method == 'GET':
         return get_presigned_url_handler(event)
 
+    # POST /multipart-upload, /multipart-upload/complete, /multipart-upload/abort
+    if '/multipart-upload' in path and method == 'POST':
+        if path.endswith('/complete'):
+            return complete_multipart_upload_handler(event)
+        if path.endswith('/abort'):
+            return abort_multipart_upload_handler(event)
+        return create_multipart_upload_handler(event)
+
+    # POST /uploads/batch, GET /uploads/batch/{batch_id}
+    if '/uploads/batch' in path:
+        if method == 'POST':
+            return create_batch_upload_handler(event)
+        if method == 'GET':
+            return get_batch_handler(event)
+
+    # POST /uploads/{upload_id}/restore
+    if path.endswith('/restore') and method == 'POST':
+        return restore_upload_handler(event)
+
+    # POST /uploads/{upload_id}/regenerate
+    if path.endswith('/regenerate') and method == 'POST':
+        return regenerate_handler(event)
+
     # GET /questions/{upload_id}
     if '/questions/' in path and method == 'GET':
         return get_questions_handler(event)
 
+    # GET /questions?ids=a,b,c
+    if path.endswith('/questions') and method == 'GET':
+        return get_questions_batch_handler(event)
+
+    # POST /grade
+    if path.endswith('/grade') and method == 'POST':
+        return grade_handler(event)
+
+    # POST /quizzes/compose
+    if path.endswith('/quizzes/compose') and method == 'POST':
+        return compose_quiz_handler(event)
+
+    # GET /export
+    if path.endswith('/export') and method == 'GET':
+        return export_questions_handler(event, context)
+
     # GET /uploads
     if path.endswith('/uploads') and method == 'GET':
         return list_uploads_handler(event)
@@ -140,7 +539,7 @@ def handle_api_event(event):
     return error_response(404, f"Not found: {method} {path}")
 
 
-def handle_direct_event(event):
+def handle_direct_event(event, context=None):
     """Handle direct Lambda invocations (for testing)."""
     action = event.get('action')
 
@@ -156,9 +555,41 @@ def handle_direct_event(event):
         questions = get_questions_by_upload_id(upload_id)
         return success_response({'questions': questions})
 
+    if action == 'regenerate':
+        upload_id = event.get('upload_id')
+        if not upload_id:
+            return error_response(400, "upload_id required")
+        watchdog = start_timeout_watchdog(upload_id, context, regenerating=True)
+        try:
+            return regenerate_questions(
+                upload_id,
+                num_mcqs=event.get('num_mcqs', 5),
+                num_short=event.get('num_short', 5),
+                topic=event.get('topic'),
+                generation_id=event.get('generation_id'),
+                context=context
+            )
+        finally:
+            if watchdog:
+                watchdog.cancel()
+
+    if action == 'backfill_topic_index':
+        # Stops with a minute to spare; invoke again with the returned start_key
+        return success_response(backfill_topic_index(event.get('start_key'), get_deadline(context)))
+
+    if action == 'archive_uploads':
+        return success_response(archive_due_uploads(get_deadline(context), today=event.get('today')))
+
     return error_response(400, f"Unknown action: {action}")
 
 
+def get_deadline(context, margin_seconds: float = 60):
+    """time.monotonic() value a long-running job stops at, or None without a Lambda context."""
+    if not context:
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - margin_seconds
+
+
 def get_presigned_url_handler(event):
     """Generate presigned URL for file upload."""
     # Get filename from query parameters
@@ -167,30 +598,369 @@ def get_presigned_url_handler(event):
 
     # Validate file extension
     extension = get_file_extension(filename)
-    allowed = ['pdf', 'docx', 'doc', 'txt']
-    if extension not in allowed:
-        return error_response(400, f"Invalid file type. Allowed: {', '.join(allowed)}")
+    if extension not in ALLOWED_EXTENSIONS:
+        return error_response(400, f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}")
+
+    retry_after = check_admission()
+    if retry_after:
+        return throttled_response(retry_after)
 
     result = generate_presigned_url(filename)
 
     return success_response(result)
 
 
-def get_questions_handler(event):
-    """Get questions for a specific upload."""
-    # Extract upload_id from path
+def create_batch_upload_handler(event):
+    """Generate presigned upload URLs for several files as one batch.
+
+    Each uploaded file is processed by its own queued invocation, so files
+    in a batch run concurrently up to the processing concurrency limit.
+    """
+    try:
+        body = parse_json_body(event)
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    filenames = body.get('filenames')
+    if not isinstance(filenames, list) or not filenames:
+        return error_response(400, "filenames must be a non-empty list")
+    if len(filenames) > MAX_BATCH_FILES:
+        return error_response(400, f"Too many files. Maximum is {MAX_BATCH_FILES} per batch")
+
+    invalid = [
+        str(name) for name in filenames
+        if not isinstance(name, str) or '/' in name or get_file_extension(name) not in ALLOWED_EXTENSIONS
+    ]
+    if invalid:
+        return error_response(
+            400, f"Invalid file type for {', '.join(invalid)}. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+
+    retry_after = check_admission(len(filenames))
+    if retry_after:
+        return throttled_response(retry_after)
+
+    uploads = [dict(generate_presigned_url(name), filename=name) for name in filenames]
+    batch = save_batch(generate_uuid(), uploads)
+
+    return success_response({
+        'batch_id': batch['batch_id'],
+        'uploads': uploads
+    })
+
+
+def get_batch_handler(event):
+    """Get aggregate progress and per-file status for a batch."""
+    batch_id = get_path_upload_id(event, 'batch', param='batch_id')
+
+    if not batch_id:
+        return error_response(400, "batch_id required")
+
+    batch = get_batch(batch_id)
+    if not batch:
+        return error_response(404, f"Batch not found: {batch_id}")
+
+    found = get_uploads_by_ids([u['upload_id'] for u in batch['uploads']])
+
+    # Files not yet uploaded to S3 have no upload record
+    counts = {'pending': 0, 'processing': 0, 'completed': 0, 'failed': 0}
+    uploads = []
+    for entry in batch['uploads']:
+        upload = found.get(entry['upload_id'], {})
+        status = upload.get('status', 'pending')
+        counts[status] = counts.get(status, 0) + 1
+        uploads.append({
+            'upload_id': entry['upload_id'],
+            'filename': entry['filename'],
+            'status': status,
+            'topic': upload.get('topic', ''),
+            'error': upload.get('error_message')
+        })
+
+    done = counts['completed'] + counts['failed'] == len(uploads)
+    return success_response({
+        'batch_id': batch_id,
+        'total': len(uploads),
+        'counts': counts,
+        'done': done,
+        'uploads': uploads,
+        'queue': None if done else get_queue_status()
+    })
+
+
+def create_multipart_upload_handler(event):
+    """Start a multipart upload with presigned, checksummed part URLs."""
+    try:
+        body = parse_json_body(event)
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    filename = body.get('filename', '')
+    size = body.get('size')
+    part_size = body.get('part_size')
+    checksums = body.get('part_checksums') or []
+
+    extension = get_file_extension(filename)
+    if extension not in ALLOWED_EXTENSIONS or '/' in filename:
+        return error_response(400, f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}")
+
+    if not isinstance(size, int) or not isinstance(part_size, int) or size <= 0:
+        return error_response(400, "size and part_size must be positive integers")
+    if not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+        return error_response(400, f"part_size must be between {MIN_PART_SIZE} and {MAX_PART_SIZE} bytes")
+
+    part_count = math.ceil(size / part_size)
+    if part_count > MAX_PARTS:
+        return error_response(400, f"File needs more than {MAX_PARTS} parts; use a larger part_size")
+    if len(checksums) != part_count or not all(isinstance(c, str) and c for c in checksums):
+        return error_response(400, f"Expected {part_count} part checksums")
+
+    retry_after = check_admission()
+    if retry_after:
+        return throttled_response(retry_after)
+
+    result = create_multipart_upload(filename, checksums)
+    result['part_size'] = part_size
+
+    return success_response(result)
+
+
+def parse_multipart_reference(event):
+    """Parse and validate the s3_key/multipart_upload_id of a request body."""
+    body = parse_json_body(event)
+    s3_key = body.get('s3_key', '')
+    multipart_upload_id = body.get('multipart_upload_id')
+
+    if not UPLOAD_KEY_PATTERN.match(s3_key) or not multipart_upload_id:
+        raise ValueError("Valid s3_key and multipart_upload_id required")
+
+    return body, s3_key, multipart_upload_id
+
+
+def complete_multipart_upload_handler(event):
+    """Assemble the parts of a multipart upload."""
+    try:
+        body, s3_key, multipart_upload_id = parse_multipart_reference(event)
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    parts = body.get('parts') or []
+    required = ('part_number', 'etag', 'checksum_sha256')
+    if not parts or not all(isinstance(p, dict) and all(p.get(k) for k in required) for p in parts):
+        return error_response(400, "parts must list part_number, etag and checksum_sha256")
+
+    try:
+        result = complete_multipart_upload(s3_key, multipart_upload_id, parts)
+    except ClientError as e:
+        return error_response(400, f"Could not complete upload: {e.response.get('Error', {}).get('Message', str(e))}")
+    result['upload_id'] = s3_key.split('/')[1]
+
+    return success_response(result)
+
+
+def abort_multipart_upload_handler(event):
+    """Abort a multipart upload."""
+    try:
+        _, s3_key, multipart_upload_id = parse_multipart_reference(event)
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    abort_multipart_upload(s3_key, multipart_upload_id)
+
+    return success_response({'s3_key': s3_key, 'status': 'aborted'})
+
+
+def get_path_upload_id(event, resource: str, param: str = 'upload_id'):
+    """Get the ID path parameter (upload_id by default) that follows /{resource}/."""
     path = event.get('path', event.get('rawPath', ''))
     path_params = event.get('pathParameters') or {}
 
-    upload_id = path_params.get('upload_id')
+    upload_id = path_params.get(param)
     if not upload_id:
         # Try to extract from path
         parts = path.split('/')
-        if 'questions' in parts:
-            idx = parts.index('questions')
+        if resource in parts:
+            idx = parts.index(resource)
             if idx + 1 < len(parts):
                 upload_id = parts[idx + 1]
 
+    return upload_id
+
+
+def parse_json_body(event) -> dict:
+    """Parse the JSON request body of an API Gateway event."""
+    body = event.get('body') or '{}'
+    if event.get('isBase64Encoded'):
+        body = base64.b64decode(body).decode('utf-8')
+    data = json.loads(body)
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    return data
+
+
+def parse_generation_options(data: dict) -> dict:
+    """Validate num_mcqs, num_short and topic generation parameters."""
+    options = {}
+    for name in ('num_mcqs', 'num_short'):
+        value = data.get(name, 5)
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_QUESTIONS_PER_TYPE:
+            raise ValueError(f"{name} must be an integer between 0 and {MAX_QUESTIONS_PER_TYPE}")
+        options[name] = value
+
+    if options['num_mcqs'] == 0 and options['num_short'] == 0:
+        raise ValueError("At least one of num_mcqs or num_short must be positive")
+
+    topic = data.get('topic')
+    if topic is not None and not isinstance(topic, str):
+        raise ValueError("topic must be a string")
+    options['topic'] = topic or None
+
+    return options
+
+
+def regenerate_handler(event):
+    """Queue new questions for an upload from its stored text."""
+    upload_id = get_path_upload_id(event, 'uploads')
+    if not upload_id:
+        return error_response(400, "upload_id required")
+
+    try:
+        options = parse_generation_options(parse_json_body(event))
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    upload = get_upload_by_id(upload_id)
+    if not upload:
+        return error_response(404, f"Upload not found: {upload_id}")
+    if upload.get('status') == 'processing':
+        return error_response(409, "Upload is still being processed")
+    if upload.get('status') == 'archived':
+        return error_response(409, "Upload is archived; restore it first")
+    # Uploads processed before extracted text was persisted have only the file
+    s3_key = upload.get('s3_key')
+    if not (has_extracted_text(upload_id) or (s3_key and object_exists(UPLOADS_BUCKET, s3_key))):
+        return error_response(409, "Neither the uploaded file nor its extracted text is stored any more")
+
+    update_upload_status(upload_id, 'processing')
+
+    # Generation outlasts the API Gateway timeout, so run it asynchronously;
+    # clients poll GET /questions/{upload_id} as they do after an upload.
+    lambda_client.invoke(
+        FunctionName=os.environ['AWS_LAMBDA_FUNCTION_NAME'],
+        InvocationType='Event',
+        Payload=json.dumps({
+            'action': 'regenerate',
+            'upload_id': upload_id,
+            # Retries of this invocation overwrite the same questions
+            'generation_id': generate_uuid(),
+            **options
+        })
+    )
+
+    return success_response({
+        'upload_id': upload_id,
+        'status': 'processing'
+    })
+
+
+def restore_upload_handler(event):
+    """Restore an archived upload and its questions from its archive."""
+    upload_id = get_path_upload_id(event, 'uploads')
+    if not upload_id:
+        return error_response(400, "upload_id required")
+
+    upload = get_upload_by_id(upload_id)
+    if not upload:
+        return error_response(404, f"Upload not found: {upload_id}")
+    if upload.get('status') != 'archived':
+        return error_response(409, "Upload is not archived")
+
+    result = restore_upload(upload)
+    if result is None:
+        return error_response(409, "Upload is not archived")
+    return success_response(result)
+
+
+def regenerate_questions(
+    upload_id: str,
+    num_mcqs: int = 5,
+    num_short: int = 5,
+    topic: str = None,
+    generation_id: str = None,
+    context=None
+):
+    """Generate additional questions for an upload without re-extracting text."""
+    try:
+        upload = get_upload_by_id(upload_id)
+        if not upload:
+            return error_response(404, f"Upload not found: {upload_id}")
+
+        text = get_extracted_text(upload_id)
+        if text is None:
+            # Uploads processed before extracted text was persisted
+            print("No stored text, extracting from original file...")
+            file_content = get_object_content(UPLOADS_BUCKET, upload['s3_key'])
+            text = extract_text(file_content=file_content, filename=upload['filename'])
+            put_extracted_text(upload_id, text)
+
+        print("Generating questions...")
+        with generation_slot(context):
+            questions_data = generate_questions(
+                text,
+                num_mcqs=num_mcqs,
+                num_short=num_short,
+                topic=topic or upload.get('topic')
+            )
+
+        # Drop questions that repeat ones already saved for this upload
+        existing = [q['question'] for q in get_questions_by_upload_id(upload_id)]
+        questions_data, dropped = deduplicate_questions(questions_data, existing=existing)
+        print(f"Dropped {dropped} near-duplicate questions")
+
+        saved = save_questions(
+            upload_id,
+            upload['filename'],
+            questions_data,
+            generation_id=generation_id or generate_uuid()
+        )
+        print(f"Saved {len(saved)} questions")
+
+        update_upload_status(upload_id, 'completed', topic=questions_data.get('topic'))
+
+        return success_response({
+            'upload_id': upload_id,
+            'questions_count': len(saved),
+            'duplicates_dropped': dropped
+        })
+
+    except (TextExtractionError, QuestionGenerationError) as e:
+        print(f"Regeneration error: {str(e)}")
+        end_failed_regeneration(upload_id, str(e))
+        return error_response(400, f"Regeneration failed: {str(e)}")
+
+    except Exception as e:
+        print(f"Unexpected error: {str(e)}")
+        end_failed_regeneration(upload_id, str(e))
+        return error_response(500, f"Regeneration failed: {str(e)}")
+
+
+def end_failed_regeneration(upload_id: str, error: str) -> None:
+    """Put an upload back after a failed regeneration.
+
+    Its saved questions are untouched, so an upload that has any is
+    completed again and the error is only reported; one without questions
+    is marked failed.
+    """
+    if get_questions_by_upload_id(upload_id):
+        update_upload_status(upload_id, 'completed')
+    else:
+        update_upload_status(upload_id, 'failed', error=error)
+
+
+def get_questions_handler(event):
+    """Get questions for a specific upload."""
+    upload_id = get_path_upload_id(event, 'questions')
+
     if not upload_id:
         return error_response(400, "upload_id required")
 
@@ -202,20 +972,51 @@ def get_questions_handler(event):
     # Get questions
     questions = get_questions_by_upload_id(upload_id)
 
+    result = format_upload_questions(upload, questions)
+    if upload.get('status') == 'processing':
+        # Current load, so clients can show how long processing may take
+        result['queue'] = get_queue_status()
+
+    return conditional_response(success_response(result), event)
+
+
+def get_questions_batch_handler(event):
+    """Get the questions of several uploads in one response."""
+    params = event.get('queryStringParameters') or {}
+    upload_ids = list(dict.fromkeys(i.strip() for i in (params.get('ids') or '').split(',') if i.strip()))
+
+    if not upload_ids:
+        return error_response(400, "ids required")
+    if len(upload_ids) > MAX_BATCH_QUESTION_UPLOADS:
+        return error_response(400, f"At most {MAX_BATCH_QUESTION_UPLOADS} ids per request")
+
+    uploads = get_uploads_by_ids(upload_ids)
+    found = [upload_id for upload_id in upload_ids if upload_id in uploads]
+    questions = get_questions_by_upload_ids(found)
+
+    return success_response({
+        'uploads': [format_upload_questions(uploads[upload_id], questions[upload_id]) for upload_id in found],
+        'not_found': [upload_id for upload_id in upload_ids if upload_id not in uploads]
+    })
+
+
+def format_upload_questions(upload: dict, questions: list) -> dict:
+    """Build the questions response for one upload."""
     # Separate MCQs and short questions
     mcqs = [q for q in questions if q.get('type') == 'MCQ']
     short_questions = [q for q in questions if q.get('type') == 'SHORT']
 
-    return success_response({
-        'upload_id': upload_id,
+    return {
+        'upload_id': upload['upload_id'],
         'status': upload.get('status', 'unknown'),
         'filename': upload.get('filename', ''),
         'topic': upload.get('topic', ''),
         'error': upload.get('error_message'),
+        'skipped_pages': upload.get('skipped_pages', []),
         'mcqs': mcqs,
         'short_questions': short_questions,
         'total_questions': len(questions)
-    })
+    }
 
 
 def list_uploads_handler(event):
@@ -228,6 +1029,167 @@ def list_uploads_handler(event):
     })
 
 
+def encode_export_cursor(last_key: dict) -> str:
+    """Encode a scan's LastEvaluatedKey as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(dumps(last_key)).decode('ascii')
+
+
+def decode_export_cursor(cursor: str) -> dict:
+    """Decode a cursor from encode_export_cursor."""
+    try:
+        last_key = loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_key, dict) or not isinstance(last_key.get('question_id'), str):
+        raise ValueError("Invalid cursor")
+    return last_key
+
+
+def grade_handler(event):
+    """Grade short answers against their questions' expected points."""
+    try:
+        items = parse_grade_request(parse_json_body(event))
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    questions = get_questions_by_ids(
+        [str(item['question_id']) for item in items if item['expected_points'] is None],
+        projection='question_id, expected_points'
+    )
+    results = grade_answers(items, {
+        question_id: question.get('expected_points') for question_id, question in questions.items()
+    })
+
+    return success_response({
+        'results': results,
+        'count': len(results)
+    })
+
+
+def compose_quiz_handler(event):
+    """Build a quiz from questions sampled across uploads by topic, type and difficulty."""
+    try:
+        spec = parse_compose_request(parse_json_body(event))
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    candidates = iter_question_ids_by_topic(spec['topics'], spec['type'], spec['difficulty'])
+    return success_response(compose_quiz(spec, candidates, get_questions_by_ids))
+
+
+def export_questions_handler(event, context=None):
+    """Export questions as NDJSON or CSV, one page per request.
+
+    Lambda behind API Gateway returns whole responses, so the export is
+    paged: each response holds roughly EXPORT_PAGE_SIZE questions read from
+    successive Scan pages, and X-Next-Cursor carries the cursor for the next
+    request (absent on the last page). A page also ends after
+    EXPORT_MAX_SCAN_PAGES Scan pages or EXPORT_TIME_BUDGET_SECONDS, so it
+    may hold few or no questions while a cursor is still returned. Only the
+    CSV header row is sent on the first page, so concatenated pages form
+    one file.
+    """
+    params = event.get('queryStringParameters') or {}
+    try:
+        filters = parse_export_filters(params)
+        start_key = decode_export_cursor(params['cursor']) if params.get('cursor') else None
+    except ValueError as e:
+        return error_response(400, str(e))
+
+    pages = iter_question_pages(
+        topic=filters['topic'],
+        question_type=filters['type'],
+        since=filters['since'],
+        before=filters['before'],
+        start_key=start_key,
+        page_size=EXPORT_PAGE_SIZE
+    )
+
+    deadline = time.monotonic() + EXPORT_TIME_BUDGET_SECONDS
+    lambda_deadline = get_deadline(context, margin_seconds=WATCHDOG_MARGIN_SECONDS)
+    if lambda_deadline is not None:
+        deadline = min(deadline, lambda_deadline)
+
+    # Read whole Scan pages until enough questions are collected or the
+    # page's scan budget is spent (at least one Scan page, so paging advances)
+    questions = []
+    last_key = None
+    for scanned, (items, last_key) in enumerate(pages, start=1):
+        questions.extend(items)
+        if (len(questions) >= EXPORT_PAGE_SIZE or scanned >= EXPORT_MAX_SCAN_PAGES
+                or time.monotonic() >= deadline):
+            break
+
+    body = b''.join(iter_export(questions, filters['format'], header=start_key is None))
+
+    headers = {
+        'Content-Type': EXPORT_FORMATS[filters['format']],
+        'Content-Disposition': f"attachment; filename=questions.{filters['format']}",
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+        'Access-Control-Expose-Headers': 'X-Next-Cursor'
+    }
+    if last_key:
+        headers['X-Next-Cursor'] = encode_export_cursor(last_key)
+
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': body.decode('utf-8')
+    }
+
+
+def get_header(event, name: str) -> str:
+    """Get a request header case-insensitively (API Gateway v1 or v2)."""
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return ''
+
+
+def conditional_response(response: dict, event) -> dict:
+    """Tag a response with an ETag and answer 304 if the client's copy matches.
+
+    The tag is weak because the body may be compressed afterwards.
+    """
+    etag = 'W/"' + hashlib.sha1(response['body'].encode('utf-8')).hexdigest() + '"'
+    headers = dict(response.get('headers') or {}, ETag=etag)
+
+    if_none_match = get_header(event, 'If-None-Match')
+    client_tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    if if_none_match and ('*' in client_tags or etag.removeprefix('W/') in client_tags):
+        return {'statusCode': 304, 'headers': headers, 'body': ''}
+
+    return dict(response, headers=headers)
+
+
+def compress_response(response: dict, event) -> dict:
+    """Compress a response body per the request's Accept-Encoding.
+
+    API Gateway needs binary bodies base64-encoded with isBase64Encoded set.
+    """
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+
+    compressed, encoding = compress(body.encode('utf-8'), get_header(event, 'Accept-Encoding'))
+    if encoding is None:
+        return response
+
+    headers = dict(response.get('headers') or {})
+    headers['Content-Encoding'] = encoding
+    headers['Vary'] = 'Accept-Encoding'
+
+    return dict(
+        response,
+        headers=headers,
+        body=base64.b64encode(compressed).decode('ascii'),
+        isBase64Encoded=True
+    )
+
+
 def success_response(data: dict):
     """Create a success response."""
     return {
@@ -238,10 +1200,19 @@ def success_response(data: dict):
             'Access-Control-Allow-Headers': 'Content-Type,Authorization',
             'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
         },
-        'body': json.dumps(data, default=str)
+        'body': dumps(data).decode('utf-8')
     }
 
 
+def throttled_response(retry_after: int):
+    """Create a 429 response telling the client when to retry."""
+    response = error_response(
+        429, f"Server is busy processing other uploads. Please retry in {retry_after} seconds."
+    )
+    response['headers']['Retry-After'] = str(retry_after)
+    return response
+
+
 def error_response(status_code: int, message: str):
     """Create an error response."""
     return {
@@ -0,0 +1,140 @@
+"""Archival of uploads at the end of their retention period.
+
+Uploads, questions, content hashes and batches carry a DynamoDB TTL
+(expires_at, UPLOAD_RETENTION_DAYS after upload), and S3 lifecycle rules
+expire uploaded files and extracted text on the same schedule. Shortly
+before that, a daily scheduled run packs each due upload, its questions and
+its extracted text (so a restored upload can still be regenerated) into a
+compressed archive object (one per creation month per run) and
+replaces the upload with a small record pointing at its archive.
+
+Each upload is a separate gzip member of the archive, so restoring one
+reads only its byte range, while the whole object is still a valid
+.ndjson.gz file.
+"""
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from dynamodb_client import (
+    expiry_time,
+    get_upload_by_id,
+    get_questions_by_upload_id,
+    iter_upload_ids_due_for_archival,
+    replace_with_archive_record,
+    remove_from_archival,
+    delete_questions,
+    restore_upload_items
+)
+from s3_client import put_archive, get_archive_member, get_extracted_text, put_extracted_text
+from serialization import dumps
+from utils import generate_uuid
+
+
+# Archived upload records, and the archives themselves (see s3.tf), are kept this long
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', '730'))
+
+# An archive object is written once this much has been packed for its month
+ARCHIVE_OBJECT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def archive_due_uploads(deadline: float = None, today: str = None) -> dict:
+    """Archive every upload due for archival.
+
+    Uploads that never completed have nothing worth keeping; they are only
+    taken out of the archive-day index and left to expire.
+
+    Args:
+        deadline: time.monotonic() value to stop at (the next run continues)
+        today: Archive uploads due by this day (YYYY-MM-DD, default today)
+
+    Returns:
+        dict with counts of archived, removed (never completed) and skipped
+        (changed while being archived) uploads, the archive keys and bytes
+        written, and whether the run completed
+    """
+    run_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{generate_uuid()[:8]}"
+    summary = {'archived': 0, 'removed': 0, 'skipped': 0, 'archives': [], 'archive_bytes': 0, 'complete': True}
+    pending = {}
+
+    for upload_id in iter_upload_ids_due_for_archival(today):
+        if deadline and time.monotonic() >= deadline:
+            summary['complete'] = False
+            break
+
+        upload = get_upload_by_id(upload_id)
+        if not upload or 'archive_day' not in upload:
+            continue
+        if upload.get('status') != 'completed':
+            remove_from_archival(upload_id)
+            summary['removed'] += 1
+            continue
+
+        questions = get_questions_by_upload_id(upload_id)
+        text = get_extracted_text(upload_id)
+        member = gzip.compress(dumps({'upload': upload, 'questions': questions, 'text': text}) + b'\n')
+
+        month = (upload.get('created_at') or '')[:7] or 'undated'
+        buffer, entries = pending.setdefault(month, (bytearray(), []))
+        entries.append((upload, [q['question_id'] for q in questions], len(buffer), len(member)))
+        buffer += member
+
+        if len(buffer) >= ARCHIVE_OBJECT_MAX_BYTES:
+            write_archive(month, pending.pop(month), run_id, summary)
+
+    for month, packed in pending.items():
+        write_archive(month, packed, run_id, summary)
+
+    print(f"Archived {summary['archived']} uploads into {len(summary['archives'])} archives "
+          f"({summary['archive_bytes']} bytes); removed {summary['removed']}, skipped {summary['skipped']}")
+    return summary
+
+
+def write_archive(month: str, packed: tuple, run_id: str, summary: dict) -> None:
+    """Store one month's packed uploads, then replace them with archive records."""
+    buffer, entries = packed
+    key = f"archives/{month}/{run_id}-{len(summary['archives'])}.ndjson.gz"
+    put_archive(key, bytes(buffer))
+    summary['archives'].append(key)
+    summary['archive_bytes'] += len(buffer)
+
+    expires_at = expiry_time(ARCHIVE_RETENTION_DAYS)
+    for upload, question_ids, offset, length in entries:
+        archive = {'key': key, 'offset': offset, 'length': length}
+        if replace_with_archive_record(upload, archive, expires_at):
+            delete_questions(question_ids)
+            summary['archived'] += 1
+        else:
+            # Changed (e.g. regenerated) since it was read; a later run archives it again
+            summary['skipped'] += 1
+
+
+def restore_upload(record: dict) -> dict:
+    """Restore an archived upload, its questions and extracted text from its archive.
+
+    Args:
+        record: The upload's archive record (status 'archived')
+
+    Returns:
+        dict with upload_id, status and total_questions, or None if the
+        upload was restored by someone else in the meantime
+    """
+    archive = record['archive']
+    member = get_archive_member(archive['key'], int(archive['offset']), int(archive['length']))
+    # DynamoDB takes numbers as Decimal, not float
+    data = json.loads(member, parse_float=Decimal)
+
+    # Written first, so a restored upload always has its text; archives
+    # written before the text was archived have none
+    if data.get('text') is not None:
+        put_extracted_text(record['upload_id'], data['text'])
+    if not restore_upload_items(data['upload'], data['questions']):
+        return None
+    return {
+        'upload_id': record['upload_id'],
+        'status': 'completed',
+        'total_questions': len(data['questions'])
+    }
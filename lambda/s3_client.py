@@ -1,6 +1,12 @@
 """S3 client operations for Quizify."""
+import gzip
+import io
 import os
+from collections import OrderedDict
+from typing import Optional
 import boto3
+from botocore.exceptions import ClientError
+from serialization import dumps, loads
 from utils import generate_uuid, get_file_extension
 
 
@@ -8,6 +14,22 @@ s3_client = boto3.client('s3')
 
 UPLOADS_BUCKET = os.environ.get('UPLOADS_BUCKET', '')
 
+CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'doc': 'application/msword',
+    'txt': 'text/plain'
+}
+
+# S3 multipart limits
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+MAX_PARTS = 10000
+
+# PDFs larger than this are parsed through ranged reads instead of being
+# downloaded whole; below it one GET is faster than many small ones
+RANGED_READ_THRESHOLD = int(os.environ.get('RANGED_READ_THRESHOLD', str(8 * 1024 * 1024)))
+
 
 def download_file(bucket: str, key: str, local_path: str) -> str:
     """Download a file from S3 to local path."""
@@ -35,13 +57,7 @@ def generate_presigned_url(filename: str, expiration: int = 3600) -> dict:
     s3_key = f"uploads/{upload_id}/{filename}"
 
     # Determine content type
-    content_types = {
-        'pdf': 'application/pdf',
-        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'doc': 'application/msword',
-        'txt': 'text/plain'
-    }
-    content_type = content_types.get(extension, 'application/octet-stream')
+    content_type = CONTENT_TYPES.get(extension, 'application/octet-stream')
 
     url = s3_client.generate_presigned_url(
         'put_object',
@@ -60,7 +76,370 @@ def generate_presigned_url(filename: str, expiration: int = 3600) -> dict:
     }
 
 
+def create_multipart_upload(filename: str, part_checksums: list, expiration: int = 3600) -> dict:
+    """Start a multipart upload and presign a URL for every part.
+
+    Each part URL is signed with that part's SHA-256 checksum, so S3
+    rejects a part whose bytes don't match what the client hashed.
+
+    Args:
+        filename: Original filename
+        part_checksums: Base64 SHA-256 checksum of each part, in order
+        expiration: Part URL lifetime in seconds
+
+    Returns:
+        dict with upload_id, s3_key, multipart_upload_id and parts
+        (a list of part_number/upload_url dicts)
+    """
+    upload_id = generate_uuid()
+    extension = get_file_extension(filename)
+    s3_key = f"uploads/{upload_id}/{filename}"
+
+    response = s3_client.create_multipart_upload(
+        Bucket=UPLOADS_BUCKET,
+        Key=s3_key,
+        ContentType=CONTENT_TYPES.get(extension, 'application/octet-stream'),
+        ChecksumAlgorithm='SHA256'
+    )
+    multipart_upload_id = response['UploadId']
+
+    parts = []
+    for part_number, checksum in enumerate(part_checksums, start=1):
+        url = s3_client.generate_presigned_url(
+            'upload_part',
+            Params={
+                'Bucket': UPLOADS_BUCKET,
+                'Key': s3_key,
+                'UploadId': multipart_upload_id,
+                'PartNumber': part_number,
+                'ChecksumSHA256': checksum
+            },
+            ExpiresIn=expiration
+        )
+        parts.append({'part_number': part_number, 'upload_url': url})
+
+    return {
+        'upload_id': upload_id,
+        's3_key': s3_key,
+        'multipart_upload_id': multipart_upload_id,
+        'parts': parts
+    }
+
+
+def complete_multipart_upload(s3_key: str, multipart_upload_id: str, parts: list) -> dict:
+    """Assemble uploaded parts into the final object.
+
+    Args:
+        s3_key: S3 object key
+        multipart_upload_id: S3 multipart UploadId
+        parts: List of dicts with part_number, etag and checksum_sha256
+
+    Returns:
+        dict with s3_key and the final object's etag
+    """
+    response = s3_client.complete_multipart_upload(
+        Bucket=UPLOADS_BUCKET,
+        Key=s3_key,
+        UploadId=multipart_upload_id,
+        MultipartUpload={
+            'Parts': [
+                {
+                    'PartNumber': part['part_number'],
+                    'ETag': part['etag'],
+                    'ChecksumSHA256': part['checksum_sha256']
+                }
+                for part in sorted(parts, key=lambda p: p['part_number'])
+            ]
+        }
+    )
+    return {'s3_key': s3_key, 'etag': response.get('ETag', '')}
+
+
+def abort_multipart_upload(s3_key: str, multipart_upload_id: str) -> None:
+    """Abort a multipart upload and discard its uploaded parts."""
+    s3_client.abort_multipart_upload(
+        Bucket=UPLOADS_BUCKET,
+        Key=s3_key,
+        UploadId=multipart_upload_id
+    )
+
+
 def get_object_content(bucket: str, key: str) -> bytes:
     """Get the content of an S3 object as bytes."""
     response = s3_client.get_object(Bucket=bucket, Key=key)
     return response['Body'].read()
+
+
+class S3ObjectReader(io.RawIOBase):
+    """Seekable, read-only file over an S3 object backed by ranged GETs.
+
+    Data is fetched in fixed-size blocks kept in a small LRU cache, so
+    parsers that jump around (PDF readers start from the xref table at the
+    end of the file) only download the regions they touch. When reads hit
+    consecutive blocks, the next ``read_ahead`` blocks are fetched in the
+    same request.
+
+    Wrap in ``io.BufferedReader`` for parsers that issue many tiny reads.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        size: int = None,
+        block_size: int = 64 * 1024,
+        cache_blocks: int = 128,
+        read_ahead: int = 2
+    ):
+        super().__init__()
+        self.bucket = bucket
+        self.key = key
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.read_ahead = read_ahead
+
+        if size is None:
+            size = s3_client.head_object(Bucket=bucket, Key=key)['ContentLength']
+        self.size = size
+
+        self._position = 0
+        self._blocks = OrderedDict()
+        self._last_block = None
+
+        self.bytes_fetched = 0
+        self.requests = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast('B')
+        written = 0
+
+        while written < len(view) and self._position < self.size:
+            index, offset = divmod(self._position, self.block_size)
+            block = self._get_block(index)
+            chunk = block[offset:offset + len(view) - written]
+            view[written:written + len(chunk)] = chunk
+            written += len(chunk)
+            self._position += len(chunk)
+
+        return written
+
+    def _get_block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+        else:
+            count = 1
+            if self._last_block is not None and index == self._last_block + 1:
+                count += self.read_ahead
+            self._fetch(index, count)
+            block = self._blocks[index]
+
+        self._last_block = index
+        return block
+
+    def _fetch(self, index: int, count: int) -> None:
+        start = index * self.block_size
+        end = min(start + count * self.block_size, self.size) - 1
+
+        response = s3_client.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}")
+        data = response['Body'].read()
+        self.bytes_fetched += len(data)
+        self.requests += 1
+
+        for i in range(0, len(data), self.block_size):
+            self._blocks[index + i // self.block_size] = data[i:i + self.block_size]
+            self._blocks.move_to_end(index + i // self.block_size)
+        while len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Ranged-read statistics for this object."""
+        return {
+            'object_size': self.size,
+            'bytes_fetched': self.bytes_fetched,
+            'requests': self.requests,
+            'fetched_ratio': round(self.bytes_fetched / self.size, 3) if self.size else 0
+        }
+
+
+def open_object(bucket: str, key: str, size: int = None) -> io.BufferedReader:
+    """Open an S3 object as a buffered, seekable file using ranged GETs.
+
+    The underlying S3ObjectReader (with its stats) is available as ``.raw``.
+    """
+    reader = S3ObjectReader(bucket, key, size=size)
+    return io.BufferedReader(reader, buffer_size=8192)
+
+
+def get_extracted_text_key(upload_id: str) -> str:
+    """Get the S3 key for an upload's extracted text.
+
+    Stored outside the uploads/ prefix so writing it doesn't re-trigger
+    the S3 upload notification.
+    """
+    return f"extracted/{upload_id}/text.txt.gz"
+
+
+def put_extracted_text(upload_id: str, text: str, bucket: str = None) -> str:
+    """Store cleaned extracted text gzip-compressed in S3.
+
+    Returns:
+        S3 key of the stored text
+    """
+    key = get_extracted_text_key(upload_id)
+    s3_client.put_object(
+        Bucket=bucket or UPLOADS_BUCKET,
+        Key=key,
+        Body=gzip.compress(text.encode('utf-8')),
+        ContentType='text/plain; charset=utf-8',
+        ContentEncoding='gzip'
+    )
+    return key
+
+
+def get_extracted_text(upload_id: str, bucket: str = None) -> Optional[str]:
+    """Load previously extracted text for an upload, or None if not stored."""
+    try:
+        content = get_object_content(bucket or UPLOADS_BUCKET, get_extracted_text_key(upload_id))
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return gzip.decompress(content).decode('utf-8')
+
+
+def has_extracted_text(upload_id: str, bucket: str = None) -> bool:
+    """Check whether extracted text is stored for an upload."""
+    return object_exists(bucket or UPLOADS_BUCKET, get_extracted_text_key(upload_id))
+
+
+def object_exists(bucket: str, key: str) -> bool:
+    """Check whether an S3 object exists with a HEAD request."""
+    try:
+        s3_client.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('NoSuchKey', 'NotFound', '404'):
+            return False
+        raise
+    return True
+
+
+def get_generated_questions_key(upload_id: str) -> str:
+    """Get the S3 key for an upload's checkpointed model output."""
+    return f"extracted/{upload_id}/questions.json.gz"
+
+
+def put_generated_questions(upload_id: str, questions_data: dict, bucket: str = None) -> str:
+    """Checkpoint generated questions (before deduplication) gzip-compressed in S3.
+
+    Returns:
+        S3 key of the stored questions
+    """
+    key = get_generated_questions_key(upload_id)
+    s3_client.put_object(
+        Bucket=bucket or UPLOADS_BUCKET,
+        Key=key,
+        Body=gzip.compress(dumps(questions_data)),
+        ContentType='application/json',
+        ContentEncoding='gzip'
+    )
+    return key
+
+
+def get_generated_questions(upload_id: str, bucket: str = None) -> Optional[dict]:
+    """Load checkpointed generated questions for an upload, or None if not stored."""
+    try:
+        content = get_object_content(bucket or UPLOADS_BUCKET, get_generated_questions_key(upload_id))
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return loads(gzip.decompress(content))
+
+
+def put_archive(key: str, body: bytes, bucket: str = None) -> None:
+    """Store a packed archive of expired uploads (concatenated gzip members)."""
+    s3_client.put_object(
+        Bucket=bucket or UPLOADS_BUCKET,
+        Key=key,
+        Body=body,
+        ContentType='application/gzip'
+    )
+
+
+def get_archive_member(key: str, offset: int, length: int, bucket: str = None) -> bytes:
+    """Read and decompress one gzip member of an archive with a ranged GET."""
+    response = s3_client.get_object(
+        Bucket=bucket or UPLOADS_BUCKET,
+        Key=key,
+        Range=f"bytes={offset}-{offset + length - 1}"
+    )
+    return gzip.decompress(response['Body'].read())
+
+
+def copy_extracted_text(source_upload_id: str, upload_id: str, bucket: str = None) -> bool:
+    """Copy stored extracted text to another upload server-side.
+
+    Returns:
+        True if text was copied, False if the source had none stored
+    """
+    bucket = bucket or UPLOADS_BUCKET
+    try:
+        s3_client.copy_object(
+            Bucket=bucket,
+            Key=get_extracted_text_key(upload_id),
+            CopySource={'Bucket': bucket, 'Key': get_extracted_text_key(source_upload_id)}
+        )
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+            return False
+        raise
+    return True
+
+
+def get_content_hash(bucket: str, key: str, s3_object: dict = None) -> str:
+    """Get a hash identifying an object's content from its ETag.
+
+    For single-part uploads the ETag is the MD5 of the bytes. Multipart
+    ETags depend on the part size as well, so the object size is included
+    to keep the key specific.
+
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        s3_object: The 's3.object' section of an S3 event record (optional)
+
+    Returns:
+        Content hash string
+    """
+    s3_object = s3_object or {}
+    etag = s3_object.get('eTag')
+    size = s3_object.get('size')
+
+    if not etag or size is None:
+        response = s3_client.head_object(Bucket=bucket, Key=key)
+        etag = response['ETag']
+        size = response['ContentLength']
+
+    etag = etag.strip('"')
+    return f"{etag}:{size}"
@@ -0,0 +1,92 @@
+"""JSON encoding and response compression shared by the API handlers."""
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bodies smaller than this aren't worth compressing
+COMPRESSION_MIN_BYTES = 1024
+
+
+def json_default(obj):
+    """Encode types the JSON encoders don't handle natively."""
+    if isinstance(obj, Decimal):
+        # DynamoDB returns every number as Decimal
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(data) -> bytes:
+    """Serialize data to UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=json_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    """Parse JSON text or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_accept_encoding(header: str) -> set:
+    """Get the content codings a client accepts (q=0 means refused)."""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def choose_encoding(accept_encoding: str):
+    """Pick the best supported content coding, or None."""
+    accepted = parse_accept_encoding(accept_encoding)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, accept_encoding: str):
+    """Compress a body if the client accepts it and it's large enough.
+
+    Returns:
+        Tuple of (body, content coding or None if left uncompressed)
+    """
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return body, None
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding == 'br':
+        return brotli.compress(body, quality=5), encoding
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6), encoding
+    return body, None
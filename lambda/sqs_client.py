@@ -0,0 +1,106 @@
+"""SQS processing queue operations for Quizify.
+
+S3 upload notifications are delivered to a queue that the processor drains
+with bounded concurrency, so a burst of uploads waits in the queue instead
+of overloading the model quota. The queue depth drives load shedding and
+the wait estimates in status responses. Uploads estimated to be slow are
+moved to a separate large-job queue with its own concurrency, so short
+documents never wait behind textbooks and textbooks are never starved.
+"""
+import json
+import math
+import os
+import time
+from typing import Optional
+import boto3
+from botocore.exceptions import ClientError
+
+
+sqs_client = boto3.client('sqs')
+
+PROCESSING_QUEUE_URL = os.environ.get('PROCESSING_QUEUE_URL', '')
+
+# Uploads estimated to take at least this many seconds go to the large-job queue
+LARGE_JOB_QUEUE_URL = os.environ.get('LARGE_JOB_QUEUE_URL', '')
+LARGE_JOB_MIN_SECONDS = float(os.environ.get('LARGE_JOB_MIN_SECONDS', '60'))
+
+# Uploads waiting to be processed before new ones are refused with 429
+MAX_QUEUED_UPLOADS = int(os.environ.get('MAX_QUEUED_UPLOADS', '200'))
+
+# Concurrent processing invocations (the event source mapping's maximum concurrency)
+MAX_PROCESSING_CONCURRENCY = int(os.environ.get('MAX_PROCESSING_CONCURRENCY', '10'))
+
+# Typical seconds to process one upload, used for wait estimates
+ESTIMATED_PROCESSING_SECONDS = float(os.environ.get('ESTIMATED_PROCESSING_SECONDS', '60'))
+
+# Queue attributes are cached briefly so status polling doesn't call SQS every time
+QUEUE_DEPTH_CACHE_SECONDS = 5
+
+_queue_depth_cache = {'expires_at': 0.0, 'depth': None}
+
+
+def get_queue_depth() -> Optional[dict]:
+    """Get the number of queued and in-flight processing messages.
+
+    Returns:
+        dict with queued and processing counts (SQS approximations), or None
+        if no processing queue is configured or it can't be read
+    """
+    if not PROCESSING_QUEUE_URL:
+        return None
+
+    now = time.monotonic()
+    if now < _queue_depth_cache['expires_at']:
+        return _queue_depth_cache['depth']
+
+    try:
+        attributes = sqs_client.get_queue_attributes(
+            QueueUrl=PROCESSING_QUEUE_URL,
+            AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
+        )['Attributes']
+    except ClientError as e:
+        print(f"Could not read processing queue depth: {str(e)}")
+        return None
+
+    depth = {
+        'queued': int(attributes.get('ApproximateNumberOfMessages', 0)),
+        'processing': int(attributes.get('ApproximateNumberOfMessagesNotVisible', 0))
+    }
+    _queue_depth_cache.update(expires_at=now + QUEUE_DEPTH_CACHE_SECONDS, depth=depth)
+    return depth
+
+
+def estimate_wait_seconds(queued: int) -> int:
+    """Estimated wait before an upload queued behind ``queued`` others starts."""
+    return math.ceil(queued / max(MAX_PROCESSING_CONCURRENCY, 1)) * math.ceil(ESTIMATED_PROCESSING_SECONDS)
+
+
+def get_queue_status() -> Optional[dict]:
+    """Processing queue load for status responses, or None without a queue."""
+    depth = get_queue_depth()
+    if depth is None:
+        return None
+    return dict(depth, estimated_wait_seconds=estimate_wait_seconds(depth['queued']))
+
+
+def check_admission(count: int = 1) -> Optional[int]:
+    """Decide whether new uploads may be accepted.
+
+    Args:
+        count: Number of uploads about to be started
+
+    Returns:
+        None if they may proceed, otherwise the suggested Retry-After in seconds
+    """
+    depth = get_queue_depth()
+    if depth is None or depth['queued'] + count <= MAX_QUEUED_UPLOADS:
+        return None
+    return max(estimate_wait_seconds(depth['queued'] + count - MAX_QUEUED_UPLOADS), 1)
+
+
+def send_to_large_job_queue(record: dict) -> None:
+    """Move one S3 notification record to the large-job queue."""
+    sqs_client.send_message(
+        QueueUrl=LARGE_JOB_QUEUE_URL,
+        MessageBody=json.dumps({'lane': 'large', 'Records': [record]})
+    )
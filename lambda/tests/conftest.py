@@ -0,0 +1,90 @@
+"""Shared fixtures: the Lambda modules running against moto's AWS stand-ins."""
+import functools
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.update(
+    AWS_DEFAULT_REGION='us-east-1',
+    AWS_ACCESS_KEY_ID='testing',
+    AWS_SECRET_ACCESS_KEY='testing',
+    UPLOADS_BUCKET='quizify-test-uploads'
+)
+
+BUCKET = os.environ['UPLOADS_BUCKET']
+
+
+def create_tables(dynamodb):
+    """The tables S3 event processing touches, keyed as in terraform/dynamodb.tf."""
+    dynamodb.create_table(
+        TableName='quizify-dev-questions',
+        BillingMode='PAY_PER_REQUEST',
+        KeySchema=[{'AttributeName': 'question_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': name, 'AttributeType': 'S'}
+            for name in ('question_id', 'upload_id', 'created_at')
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'upload_id-created_at-index',
+            'KeySchema': [
+                {'AttributeName': 'upload_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }]
+    )
+    dynamodb.create_table(
+        TableName='quizify-dev-uploads',
+        BillingMode='PAY_PER_REQUEST',
+        KeySchema=[{'AttributeName': 'upload_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'upload_id', 'AttributeType': 'S'}]
+    )
+    dynamodb.create_table(
+        TableName='quizify-dev-generation-slots',
+        BillingMode='PAY_PER_REQUEST',
+        KeySchema=[{'AttributeName': 'slot_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'slot_id', 'AttributeType': 'S'}]
+    )
+    dynamodb.create_table(
+        TableName='quizify-dev-content-hashes',
+        BillingMode='PAY_PER_REQUEST',
+        KeySchema=[{'AttributeName': 'content_hash', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'content_hash', 'AttributeType': 'S'}]
+    )
+
+
+def serialize_writes(monkeypatch, backend):
+    """Make moto's item writes atomic, as DynamoDB's conditional writes are.
+
+    moto checks a condition and applies the write in separate steps, so
+    concurrent threads can all pass the same condition.
+    """
+    lock = threading.RLock()
+    for name in ('put_item', 'update_item', 'delete_item'):
+        write = getattr(backend, name)
+
+        @functools.wraps(write)
+        def locked(*args, _write=write, **kwargs):
+            with lock:
+                return _write(*args, **kwargs)
+
+        monkeypatch.setattr(backend, name, locked)
+
+
+@pytest.fixture(scope='session')
+def aws():
+    """Start moto once; the Lambda modules create their clients at import, so import them inside it."""
+    moto = pytest.importorskip('moto')
+    from moto.dynamodb.models import DynamoDBBackend
+
+    with pytest.MonkeyPatch.context() as monkeypatch, moto.mock_aws():
+        serialize_writes(monkeypatch, DynamoDBBackend)
+        import boto3
+        boto3.client('s3').create_bucket(Bucket=BUCKET)
+        create_tables(boto3.client('dynamodb'))
+        yield boto3
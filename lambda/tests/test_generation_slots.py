@@ -0,0 +1,76 @@
+"""Generation slots: a cap on model calls in flight across invocations."""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+SLOTS = 2
+
+
+@pytest.fixture
+def slots(aws, monkeypatch):
+    """The slot helpers with SLOTS slots, starting from an empty table."""
+    import dynamodb_client
+    import handler
+
+    monkeypatch.setattr(dynamodb_client, 'MAX_GENERATION_CONCURRENCY', SLOTS)
+    monkeypatch.setattr(handler, 'MAX_GENERATION_CONCURRENCY', SLOTS)
+    table = dynamodb_client.get_generation_slots_table()
+    for item in table.scan()['Items']:
+        table.delete_item(Key={'slot_id': item['slot_id']})
+    return handler
+
+
+def test_generations_in_flight_never_exceed_slots(slots):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def generate(_):
+        with slots.generation_slot(None):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.2)
+            with lock:
+                active.pop()
+
+    with ThreadPoolExecutor(6) as pool:
+        list(pool.map(generate, range(6)))
+
+    assert max(peak) == SLOTS
+    assert len(peak) == 6
+
+
+def test_expired_slot_is_taken_over(slots):
+    import dynamodb_client
+
+    for index in range(SLOTS):
+        assert dynamodb_client.acquire_generation_slot(f'dead-{index}', -60)
+
+    assert dynamodb_client.acquire_generation_slot('next', 300) is not None
+
+
+def test_gives_up_when_no_slot_frees(slots, monkeypatch):
+    import dynamodb_client
+
+    monkeypatch.setattr(slots, 'GENERATION_SLOT_WAIT_SECONDS', 0.3)
+    for _ in range(SLOTS):
+        assert dynamodb_client.acquire_generation_slot(str(uuid.uuid4()), 300)
+
+    with pytest.raises(slots.QuestionGenerationError):
+        with slots.generation_slot(None):
+            pass
+
+
+def test_release_frees_the_slot(slots):
+    import dynamodb_client
+
+    held = [(dynamodb_client.acquire_generation_slot(owner, 300), owner) for owner in ('a', 'b')]
+    assert dynamodb_client.acquire_generation_slot('c', 300) is None
+
+    dynamodb_client.release_generation_slot(*held[0])
+
+    assert dynamodb_client.acquire_generation_slot('c', 300) == held[0][0]
@@ -0,0 +1,191 @@
+"""Processing leases and idempotent saves for duplicate S3 events.
+
+S3 delivers notifications at least once, so one upload can trigger several
+invocations. Only the lease holder may call the model, and re-saving the
+same generation must overwrite its questions rather than add more.
+
+Run with: pytest lambda/tests   (needs: pip install -r lambda/requirements-dev.txt)
+"""
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import BUCKET
+
+DUPLICATE_EVENTS = 8
+
+
+def generate_questions(text, num_mcqs=3, num_short=2, topic=None):
+    """Stand-in for the model: a fixed set of questions."""
+    return {
+        'topic': topic or 'Cell Biology',
+        'mcqs': [
+            {'question': f'Which organelle is number {i}?', 'options': ['A) One', 'B) Two'],
+             'correct_answer': 'A', 'explanation': 'It is first.'}
+            for i in range(num_mcqs)
+        ],
+        'short_questions': [
+            {'question': f'Why does step {i} release energy?', 'expected_points': ['ATP'],
+             'difficulty': 'easy'}
+            for i in range(num_short)
+        ]
+    }
+
+
+@pytest.fixture
+def db(aws):
+    """The DynamoDB helpers, bound to moto."""
+    import dynamodb_client
+    return dynamodb_client
+
+
+@pytest.fixture
+def model_calls():
+    """Texts passed to the model stub, one per call."""
+    return []
+
+
+@pytest.fixture
+def handler(aws, monkeypatch, model_calls):
+    """The Lambda handler with the model call replaced by a recording stub."""
+    import handler as module
+
+    lock = threading.Lock()
+
+    def record_call(text, **kwargs):
+        with lock:
+            model_calls.append(text)
+        return generate_questions(text, **kwargs)
+
+    monkeypatch.setattr(module, 'generate_questions', record_call)
+    return module
+
+
+def s3_event(aws, upload_id: str, filename: str = 'notes.txt') -> dict:
+    """Upload a small text file and build the S3 notification it would send."""
+    key = f'uploads/{upload_id}/{filename}'
+    s3 = aws.client('s3')
+    # Unique bytes, so content-hash reuse never short-circuits processing
+    s3.put_object(Bucket=BUCKET, Key=key, Body=f'Lecture notes for {upload_id}. '.encode() * 20)
+    head = s3.head_object(Bucket=BUCKET, Key=key)
+    return {'Records': [{
+        'eventSource': 'aws:s3',
+        's3': {
+            'bucket': {'name': BUCKET},
+            'object': {'key': key, 'eTag': head['ETag'].strip('"'), 'size': head['ContentLength']}
+        }
+    }]}
+
+
+def new_upload_id() -> str:
+    """A fresh upload id; tests share the tables, not their rows."""
+    return str(uuid.uuid4())
+
+
+def test_concurrent_duplicate_events_call_model_once(aws, db, handler, model_calls):
+    upload_id = new_upload_id()
+    event = s3_event(aws, upload_id)
+    barrier = threading.Barrier(DUPLICATE_EVENTS)
+
+    def deliver(_):
+        barrier.wait()
+        return handler.handle_s3_event(event)
+
+    with ThreadPoolExecutor(DUPLICATE_EVENTS) as pool:
+        responses = list(pool.map(deliver, range(DUPLICATE_EVENTS)))
+
+    bodies = [response['body'] for response in responses]
+    assert all(response['statusCode'] == 200 for response in responses)
+    assert bodies.count('Duplicate event skipped') == DUPLICATE_EVENTS - 1
+    assert len(model_calls) == 1
+
+    upload = db.get_upload_by_id(upload_id)
+    assert upload['status'] == 'completed'
+    assert 'lease_owner' not in upload
+    assert len(db.get_questions_by_upload_id(upload_id)) == 5
+
+
+def test_redelivered_event_after_completion_is_skipped(aws, handler, model_calls):
+    upload_id = new_upload_id()
+    event = s3_event(aws, upload_id)
+
+    assert json.loads(handler.handle_s3_event(event)['body'])['questions_count'] == 5
+    assert handler.handle_s3_event(event)['body'] == 'Duplicate event skipped'
+    assert len(model_calls) == 1
+
+
+def test_expired_lease_is_taken_over(db):
+    upload_id = new_upload_id()
+    assert db.acquire_processing_lease(upload_id, 'notes.txt', 'key', 'dead-invocation', -60)
+
+    upload = db.acquire_processing_lease(upload_id, 'notes.txt', 'key', 'retry', 300)
+
+    assert upload is not None
+    assert upload['lease_owner'] == 'retry'
+    assert upload['status'] == 'processing'
+
+
+def test_expired_lease_takeover_finishes_processing(aws, db, handler, model_calls):
+    upload_id = new_upload_id()
+    event = s3_event(aws, upload_id)
+    key = event['Records'][0]['s3']['object']['key']
+    db.acquire_processing_lease(upload_id, 'notes.txt', key, 'dead-invocation', -60)
+
+    response = handler.handle_s3_event(event)
+
+    assert json.loads(response['body'])['questions_count'] == 5
+    assert len(model_calls) == 1
+    assert db.get_upload_by_id(upload_id)['status'] == 'completed'
+
+
+def test_live_lease_blocks_other_owners(aws, db, handler, model_calls):
+    upload_id = new_upload_id()
+    event = s3_event(aws, upload_id)
+    key = event['Records'][0]['s3']['object']['key']
+    db.acquire_processing_lease(upload_id, 'notes.txt', key, 'holder', 300)
+
+    assert db.acquire_processing_lease(upload_id, 'notes.txt', key, 'other', 300) is None
+    assert handler.handle_s3_event(event)['body'] == 'Duplicate event skipped'
+    assert model_calls == []
+    assert db.get_upload_by_id(upload_id)['lease_owner'] == 'holder'
+
+
+def test_same_owner_retry_reacquires_lease(db):
+    upload_id = new_upload_id()
+    first = db.acquire_processing_lease(upload_id, 'notes.txt', 'key', 'request-1', 300)
+    db.record_upload_stage(upload_id, 'extract', {'extract': 10})
+
+    retry = db.acquire_processing_lease(upload_id, 'notes.txt', 'key', 'request-1', 300)
+
+    assert retry is not None
+    assert retry['lease_owner'] == 'request-1'
+    assert retry['created_at'] == first['created_at']
+    # The checkpoint survives, so the retry resumes instead of starting over
+    assert retry['stage'] == 'extract'
+
+
+def test_save_questions_is_idempotent(db):
+    upload_id = new_upload_id()
+    questions_data = generate_questions('text')
+
+    first = db.save_questions(upload_id, 'notes.txt', questions_data)
+    second = db.save_questions(upload_id, 'notes.txt', questions_data)
+
+    assert [q['question_id'] for q in second] == [q['question_id'] for q in first]
+    stored = db.get_questions_by_upload_id(upload_id)
+    assert sorted(q['question_id'] for q in stored) == sorted(q['question_id'] for q in first)
+    assert len(stored) == len(first) == 5
+
+
+def test_save_questions_keeps_generations_apart(db):
+    upload_id = new_upload_id()
+    questions_data = generate_questions('text')
+
+    initial = db.save_questions(upload_id, 'notes.txt', questions_data)
+    regenerated = db.save_questions(upload_id, 'notes.txt', questions_data, generation_id='regen-1')
+
+    assert not {q['question_id'] for q in initial} & {q['question_id'] for q in regenerated}
+    assert len(db.get_questions_by_upload_id(upload_id)) == 10
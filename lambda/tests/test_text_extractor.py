@@ -0,0 +1,78 @@
+"""DOCX extraction within a time budget.
+
+A document that runs out of time must fail with ExtractionTimeout, not be
+handed to the python-docx fallback, which would start over with no limit.
+"""
+import io
+import time
+
+import pytest
+
+import text_extractor
+from text_extractor import ExtractionBudget, ExtractionTimeout, extract_text
+
+
+@pytest.fixture
+def docx_bytes():
+    """A small DOCX with a paragraph and a table."""
+    docx = pytest.importorskip('docx')
+    document = docx.Document()
+    document.add_paragraph('Glycolysis splits glucose into two pyruvate molecules.')
+    table = document.add_table(rows=1, cols=2)
+    table.rows[0].cells[0].text = 'Stage'
+    table.rows[0].cells[1].text = 'ATP yield'
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def slow(seconds):
+    """An extractor that takes ``seconds`` before returning text."""
+    def extract(content):
+        time.sleep(seconds)
+        return 'text'
+    return extract
+
+
+def test_slow_streaming_docx_times_out_without_fallback(docx_bytes, monkeypatch):
+    fallback_calls = []
+    monkeypatch.setattr(text_extractor, 'DOCX_ENGINE', 'xml')
+    monkeypatch.setattr(text_extractor, 'extract_from_docx_xml', slow(5))
+    monkeypatch.setattr(text_extractor, 'extract_from_docx_python_docx', fallback_calls.append)
+
+    start = time.monotonic()
+    with pytest.raises(ExtractionTimeout):
+        extract_text(file_content=docx_bytes, filename='notes.docx', budget=ExtractionBudget(total_seconds=0.3))
+
+    assert time.monotonic() - start < 2
+    assert fallback_calls == []
+
+
+def test_slow_python_docx_raises_timeout(docx_bytes, monkeypatch):
+    docx = pytest.importorskip('docx')
+    monkeypatch.setattr(text_extractor, 'DOCX_ENGINE', 'python-docx')
+    monkeypatch.setattr(docx, 'Document', slow(5))
+
+    with pytest.raises(ExtractionTimeout):
+        extract_text(file_content=docx_bytes, filename='notes.docx', budget=ExtractionBudget(total_seconds=0.3))
+
+
+def test_broken_streaming_docx_still_falls_back(docx_bytes, monkeypatch):
+    def broken(content):
+        raise ValueError('unexpected element')
+
+    monkeypatch.setattr(text_extractor, 'DOCX_ENGINE', 'xml')
+    monkeypatch.setattr(text_extractor, 'extract_from_docx_xml', broken)
+
+    text = extract_text(file_content=docx_bytes, filename='notes.docx', budget=ExtractionBudget(total_seconds=30))
+
+    assert 'Glycolysis' in text
+    assert 'Stage | ATP yield' in text
+
+
+def test_exhausted_budget_fails_before_parsing(docx_bytes):
+    budget = ExtractionBudget(total_seconds=0.01)
+    time.sleep(0.05)
+
+    with pytest.raises(ExtractionTimeout):
+        extract_text(file_content=docx_bytes, filename='notes.docx', budget=budget)
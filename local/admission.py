@@ -0,0 +1,164 @@
+"""Admission control for upload processing in the local server.
+
+Extraction (CPU and memory) and question generation (model quota) are
+capped separately. Jobs beyond the caps wait in a bounded queue; once the
+queue is full, new jobs are refused with a suggested retry delay instead of
+piling up. Limits apply per server process.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from scheduling import aged_priority
+
+# Smoothing factor for the moving averages of stage and wait times
+EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when the processing queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is busy processing other uploads. Please retry in {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+class StageLimiter:
+    """Counting semaphore for one processing stage that tracks its timings.
+
+    Free slots go to the waiting job with the best aged priority (see
+    scheduling.py), so cheap jobs overtake expensive ones without starving them.
+    """
+
+    def __init__(self, name: str, limit: int, default_seconds: float):
+        self.name = name
+        self.limit = max(limit, 1)
+        self.active = 0
+        self.avg_seconds = default_seconds
+        self.avg_wait_seconds = 0.0
+        self._waiters = []
+        self._condition = threading.Condition()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _next_waiter(self):
+        now = time.monotonic()
+        return min(self._waiters, key=lambda w: aged_priority(w[0], now - w[1]))
+
+    @contextmanager
+    def slot(self, cost: float = 0.0):
+        """Hold one of the stage's slots, waiting for one if all are taken.
+
+        Args:
+            cost: Estimated seconds the job will hold the slot (equal costs
+                are served in arrival order)
+        """
+        waiter = [cost, time.monotonic()]
+        with self._condition:
+            self._waiters.append(waiter)
+            while self.active >= self.limit or self._next_waiter() is not waiter:
+                self._condition.wait()
+            self._waiters.remove(waiter)
+            self.active += 1
+            started = time.monotonic()
+            self.avg_wait_seconds += EWMA_ALPHA * (started - waiter[1] - self.avg_wait_seconds)
+            # Another slot may still be free for the next waiter
+            self._condition.notify_all()
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.active -= 1
+                self.avg_seconds += EWMA_ALPHA * (time.monotonic() - started - self.avg_seconds)
+                self._condition.notify_all()
+
+    def seconds_per_job(self) -> float:
+        """Average time between job completions when the stage is saturated."""
+        return self.avg_seconds / self.limit
+
+
+class AdmissionController:
+    """Bounded admission of processing jobs.
+
+    Args:
+        max_extracting: Jobs extracting text at once
+        max_generating: Jobs generating questions at once
+        max_queued: Admitted jobs allowed to wait for a slot
+    """
+
+    def __init__(self, max_extracting: int, max_generating: int, max_queued: int):
+        self.extraction = StageLimiter('extraction', max_extracting, default_seconds=5.0)
+        self.generation = StageLimiter('generation', max_generating, default_seconds=20.0)
+        self.max_queued = max(max_queued, 0)
+        self.admitted = 0
+        self._lock = threading.Lock()
+
+    def queued(self) -> int:
+        """Admitted jobs not currently holding a stage slot."""
+        return max(self.admitted - self.extraction.active - self.generation.active, 0)
+
+    def estimated_wait_seconds(self, position: int = None) -> int:
+        """Estimated wait before a queued job starts, from recent stage times.
+
+        Args:
+            position: Jobs ahead in the queue (defaults to the current depth)
+        """
+        position = self.queued() if position is None else position
+        # The slower stage limits throughput
+        bottleneck = max(self.extraction.seconds_per_job(), self.generation.seconds_per_job())
+        return math.ceil(position * bottleneck)
+
+    def admit(self, count: int = 1) -> None:
+        """Admit jobs, or raise AdmissionRejected if the queue can't hold them.
+
+        Every admitted job must later be released with release().
+        """
+        with self._lock:
+            self._check(count)
+            self.admitted += count
+
+    def check(self, count: int = 1) -> None:
+        """Raise AdmissionRejected if ``count`` jobs couldn't be admitted now, without admitting them.
+
+        Lets a request whose job count is only known from its body be
+        refused before the body is read.
+        """
+        with self._lock:
+            self._check(count)
+
+    def _check(self, count: int) -> None:
+        capacity = self.extraction.limit + self.generation.limit + self.max_queued
+        if self.admitted + count > capacity:
+            raise AdmissionRejected(max(self.estimated_wait_seconds(self.queued() + count), 1))
+
+    def release(self, count: int = 1) -> None:
+        """Release admitted jobs that finished (or were never started)."""
+        with self._lock:
+            self.admitted = max(self.admitted - count, 0)
+
+    @contextmanager
+    def job(self):
+        """Admit one job for the duration of a block."""
+        self.admit()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def status(self) -> dict:
+        """Current load, for status and readiness responses."""
+        return {
+            'queued': self.queued(),
+            'extracting': self.extraction.active,
+            'generating': self.generation.active,
+            'max_queued': self.max_queued,
+            'estimated_wait_seconds': self.estimated_wait_seconds(),
+            'avg_wait_seconds': {
+                'extraction': round(self.extraction.avg_wait_seconds, 1),
+                'generation': round(self.generation.avg_wait_seconds, 1)
+            }
+        }
@@ -1,30 +1,276 @@
 """Local Flask server for Quizify."""
+import functools
 import os
+import threading
 import uuid
-from pathlib import Path
-from flask import Flask, request, jsonify, send_from_directory
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 
-from text_extractor import extract_text, TextExtractionError
+from text_extractor import extract_text, TextExtractionError, ExtractionBudget
 from question_generator import generate_questions, QuestionGenerationError
+from dedup import deduplicate_questions
+from streaming import StreamingRequest
+from serialization import dumps, loads, compress
+from export import EXPORT_FORMATS, parse_export_filters, iter_export
+from admission import AdmissionController, AdmissionRejected
+from scheduling import JobQueue, estimate_file_cost
+from grading import parse_grade_request, grade_answers
+from compose import parse_compose_request, compose_quiz
+from lifecycle import restore_upload
+from uploads import (
+    UPLOAD_FOLDER, TEXT_FOLDER, ALLOWED_EXTENSIONS, MAX_QUESTIONS_PER_TYPE,
+    allowed_file, save_extracted_text, load_extracted_text
+)
 from database import (
     save_upload, update_upload_status, save_questions,
-    get_upload_by_id, get_questions_by_upload_id, list_uploads
+    get_upload_by_id, get_questions_by_upload_id, list_uploads,
+    save_batch, get_batch, iter_questions, search_questions,
+    get_uploads_with_questions, get_questions_by_ids, iter_question_ids_by_topic
+)
+
+UPLOAD_FOLDER.mkdir(exist_ok=True)
+TEXT_FOLDER.mkdir(exist_ok=True)
+
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', '25'))
+
+# Batch uploads are processed by a shared, bounded pool of workers
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '4'))
+MAX_BATCH_FILES = 50
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='batch')
+
+# Batch files waiting for a worker; cheapest first, with aging (see scheduling.py)
+batch_queue = JobQueue()
+
+# Request threads per server process (gunicorn.conf.py reads the same setting)
+SERVER_THREADS = int(os.environ.get('QUIZIFY_THREADS', '4'))
+
+# Work in flight in this process, reported by /ready
+active_requests = 0
+running_batch_uploads = 0
+capacity_lock = threading.Lock()
+
+# Uploads extracting and generating at once, and admitted uploads allowed to
+# wait for a slot; beyond that new uploads get 429 with Retry-After
+admission = AdmissionController(
+    max_extracting=int(os.environ.get('MAX_EXTRACTING', '2')),
+    max_generating=int(os.environ.get('MAX_GENERATING', '4')),
+    max_queued=int(os.environ.get('MAX_QUEUED_UPLOADS', '100'))
 )
 
+
+class FastJSONProvider(JSONProvider):
+    """jsonify through the shared encoder (orjson when installed)."""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+
 app = Flask(__name__, static_folder='static')
-CORS(app)
+app.json = FastJSONProvider(app)
+app.request_class = StreamingRequest
+StreamingRequest.upload_folder = UPLOAD_FOLDER
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
+CORS(app, expose_headers=['ETag'])
+
+MAX_SEARCH_RESULTS = 100
+
+# Most uploads GET /questions?ids= returns in one response
+MAX_BATCH_QUESTION_UPLOADS = 25
 
-UPLOAD_FOLDER = Path(__file__).parent / 'uploads'
-UPLOAD_FOLDER.mkdir(exist_ok=True)
 
-ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+def parse_generation_options(data):
+    """Validate num_mcqs, num_short and topic generation parameters."""
+    options = {}
+    for name in ('num_mcqs', 'num_short'):
+        value = data.get(name, 5)
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_QUESTIONS_PER_TYPE:
+            raise ValueError(f"{name} must be an integer between 0 and {MAX_QUESTIONS_PER_TYPE}")
+        options[name] = value
 
+    if options['num_mcqs'] == 0 and options['num_short'] == 0:
+        raise ValueError("At least one of num_mcqs or num_short must be positive")
 
-def allowed_file(filename):
-    """Check if file extension is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    topic = data.get('topic')
+    if topic is not None and not isinstance(topic, str):
+        raise ValueError("topic must be a string")
+    options['topic'] = topic or None
+
+    return options
+
+
+def process_upload(upload_id, filename, file_path, cost=None):
+    """Extract text and generate questions for a stored upload.
+
+    Args:
+        upload_id: Upload ID (the upload record must already exist)
+        filename: Original filename
+        file_path: Path of the stored file
+        cost: Estimated processing seconds (estimated from the file if None)
+
+    Returns:
+        Tuple of (duplicates dropped, skipped page numbers)
+
+    Raises:
+        TextExtractionError, QuestionGenerationError: after marking the upload failed
+    """
+    try:
+        # Extract text (slow PDF pages are skipped once over budget); when
+        # uploads wait for extraction, cheaper documents go first
+        if cost is None:
+            cost = estimate_file_cost(file_path)
+        budget = ExtractionBudget()
+        with admission.extraction.slot(cost):
+            text = extract_text(file_path=str(file_path), budget=budget)
+
+        if len(text) < 50:
+            raise TextExtractionError("Extracted text is too short. Please upload a document with more content.")
+
+        # Keep the cleaned text so regeneration can skip extraction
+        save_extracted_text(upload_id, text)
+
+        # Generate questions
+        with admission.generation.slot():
+            questions_data = generate_questions(text)
+
+        # Drop near-duplicate questions
+        questions_data, dropped = deduplicate_questions(questions_data)
+
+        # Save questions
+        save_questions(upload_id, filename, questions_data)
+
+        # Update upload status
+        update_upload_status(upload_id, 'completed', topic=questions_data.get('topic'))
+
+        return dropped, budget.skipped_pages
+
+    except (TextExtractionError, QuestionGenerationError) as e:
+        update_upload_status(upload_id, 'failed', error=str(e))
+        raise
+
+
+def process_batch_upload(upload_id, filename, file_path, cost=None):
+    """Process one file of a batch on the worker pool, recording any failure."""
+    try:
+        process_upload(upload_id, filename, file_path, cost=cost)
+    except (TextExtractionError, QuestionGenerationError):
+        pass
+    except Exception as e:
+        print(f"Batch upload {upload_id} failed: {str(e)}")
+        update_upload_status(upload_id, 'failed', error=f'Processing failed: {str(e)}')
+    finally:
+        admission.release()
+
+
+def admitted(view):
+    """Admit a view's processing job before it reads the request body."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with admission.job():
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def submit_batch_upload(upload_id, filename, file_path):
+    """Queue one batch file for the worker pool.
+
+    The pool runs one task per queued file, and each task takes whichever
+    file is best to run when a worker frees up, not the oldest, so small
+    files don't wait behind large ones.
+    """
+    cost = estimate_file_cost(file_path)
+    batch_queue.push((upload_id, filename, file_path, cost), cost)
+    batch_executor.submit(run_next_batch_upload)
+
+
+def run_next_batch_upload():
+    """Process the queued batch file with the best aged priority."""
+    global running_batch_uploads
+    job = batch_queue.pop()
+    if job is None:
+        return
+
+    with capacity_lock:
+        running_batch_uploads += 1
+    try:
+        process_batch_upload(*job)
+    finally:
+        with capacity_lock:
+            running_batch_uploads -= 1
+
+
+def drain_batch_uploads():
+    """Finish batch files already being processed and fail the rest.
+
+    Called when a server process shuts down. Files that haven't started are
+    marked failed so they don't stay 'processing' forever.
+    """
+    batch_executor.shutdown(wait=False, cancel_futures=True)
+    not_started = batch_queue.drain()
+    for upload_id, *_ in not_started:
+        update_upload_status(upload_id, 'failed', error='Server shut down before processing started. Please upload again.')
+        admission.release()
+
+    with capacity_lock:
+        running = running_batch_uploads
+    print(f"Draining {running} batch uploads in progress ({len(not_started)} not started, marked failed)")
+    batch_executor.shutdown(wait=True)
+
+
+@app.before_request
+def count_request_start():
+    """Count requests in flight for /ready."""
+    global active_requests
+    with capacity_lock:
+        active_requests += 1
+
+
+@app.teardown_request
+def count_request_end(exc):
+    """Stop counting a finished request."""
+    global active_requests
+    with capacity_lock:
+        active_requests -= 1
+
+
+@app.teardown_request
+def discard_upload_parts(exc):
+    """Remove upload files the request didn't keep."""
+    request.discard_upload_parts()
+
+
+@app.after_request
+def compress_json_response(response):
+    """Compress JSON responses per the request's Accept-Encoding."""
+    if (response.mimetype != 'application/json' or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    body, encoding = compress(response.get_data(), request.headers.get('Accept-Encoding', ''))
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    """Reject oversized uploads with a JSON error."""
+    return jsonify({'error': f'File too large. Maximum size is {MAX_UPLOAD_MB} MB'}), 413
+
+
+@app.errorhandler(AdmissionRejected)
+def admission_rejected(e):
+    """Shed load with 429 and a Retry-After hint while the queue is full."""
+    response = jsonify({'error': str(e), 'retry_after': e.retry_after, 'queue': admission.status()})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 429
 
 
 @app.route('/health', methods=['GET'])
@@ -33,7 +279,29 @@ def health():
     return jsonify({'status': 'healthy'})
 
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness check: 503 while this server process has no spare request threads.
+
+    This request holds one of the SERVER_THREADS threads itself, so the
+    process is busy once the other requests fill the rest.
+    """
+    with capacity_lock:
+        # Not counting this request
+        requests_active = active_requests - 1
+        batch_pending = running_batch_uploads + len(batch_queue)
+        is_ready = active_requests < SERVER_THREADS
+    return jsonify({
+        'status': 'ready' if is_ready else 'busy',
+        'pid': os.getpid(),
+        'requests': {'active': requests_active, 'capacity': SERVER_THREADS},
+        'batch': {'pending': batch_pending, 'workers': BATCH_WORKERS},
+        'queue': admission.status()
+    }), 200 if is_ready else 503
+
+
 @app.route('/upload', methods=['POST'])
+@admitted
 def upload_file():
     """Upload and process a file."""
     if 'file' not in request.files:
@@ -51,42 +319,193 @@ def upload_file():
         upload_id = str(uuid.uuid4())
         filename = secure_filename(file.filename)
 
-        # Save file
-        file_path = UPLOAD_FOLDER / f"{upload_id}_{filename}"
-        file.save(file_path)
+        # The body was already streamed to disk while parsing; just move it
+        file_path = file.stream.move_to(UPLOAD_FOLDER / f"{upload_id}_{filename}")
 
         # Save upload record
-        save_upload(upload_id, filename, status='processing')
+        save_upload(upload_id, filename, status='processing', content_hash=file.stream.hexdigest())
 
-        # Process in background (for now, process immediately)
+        # Process immediately
         try:
-            # Extract text
-            text = extract_text(file_path=str(file_path))
+            dropped, skipped_pages = process_upload(upload_id, filename, file_path)
 
-            if len(text) < 50:
-                raise TextExtractionError("Extracted text is too short. Please upload a document with more content.")
+            return jsonify({
+                'success': True,
+                'upload_id': upload_id,
+                'duplicates_dropped': dropped,
+                'skipped_pages': skipped_pages,
+                'message': 'Questions generated successfully'
+            })
 
-            # Generate questions
-            questions_data = generate_questions(text)
+        except (TextExtractionError, QuestionGenerationError) as e:
+            return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        return jsonify({'error': f'Processing failed: {str(e)}'}), 500
+
+
+@app.route('/uploads/batch', methods=['POST'])
+def upload_batch():
+    """Upload several files and process them on the shared worker pool."""
+    # Refuse before parsing (and spooling to disk) the body if not even one file fits
+    admission.check()
+
+    files = [f for f in request.files.getlist('files') if f.filename]
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+    if len(files) > MAX_BATCH_FILES:
+        return jsonify({'error': f'Too many files. Maximum is {MAX_BATCH_FILES} per batch'}), 400
 
-            # Save questions
-            save_questions(upload_id, filename, questions_data)
+    invalid = [f.filename for f in files if not allowed_file(f.filename)]
+    if invalid:
+        return jsonify({
+            'error': f'Invalid file type for {", ".join(invalid)}. Allowed: {", ".join(ALLOWED_EXTENSIONS)}'
+        }), 400
 
-            # Update upload status
+    # The whole batch is queued or refused; each file is released once processed
+    admission.admit(len(files))
+    submitted = 0
+
+    try:
+        batch_id = str(uuid.uuid4())
+        save_batch(batch_id, len(files))
+
+        uploads = []
+        for file in files:
+            upload_id = str(uuid.uuid4())
+            filename = secure_filename(file.filename)
+            file_path = file.stream.move_to(UPLOAD_FOLDER / f"{upload_id}_{filename}")
+
+            save_upload(upload_id, filename, status='processing',
+                        content_hash=file.stream.hexdigest(), batch_id=batch_id)
+            submit_batch_upload(upload_id, filename, file_path)
+            submitted += 1
+
+            uploads.append({'upload_id': upload_id, 'filename': filename})
+
+        return jsonify({
+            'success': True,
+            'batch_id': batch_id,
+            'uploads': uploads,
+            'message': f'{len(uploads)} files queued for processing'
+        }), 202
+
+    except Exception as e:
+        admission.release(len(files) - submitted)
+        return jsonify({'error': f'Batch upload failed: {str(e)}'}), 500
+
+
+@app.route('/uploads/batch/<batch_id>', methods=['GET'])
+def get_batch_status(batch_id):
+    """Get aggregate progress and per-file status for a batch."""
+    batch = get_batch(batch_id)
+    if not batch:
+        return jsonify({'error': 'Batch not found'}), 404
+
+    counts = {'processing': 0, 'completed': 0, 'failed': 0}
+    for upload in batch['uploads']:
+        counts[upload['status']] = counts.get(upload['status'], 0) + 1
+
+    done = counts['completed'] + counts['failed'] == batch['total']
+    return jsonify({
+        'batch_id': batch_id,
+        'total': batch['total'],
+        'counts': counts,
+        'done': done,
+        'uploads': batch['uploads'],
+        'queue': None if done else admission.status()
+    })
+
+
+@app.route('/uploads/<upload_id>/regenerate', methods=['POST'])
+@admitted
+def regenerate(upload_id):
+    """Generate more questions for an upload from its stored text."""
+    try:
+        options = parse_generation_options(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    upload = get_upload_by_id(upload_id)
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    if upload['status'] == 'processing':
+        return jsonify({'error': 'Upload is still being processed'}), 409
+    if upload['status'] == 'archived':
+        return jsonify({'error': 'Upload is archived; restore it first'}), 409
+
+    text = load_extracted_text(upload_id)
+    # Uploads processed before extracted text was persisted have only the file
+    file_path = UPLOAD_FOLDER / f"{upload_id}_{upload['filename']}"
+    if text is None and not file_path.exists():
+        return jsonify({'error': 'Neither the uploaded file nor its extracted text is stored any more'}), 409
+
+    try:
+        update_upload_status(upload_id, 'processing')
+
+        try:
+            if text is None:
+                with admission.extraction.slot():
+                    text = extract_text(file_path=str(file_path))
+                save_extracted_text(upload_id, text)
+
+            with admission.generation.slot():
+                questions_data = generate_questions(
+                    text,
+                    num_mcqs=options['num_mcqs'],
+                    num_short=options['num_short'],
+                    topic=options['topic'] or upload.get('topic')
+                )
+
+            # Drop questions that repeat ones already saved for this upload
+            existing = [q['question'] for q in get_questions_by_upload_id(upload_id)]
+            questions_data, dropped = deduplicate_questions(questions_data, existing=existing)
+
+            save_questions(upload_id, upload['filename'], questions_data)
             update_upload_status(upload_id, 'completed', topic=questions_data.get('topic'))
 
             return jsonify({
                 'success': True,
                 'upload_id': upload_id,
+                'duplicates_dropped': dropped,
                 'message': 'Questions generated successfully'
             })
 
         except (TextExtractionError, QuestionGenerationError) as e:
-            update_upload_status(upload_id, 'failed', error=str(e))
+            end_failed_regeneration(upload_id, str(e))
             return jsonify({'error': str(e)}), 400
 
     except Exception as e:
-        return jsonify({'error': f'Processing failed: {str(e)}'}), 500
+        end_failed_regeneration(upload_id, str(e))
+        return jsonify({'error': f'Regeneration failed: {str(e)}'}), 500
+
+
+def end_failed_regeneration(upload_id, error):
+    """Put an upload back after a failed regeneration.
+
+    Its saved questions are untouched, so an upload that has any is
+    completed again and the error is only returned; one without questions
+    is marked failed.
+    """
+    if get_questions_by_upload_id(upload_id):
+        update_upload_status(upload_id, 'completed')
+    else:
+        update_upload_status(upload_id, 'failed', error=error)
+
+
+@app.route('/uploads/<upload_id>/restore', methods=['POST'])
+def restore(upload_id):
+    """Restore an archived upload's questions from its archive."""
+    upload = get_upload_by_id(upload_id)
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    if upload['status'] != 'archived':
+        return jsonify({'error': 'Upload is not archived'}), 409
+
+    result = restore_upload(upload)
+    if result is None:
+        return jsonify({'error': 'Upload is not archived'}), 409
+    return jsonify(result)
 
 
 @app.route('/questions/<upload_id>', methods=['GET'])
@@ -98,12 +517,47 @@ def get_questions(upload_id):
 
     questions = get_questions_by_upload_id(upload_id)
 
+    result = format_upload_questions(upload, questions)
+    if upload['status'] == 'processing':
+        # Current load, so clients can show how long processing may take
+        result['queue'] = admission.status()
+
+    # Weak ETag, since the body may be compressed after this; lets clients
+    # revalidate cached quizzes and get an empty 304 when unchanged
+    response = jsonify(result)
+    response.add_etag(weak=True)
+    return response.make_conditional(request)
+
+
+@app.route('/questions', methods=['GET'])
+def get_questions_batch():
+    """Get the questions of several uploads (?ids=a,b,c) in one response."""
+    upload_ids = list(dict.fromkeys(i.strip() for i in request.args.get('ids', '').split(',') if i.strip()))
+
+    if not upload_ids:
+        return jsonify({'error': 'ids required'}), 400
+    if len(upload_ids) > MAX_BATCH_QUESTION_UPLOADS:
+        return jsonify({'error': f'At most {MAX_BATCH_QUESTION_UPLOADS} ids per request'}), 400
+
+    uploads = get_uploads_with_questions(upload_ids)
+
+    return jsonify({
+        'uploads': [
+            format_upload_questions(uploads[upload_id], uploads[upload_id]['questions'])
+            for upload_id in upload_ids if upload_id in uploads
+        ],
+        'not_found': [upload_id for upload_id in upload_ids if upload_id not in uploads]
+    })
+
+
+def format_upload_questions(upload, questions):
+    """Build the questions response for one upload."""
     # Separate MCQs and short questions
     mcqs = [q for q in questions if q.get('type') == 'MCQ']
     short_questions = [q for q in questions if q.get('type') == 'SHORT']
 
-    return jsonify({
-        'upload_id': upload_id,
+    return {
+        'upload_id': upload['upload_id'],
         'status': upload['status'],
         'filename': upload['filename'],
         'topic': upload.get('topic', ''),
@@ -111,7 +565,7 @@ def get_questions(upload_id):
         'mcqs': mcqs,
         'short_questions': short_questions,
         'total_questions': len(questions)
-    })
+    }
 
 
 @app.route('/uploads', methods=['GET'])
@@ -124,6 +578,81 @@ def get_uploads():
     })
 
 
+@app.route('/search', methods=['GET'])
+def search():
+    """Search questions across all uploads by keyword, best matches first."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+
+    limit = request.args.get('limit', 20, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    if not 1 <= limit <= MAX_SEARCH_RESULTS or offset < 0:
+        return jsonify({'error': f'limit must be between 1 and {MAX_SEARCH_RESULTS} and offset non-negative'}), 400
+
+    results, total = search_questions(query, limit=limit, offset=offset)
+
+    return jsonify({
+        'query': query,
+        'results': results,
+        'total': total,
+        'limit': limit,
+        'offset': offset
+    })
+
+
+@app.route('/grade', methods=['POST'])
+def grade():
+    """Grade short answers against their questions' expected points."""
+    try:
+        items = parse_grade_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    questions = get_questions_by_ids(item['question_id'] for item in items if item['expected_points'] is None)
+    results = grade_answers(items, {
+        question_id: question.get('expected_points') for question_id, question in questions.items()
+    })
+
+    return jsonify({
+        'results': results,
+        'count': len(results)
+    })
+
+
+@app.route('/quizzes/compose', methods=['POST'])
+def compose():
+    """Build a quiz from questions sampled across uploads by topic, type and difficulty."""
+    try:
+        spec = parse_compose_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    candidates = iter_question_ids_by_topic(spec['topics'], spec['type'], spec['difficulty'])
+    return jsonify(compose_quiz(spec, candidates, get_questions_by_ids))
+
+
+@app.route('/export', methods=['GET'])
+def export_questions():
+    """Stream all questions as NDJSON or CSV (filters: topic, type, since, before)."""
+    try:
+        filters = parse_export_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    questions = iter_questions(
+        topic=filters['topic'],
+        question_type=filters['type'],
+        since=filters['since'],
+        before=filters['before']
+    )
+    return Response(
+        iter_export(questions, filters['format']),
+        mimetype=EXPORT_FORMATS[filters['format']],
+        headers={'Content-Disposition': f"attachment; filename=questions.{filters['format']}"}
+    )
+
+
 @app.route('/')
 def index():
     """Serve frontend."""
@@ -150,6 +679,7 @@ if __name__ == '__main__':
     print(f"🌐 Server: http://localhost:5000")
     print()
     print("Press Ctrl+C to stop")
+    print("For production, run: gunicorn -c gunicorn.conf.py wsgi:app")
     print("=" * 50)
 
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -1,10 +1,20 @@
 """Simple SQLite database for local Quizify."""
+import os
+import re
 import sqlite3
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent / 'quizify.db'
+from utils import normalize_topic
+
+DB_PATH = Path(os.environ.get('QUIZIFY_DB_PATH', Path(__file__).parent / 'quizify.db'))
+
+# Uploads expire this many days after upload (see lifecycle.py)
+RETENTION_DAYS = int(os.environ.get('UPLOAD_RETENTION_DAYS', '180'))
+
+# Relative weight of each indexed column when ranking search results
+SEARCH_WEIGHTS = (10.0, 2.0, 1.0, 2.0)  # question, options, explanation, expected_points
 
 
 def init_db():
@@ -12,6 +22,10 @@ def init_db():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    # Lets lifecycle.py return freed pages to the filesystem without a full
+    # VACUUM (only takes effect on a new database)
+    cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+
     # Uploads table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS uploads (
@@ -20,8 +34,33 @@ def init_db():
             status TEXT NOT NULL,
             topic TEXT,
             error_message TEXT,
+            content_hash TEXT,
+            batch_id TEXT,
             created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
+            updated_at TEXT NOT NULL,
+            expires_at TEXT,
+            archive_path TEXT,
+            archive_offset INTEGER,
+            archive_length INTEGER
+        )
+    ''')
+
+    # Add columns introduced after the table was first created
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(uploads)')}
+    if 'content_hash' not in columns:
+        cursor.execute('ALTER TABLE uploads ADD COLUMN content_hash TEXT')
+    if 'batch_id' not in columns:
+        cursor.execute('ALTER TABLE uploads ADD COLUMN batch_id TEXT')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_uploads_batch_id ON uploads(batch_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_uploads_content_hash ON uploads(content_hash)')
+
+    # Batches table (multi-file uploads)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS batches (
+            batch_id TEXT PRIMARY KEY,
+            total INTEGER NOT NULL,
+            created_at TEXT NOT NULL
         )
     ''')
 
@@ -40,24 +79,118 @@ def init_db():
             difficulty TEXT,
             filename TEXT,
             created_at TEXT NOT NULL,
+            topic_key TEXT,
             FOREIGN KEY (upload_id) REFERENCES uploads(upload_id)
         )
     ''')
 
+    init_retention(cursor)
+    init_topic_index(cursor)
+    init_search_index(cursor)
+
     conn.commit()
     conn.close()
 
 
-def save_upload(upload_id, filename, status='processing'):
+def init_retention(cursor):
+    """Add the expiry and archive columns of uploads, and an index on expiry."""
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(uploads)')}
+    for column, column_type in (('expires_at', 'TEXT'), ('archive_path', 'TEXT'),
+                                ('archive_offset', 'INTEGER'), ('archive_length', 'INTEGER')):
+        if column not in columns:
+            cursor.execute(f'ALTER TABLE uploads ADD COLUMN {column} {column_type}')
+
+    # Uploads saved before retention existed expire RETENTION_DAYS after creation
+    rows = cursor.execute('SELECT upload_id, created_at FROM uploads WHERE expires_at IS NULL').fetchall()
+    cursor.executemany('UPDATE uploads SET expires_at=? WHERE upload_id=?', [
+        ((datetime.fromisoformat(created_at) + timedelta(days=RETENTION_DAYS)).isoformat(), upload_id)
+        for upload_id, created_at in rows
+    ])
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_uploads_expires_at ON uploads(expires_at)')
+
+
+def expiry_time(days=None):
+    """Expiry (ISO timestamp) of a row written now, kept ``days`` (default RETENTION_DAYS)."""
+    return (datetime.utcnow() + timedelta(days=RETENTION_DAYS if days is None else days)).isoformat()
+
+
+def init_topic_index(cursor):
+    """Index questions by normalized topic, type and difficulty for quiz composition.
+
+    The index holds everything a composition filters on, and question_id is
+    the rowid, so candidate IDs are read from the index alone.
+    """
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(questions)')}
+    if 'topic_key' not in columns:
+        cursor.execute('ALTER TABLE questions ADD COLUMN topic_key TEXT')
+
+    # Key questions saved before the index existed
+    topics = [row[0] for row in cursor.execute('SELECT DISTINCT topic FROM questions WHERE topic_key IS NULL')]
+    for topic in topics:
+        cursor.execute(
+            'UPDATE questions SET topic_key=? WHERE topic_key IS NULL AND topic IS ?',
+            (normalize_topic(topic), topic)
+        )
+
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions(topic_key, type, difficulty)'
+    )
+
+
+def init_search_index(cursor):
+    """Create the FTS5 index over question text and the triggers keeping it in sync.
+
+    The index is an external-content table over questions, so it stores only
+    the inverted index, and the triggers update it on every insert, update
+    and delete, however the rows are written.
+    """
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='questions_fts'"
+    ).fetchone()
+
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+            question, options, explanation, expected_points,
+            content='questions', content_rowid='question_id'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+            INSERT INTO questions_fts(rowid, question, options, explanation, expected_points)
+            VALUES (new.question_id, new.question, new.options, new.explanation, new.expected_points);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+            INSERT INTO questions_fts(questions_fts, rowid, question, options, explanation, expected_points)
+            VALUES ('delete', old.question_id, old.question, old.options, old.explanation, old.expected_points);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE ON questions BEGIN
+            INSERT INTO questions_fts(questions_fts, rowid, question, options, explanation, expected_points)
+            VALUES ('delete', old.question_id, old.question, old.options, old.explanation, old.expected_points);
+            INSERT INTO questions_fts(rowid, question, options, explanation, expected_points)
+            VALUES (new.question_id, new.question, new.options, new.explanation, new.expected_points);
+        END
+    ''')
+
+    # Index questions saved before search existed
+    if not exists:
+        cursor.execute("INSERT INTO questions_fts(questions_fts) VALUES('rebuild')")
+
+
+def save_upload(upload_id, filename, status='processing', content_hash=None, batch_id=None):
     """Save upload metadata."""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     now = datetime.utcnow().isoformat()
 
     cursor.execute('''
-        INSERT INTO uploads (upload_id, filename, status, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (upload_id, filename, status, now, now))
+        INSERT INTO uploads (upload_id, filename, status, content_hash, batch_id, created_at, updated_at, expires_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (upload_id, filename, status, content_hash, batch_id, now, now, expiry_time()))
 
     conn.commit()
     conn.close()
@@ -94,44 +227,93 @@ def update_upload_status(upload_id, status, topic=None, error=None):
     conn.close()
 
 
+def insert_questions(cursor, upload_id, filename, questions_data, now):
+    """Insert generated questions using an open cursor (caller commits)."""
+    topic = questions_data.get('topic', 'General')
+    topic_key = normalize_topic(topic)
+
+    # Save MCQs
+    cursor.executemany('''
+        INSERT INTO questions (upload_id, type, topic, topic_key, question, options,
+                             correct_answer, explanation, filename, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(
+        upload_id, 'MCQ', topic, topic_key, mcq['question'],
+        json.dumps(mcq.get('options', [])),
+        mcq.get('correct_answer', ''),
+        mcq.get('explanation', ''),
+        filename, now
+    ) for mcq in questions_data.get('mcqs', [])])
+
+    # Save short questions
+    cursor.executemany('''
+        INSERT INTO questions (upload_id, type, topic, topic_key, question,
+                             expected_points, difficulty, filename, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(
+        upload_id, 'SHORT', topic, topic_key, sq['question'],
+        json.dumps(sq.get('expected_points', [])),
+        sq.get('difficulty', 'medium'),
+        filename, now
+    ) for sq in questions_data.get('short_questions', [])])
+
+
 def save_questions(upload_id, filename, questions_data):
     """Save generated questions."""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     now = datetime.utcnow().isoformat()
-    topic = questions_data.get('topic', 'General')
 
-    # Save MCQs
-    for mcq in questions_data.get('mcqs', []):
-        cursor.execute('''
-            INSERT INTO questions (upload_id, type, topic, question, options,
-                                 correct_answer, explanation, filename, created_at)
+    insert_questions(cursor, upload_id, filename, questions_data, now)
+
+    conn.commit()
+    conn.close()
+
+
+def save_upload_results(results):
+    """Save several processed uploads and their questions in one transaction.
+
+    Each result is a dict with upload_id, filename, status, content_hash,
+    and either questions_data (completed) or error (failed).
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    now = datetime.utcnow().isoformat()
+    expires_at = expiry_time()
+
+    with conn:
+        cursor.executemany('''
+            INSERT INTO uploads (upload_id, filename, status, topic, error_message,
+                                 content_hash, created_at, updated_at, expires_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            upload_id, 'MCQ', topic, mcq['question'],
-            json.dumps(mcq.get('options', [])),
-            mcq.get('correct_answer', ''),
-            mcq.get('explanation', ''),
-            filename, now
-        ))
+        ''', [(
+            r['upload_id'], r['filename'], r['status'],
+            (r.get('questions_data') or {}).get('topic'), r.get('error'),
+            r.get('content_hash'), now, now, expires_at
+        ) for r in results])
 
-    # Save short questions
-    for sq in questions_data.get('short_questions', []):
-        cursor.execute('''
-            INSERT INTO questions (upload_id, type, topic, question,
-                                 expected_points, difficulty, filename, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            upload_id, 'SHORT', topic, sq['question'],
-            json.dumps(sq.get('expected_points', [])),
-            sq.get('difficulty', 'medium'),
-            filename, now
-        ))
+        for r in results:
+            if r.get('questions_data'):
+                insert_questions(cursor, r['upload_id'], r['filename'], r['questions_data'], now)
 
-    conn.commit()
     conn.close()
 
 
+def get_completed_content_hashes():
+    """Get the content hashes of all successfully processed uploads."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT DISTINCT content_hash FROM uploads
+        WHERE status='completed' AND content_hash IS NOT NULL
+    ''')
+    hashes = {row[0] for row in cursor.fetchall()}
+    conn.close()
+
+    return hashes
+
+
 def get_upload_by_id(upload_id):
     """Get upload metadata."""
     conn = sqlite3.connect(DB_PATH)
@@ -168,6 +350,194 @@ def get_questions_by_upload_id(upload_id):
     return questions
 
 
+def get_uploads_with_questions(upload_ids):
+    """Get several uploads and their questions with one query per table.
+
+    Returns:
+        Dict of upload_id -> upload dict with a 'questions' list (missing uploads are left out)
+    """
+    upload_ids = list(dict.fromkeys(upload_ids))
+    if not upload_ids:
+        return {}
+
+    placeholders = ', '.join('?' for _ in upload_ids)
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    cursor.execute(f'SELECT * FROM uploads WHERE upload_id IN ({placeholders})', upload_ids)
+    uploads = {row['upload_id']: dict(row, questions=[]) for row in cursor.fetchall()}
+
+    cursor.execute(
+        f'SELECT * FROM questions WHERE upload_id IN ({placeholders}) ORDER BY question_id', upload_ids
+    )
+    for row in cursor.fetchall():
+        q = dict(row)
+        if q.get('options'):
+            q['options'] = json.loads(q['options'])
+        if q.get('expected_points'):
+            q['expected_points'] = json.loads(q['expected_points'])
+        uploads[q['upload_id']]['questions'].append(q)
+
+    conn.close()
+    return uploads
+
+
+def get_questions_by_ids(question_ids):
+    """Get several questions by ID.
+
+    Returns:
+        Dict of question_id (as a string) -> question dict (missing questions are left out)
+    """
+    ids = list(dict.fromkeys(int(i) for i in map(str, question_ids) if i.isdecimal()))
+    questions = {}
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    # Stay under SQLite's limit on query parameters
+    for start in range(0, len(ids), 900):
+        chunk = ids[start:start + 900]
+        placeholders = ', '.join('?' for _ in chunk)
+        cursor.execute(f'SELECT * FROM questions WHERE question_id IN ({placeholders})', chunk)
+        for row in cursor.fetchall():
+            q = dict(row)
+            if q.get('options'):
+                q['options'] = json.loads(q['options'])
+            if q.get('expected_points'):
+                q['expected_points'] = json.loads(q['expected_points'])
+            questions[str(q['question_id'])] = q
+
+    conn.close()
+    return questions
+
+
+def iter_question_ids_by_topic(topic_keys, question_type=None, difficulty=None, chunk_size=1000):
+    """Iterate over the IDs of questions with the given topic keys.
+
+    Uses the topic index alone (see init_topic_index), never the table rows.
+    """
+    conditions = [f"topic_key IN ({', '.join('?' for _ in topic_keys)})"]
+    params = list(topic_keys)
+    if question_type:
+        conditions.append('type=?')
+        params.append(question_type)
+    if difficulty:
+        conditions.append('difficulty=?')
+        params.append(difficulty)
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.execute(
+            f"SELECT question_id FROM questions INDEXED BY idx_questions_topic WHERE {' AND '.join(conditions)}",
+            params
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row[0]
+    finally:
+        conn.close()
+
+
+def iter_questions(topic=None, question_type=None, since=None, before=None, chunk_size=500):
+    """Iterate over all questions matching the filters without loading them all.
+
+    Rows are fetched from a server-side cursor in chunks, so memory use stays
+    flat however many questions there are.
+    """
+    conditions, params = [], []
+    if topic:
+        conditions.append('topic=?')
+        params.append(topic)
+    if question_type:
+        conditions.append('type=?')
+        params.append(question_type)
+    if since:
+        conditions.append('created_at>=?')
+        params.append(since)
+    if before:
+        conditions.append('created_at<?')
+        params.append(before)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.execute(f'SELECT * FROM questions {where} ORDER BY question_id', params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                q = dict(row)
+                if q.get('options'):
+                    q['options'] = json.loads(q['options'])
+                if q.get('expected_points'):
+                    q['expected_points'] = json.loads(q['expected_points'])
+                yield q
+    finally:
+        conn.close()
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query matching all of its words.
+
+    Each word is quoted so user input can't inject FTS5 query syntax.
+    """
+    words = re.findall(r'\w+', text.lower())
+    return ' '.join(f'"{word}"' for word in words)
+
+
+def search_questions(text, limit=20, offset=0):
+    """Full-text search over question text, options, explanations and expected points.
+
+    Args:
+        text: Search words (all must match)
+        limit: Maximum number of results
+        offset: Number of results to skip
+
+    Returns:
+        Tuple of (questions best match first, total number of matches)
+    """
+    match = build_match_query(text)
+    if not match:
+        return [], 0
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT count(*) FROM questions_fts WHERE questions_fts MATCH ?', (match,))
+    total = cursor.fetchone()[0]
+
+    cursor.execute(f'''
+        SELECT q.*, bm25(questions_fts, {', '.join(map(str, SEARCH_WEIGHTS))}) AS score
+        FROM questions_fts
+        JOIN questions q ON q.question_id = questions_fts.rowid
+        WHERE questions_fts MATCH ?
+        ORDER BY score
+        LIMIT ? OFFSET ?
+    ''', (match, limit, offset))
+    rows = cursor.fetchall()
+    conn.close()
+
+    questions = []
+    for row in rows:
+        q = dict(row)
+        if q.get('options'):
+            q['options'] = json.loads(q['options'])
+        if q.get('expected_points'):
+            q['expected_points'] = json.loads(q['expected_points'])
+        questions.append(q)
+
+    return questions, total
+
+
 def list_uploads(limit=50):
     """List recent uploads."""
     conn = sqlite3.connect(DB_PATH)
@@ -181,5 +551,185 @@ def list_uploads(limit=50):
     return [dict(row) for row in rows]
 
 
+def save_batch(batch_id, total):
+    """Save a multi-file upload batch."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    now = datetime.utcnow().isoformat()
+
+    cursor.execute('''
+        INSERT INTO batches (batch_id, total, created_at)
+        VALUES (?, ?, ?)
+    ''', (batch_id, total, now))
+
+    conn.commit()
+    conn.close()
+
+
+def get_batch(batch_id):
+    """Get a batch and the uploads in it."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT * FROM batches WHERE batch_id=?', (batch_id,))
+    batch = cursor.fetchone()
+    if not batch:
+        conn.close()
+        return None
+
+    cursor.execute('''
+        SELECT upload_id, filename, status, topic, error_message, created_at, updated_at
+        FROM uploads WHERE batch_id=? ORDER BY created_at, rowid
+    ''', (batch_id,))
+    uploads = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+
+    return {**dict(batch), 'uploads': uploads}
+
+
+def get_expired_uploads(now=None):
+    """Get uploads (including archive records) whose expiry has passed."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    cursor.execute(
+        'SELECT * FROM uploads WHERE expires_at <= ? ORDER BY expires_at',
+        (now or datetime.utcnow().isoformat(),)
+    )
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def archive_upload(upload, archive_path, offset, length, expires_at):
+    """Replace an upload's questions with a pointer to its archive.
+
+    The upload row stays, with status 'archived', until ``expires_at``.
+
+    Returns:
+        False if the upload changed since it was read (it is left as is)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    now = datetime.utcnow().isoformat()
+
+    with conn:
+        cursor.execute('''
+            UPDATE uploads SET status='archived', archive_path=?, archive_offset=?, archive_length=?,
+                               expires_at=?, updated_at=?
+            WHERE upload_id=? AND updated_at=?
+        ''', (archive_path, offset, length, expires_at, now, upload['upload_id'], upload['updated_at']))
+        archived = cursor.rowcount == 1
+        if archived:
+            cursor.execute('DELETE FROM questions WHERE upload_id=?', (upload['upload_id'],))
+
+    conn.close()
+    return archived
+
+
+def delete_uploads(upload_ids):
+    """Delete uploads, their questions, and batches left without uploads."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    params = [(upload_id,) for upload_id in upload_ids]
+
+    with conn:
+        cursor.executemany('DELETE FROM questions WHERE upload_id=?', params)
+        cursor.executemany('DELETE FROM uploads WHERE upload_id=?', params)
+        cursor.execute('''
+            DELETE FROM batches
+            WHERE NOT EXISTS (SELECT 1 FROM uploads WHERE uploads.batch_id = batches.batch_id)
+        ''')
+
+    conn.close()
+
+
+def get_archive_paths():
+    """Get the archive files still referenced by archived uploads."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT DISTINCT archive_path FROM uploads WHERE status='archived'")
+    paths = {row[0] for row in cursor.fetchall()}
+    conn.close()
+
+    return paths
+
+
+def restore_upload_rows(upload, questions):
+    """Write an archived upload's questions back under their original IDs.
+
+    The upload is taken out of 'archived' in the same transaction, so of
+    two concurrent restores only the first writes anything.
+
+    Args:
+        upload: Upload row from the archive
+        questions: Question rows from the archive (as get_questions_by_upload_id returns them)
+
+    Returns:
+        False if the upload was no longer archived (it is left as is)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    now = datetime.utcnow().isoformat()
+
+    with conn:
+        cursor.execute('''
+            UPDATE uploads SET status='completed', topic=?, archive_path=NULL, archive_offset=NULL,
+                               archive_length=NULL, expires_at=?, updated_at=?
+            WHERE upload_id=? AND status='archived'
+        ''', (upload.get('topic'), expiry_time(), now, upload['upload_id']))
+        restored = cursor.rowcount == 1
+        if restored:
+            cursor.executemany('''
+                INSERT INTO questions (question_id, upload_id, type, topic, topic_key, question, options,
+                                       correct_answer, explanation, expected_points, difficulty,
+                                       filename, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                q['question_id'], q['upload_id'], q['type'], q.get('topic'), normalize_topic(q.get('topic')),
+                q['question'],
+                json.dumps(q['options']) if q.get('options') is not None else None,
+                q.get('correct_answer'), q.get('explanation'),
+                json.dumps(q['expected_points']) if q.get('expected_points') is not None else None,
+                q.get('difficulty'), q.get('filename'), q['created_at']
+            ) for q in questions])
+
+    conn.close()
+    return restored
+
+
+def reclaim_space():
+    """Return free database pages to the filesystem.
+
+    The first call switches a database created before incremental
+    auto-vacuum to it, which takes one full VACUUM; later calls only
+    truncate the free pages.
+
+    Returns:
+        Bytes the database file shrank by
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    def size():
+        return cursor.execute('PRAGMA page_count').fetchone()[0] * cursor.execute('PRAGMA page_size').fetchone()[0]
+
+    before = size()
+    if cursor.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+        cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        cursor.execute('VACUUM')
+    else:
+        # Each step of the pragma frees one page; executescript runs it to the end
+        conn.executescript('PRAGMA incremental_vacuum;')
+    freed = before - size()
+    conn.close()
+
+    return freed
+
+
 # Initialize database on import
 init_db()
@@ -0,0 +1,36 @@
+"""Gunicorn settings for the local server (see wsgi.py).
+
+Every setting can be overridden with an environment variable, e.g.
+QUIZIFY_WORKERS=8 gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+
+bind = os.environ.get('QUIZIFY_BIND', '0.0.0.0:5000')
+
+# Worker processes, each serving QUIZIFY_THREADS requests at once
+workers = int(os.environ.get('QUIZIFY_WORKERS', '2'))
+threads = int(os.environ.get('QUIZIFY_THREADS', '4'))
+worker_class = 'gthread'
+
+# Load the app and heavy libraries once in the master, then fork
+preload_app = True
+
+# Uploads are processed inside the request, so allow for slow generation
+timeout = int(os.environ.get('QUIZIFY_TIMEOUT', '300'))
+
+# On SIGTERM, workers stop accepting and get this long to finish in-flight
+# uploads before they are killed
+graceful_timeout = int(os.environ.get('QUIZIFY_GRACEFUL_TIMEOUT', '120'))
+
+accesslog = '-'
+
+
+def on_starting(server):
+    from wsgi import preloaded
+    server.log.info(f"Preloaded modules: {', '.join(preloaded) or 'none'}")
+
+
+def worker_exit(server, worker):
+    # Finish batch files this worker already started before it exits
+    from app import drain_batch_uploads
+    drain_batch_uploads()
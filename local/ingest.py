@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Bulk-ingest a directory of documents into the local Quizify database.
+
+Text is extracted in a process pool, questions are generated on a bounded
+thread pool under a requests-per-minute limit, and results are written in
+batched transactions. Files whose content already has a completed upload
+are skipped, so an interrupted run can simply be started again.
+
+Usage:
+    python ingest.py path/to/documents [--workers 4] [--concurrency 4] [--rate 15]
+"""
+import argparse
+import hashlib
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from text_extractor import extract_text, TextExtractionError, ExtractionBudget
+from question_generator import generate_questions, QuestionGenerationError
+from dedup import deduplicate_questions
+from database import save_upload_results, get_completed_content_hashes
+from uploads import ALLOWED_EXTENSIONS, MAX_QUESTIONS_PER_TYPE, allowed_file, save_extracted_text
+
+
+class RateLimiter:
+    """Space out calls so no more than ``per_minute`` start in any minute."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file, matching the content hash of web uploads."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_documents(directory: Path) -> list:
+    """Supported documents under a directory, in a stable order."""
+    return sorted(p for p in directory.rglob('*') if p.is_file() and allowed_file(p.name))
+
+
+def extract_document(path: str) -> str:
+    """Extract text from one document (runs in a worker process)."""
+    text = extract_text(file_path=path, budget=ExtractionBudget())
+    if len(text) < 50:
+        raise TextExtractionError("Extracted text is too short. Please upload a document with more content.")
+    return text
+
+
+def generate_for_document(job: dict, limiter: RateLimiter, num_mcqs: int, num_short: int) -> dict:
+    """Generate and deduplicate questions for one extracted document."""
+    limiter.wait()
+    try:
+        questions_data = generate_questions(job['text'], num_mcqs=num_mcqs, num_short=num_short)
+        questions_data, _ = deduplicate_questions(questions_data)
+        return dict(job, status='completed', questions_data=questions_data)
+    except QuestionGenerationError as e:
+        return dict(job, status='failed', error=str(e))
+    except Exception as e:
+        return dict(job, status='failed', error=f'Processing failed: {str(e)}')
+
+
+def flush(pending: list) -> None:
+    """Persist extracted text, then write a batch of results in one transaction."""
+    for result in pending:
+        if result['status'] == 'completed':
+            save_extracted_text(result['upload_id'], result['text'])
+    save_upload_results(pending)
+    pending.clear()
+
+
+def ingest(directory: Path, workers: int, concurrency: int, rate: float,
+           num_mcqs: int, num_short: int, batch_size: int) -> dict:
+    """Extract, generate and store questions for every new document in a directory.
+
+    Returns:
+        dict of counts (found, skipped, completed, failed, questions)
+    """
+    documents = find_documents(directory)
+    completed_hashes = get_completed_content_hashes()
+
+    jobs = []
+    skipped = 0
+    for path in documents:
+        content_hash = hash_file(path)
+        if content_hash in completed_hashes:
+            skipped += 1
+            continue
+        # Identical files within this run are only processed once
+        completed_hashes.add(content_hash)
+        jobs.append({
+            'upload_id': str(uuid.uuid4()),
+            'filename': path.name,
+            'path': str(path),
+            'content_hash': content_hash
+        })
+
+    stats = {'found': len(documents), 'skipped': skipped, 'completed': 0, 'failed': 0, 'questions': 0}
+    print(f"Found {len(documents)} documents, {skipped} already ingested, {len(jobs)} to process")
+    if not jobs:
+        return stats
+
+    results = queue.Queue()
+    limiter = RateLimiter(rate)
+    started = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=workers) as extract_pool, \
+            ThreadPoolExecutor(max_workers=concurrency) as generate_pool:
+
+        # Every job must put exactly one result, or results.get() below waits forever
+        def on_extracted(job, future):
+            try:
+                job['text'] = future.result()
+            except TextExtractionError as e:
+                results.put(dict(job, status='failed', error=str(e)))
+                return
+            except Exception as e:
+                results.put(dict(job, status='failed', error=f'Extraction failed: {str(e)}'))
+                return
+            try:
+                generate_pool.submit(generate_for_document, job, limiter, num_mcqs, num_short) \
+                    .add_done_callback(lambda f: on_generated(job, f))
+            except Exception as e:
+                # e.g. the pool is shutting down
+                results.put(dict(job, status='failed', error=f'Could not start generation: {str(e)}'))
+
+        def on_generated(job, future):
+            try:
+                results.put(future.result())
+            except BaseException as e:
+                # Cancelled, or failed outside generate_for_document's own handling
+                results.put(dict(job, status='failed', error=f'Processing failed: {str(e) or type(e).__name__}'))
+
+        for job in jobs:
+            future = extract_pool.submit(extract_document, job['path'])
+            future.add_done_callback(lambda f, job=job: on_extracted(job, f))
+
+        pending = []
+        for done in range(1, len(jobs) + 1):
+            result = results.get()
+            pending.append(result)
+
+            if result['status'] == 'completed':
+                count = len(result['questions_data'].get('mcqs', [])) + \
+                    len(result['questions_data'].get('short_questions', []))
+                stats['completed'] += 1
+                stats['questions'] += count
+                outcome = f"{count} questions"
+            else:
+                stats['failed'] += 1
+                outcome = f"failed: {result['error']}"
+
+            elapsed = time.monotonic() - started
+            print(f"[{done}/{len(jobs)}] {result['filename']}: {outcome} "
+                  f"({done / elapsed * 60:.1f} docs/min)")
+
+            if len(pending) >= batch_size:
+                flush(pending)
+
+        if pending:
+            flush(pending)
+
+    elapsed = time.monotonic() - started
+    print(f"\nProcessed {len(jobs)} documents in {elapsed:.1f}s "
+          f"({len(jobs) / elapsed * 60:.1f} docs/min, {stats['questions'] / elapsed * 60:.1f} questions/min)")
+    print(f"Completed: {stats['completed']}, failed: {stats['failed']}, skipped: {stats['skipped']}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', type=Path, help=f'Directory of documents ({", ".join(sorted(ALLOWED_EXTENSIONS))})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Text extraction processes')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent question generation requests')
+    parser.add_argument('--rate', type=float, default=15, help='Maximum generation requests per minute (0 = unlimited)')
+    parser.add_argument('--num-mcqs', type=int, default=5, help='MCQs per document')
+    parser.add_argument('--num-short', type=int, default=5, help='Short questions per document')
+    parser.add_argument('--batch-size', type=int, default=20, help='Documents written per database transaction')
+    args = parser.parse_args()
+
+    if not args.directory.is_dir():
+        sys.exit(f"Not a directory: {args.directory}")
+    for name in ('num_mcqs', 'num_short'):
+        if not 0 <= getattr(args, name) <= MAX_QUESTIONS_PER_TYPE:
+            sys.exit(f"--{name.replace('_', '-')} must be between 0 and {MAX_QUESTIONS_PER_TYPE}")
+    if not os.environ.get('GEMINI_API_KEY'):
+        sys.exit("GEMINI_API_KEY environment variable not set")
+
+    stats = ingest(
+        args.directory,
+        workers=max(args.workers, 1),
+        concurrency=max(args.concurrency, 1),
+        rate=args.rate,
+        num_mcqs=args.num_mcqs,
+        num_short=args.num_short,
+        batch_size=max(args.batch_size, 1)
+    )
+    sys.exit(1 if stats['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Archive expired uploads and reclaim the space they used.
+
+Uploads expire UPLOAD_RETENTION_DAYS after upload. A completed upload and
+its questions are then appended to a compressed archive for the month it
+was created (archives/YYYY-MM.ndjson.gz), and only a small archive record
+is kept in the database until ARCHIVE_RETENTION_DAYS later. Uploads that
+never completed are deleted. Either way the uploaded file and its
+extracted text are removed (the text is kept in the archive, so a
+restored upload can still be regenerated), and freed database pages are
+returned to the filesystem.
+
+Each upload is a separate gzip member of its archive, so restoring one
+(POST /uploads/<upload_id>/restore) reads only its byte range, while the
+whole file is still a valid .ndjson.gz file.
+
+Usage:
+    python lifecycle.py [--dry-run]
+"""
+import argparse
+import gzip
+import json
+import os
+
+from serialization import dumps
+from uploads import BASE_DIR, UPLOAD_FOLDER, TEXT_FOLDER, load_extracted_text, save_extracted_text
+from database import (
+    DB_PATH,
+    expiry_time,
+    get_expired_uploads,
+    get_questions_by_upload_id,
+    archive_upload,
+    delete_uploads,
+    get_archive_paths,
+    restore_upload_rows,
+    reclaim_space
+)
+
+ARCHIVE_FOLDER = BASE_DIR / 'archives'
+
+# Archive records, and archives still referenced by one, are kept this long
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', '730'))
+
+
+def upload_files(upload):
+    """The uploaded file and extracted text stored for an upload."""
+    files = [TEXT_FOLDER / f"{upload['upload_id']}.txt.gz"]
+    if upload.get('filename'):
+        files.append(UPLOAD_FOLDER / f"{upload['upload_id']}_{upload['filename']}")
+    return [path for path in files if path.exists()]
+
+
+def remove_files(paths):
+    """Delete files, returning the bytes freed."""
+    freed = 0
+    for path in paths:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            freed += size
+        except FileNotFoundError:
+            pass
+    return freed
+
+
+def append_to_archive(upload, questions, text=None):
+    """Append an upload, its questions and extracted text to its month's archive as one gzip member.
+
+    Returns:
+        (archive path relative to this directory, offset, length)
+    """
+    ARCHIVE_FOLDER.mkdir(exist_ok=True)
+    month = (upload.get('created_at') or '')[:7] or 'undated'
+    path = ARCHIVE_FOLDER / f"{month}.ndjson.gz"
+    member = gzip.compress(dumps({'upload': upload, 'questions': questions, 'text': text}) + b'\n')
+
+    with open(path, 'ab') as f:
+        offset = f.tell()
+        f.write(member)
+        f.flush()
+        os.fsync(f.fileno())
+
+    return str(path.relative_to(BASE_DIR)), offset, len(member)
+
+
+def run_lifecycle(now=None, dry_run=False):
+    """Archive or delete expired uploads, prune expired archive records and reclaim space.
+
+    Args:
+        now: Current time (ISO timestamp, default now)
+        dry_run: Only count what would be done
+
+    Returns:
+        dict with counts of archived, deleted and pruned (archive records)
+        uploads and the bytes reclaimed from files, archives and the database
+    """
+    stats = {'archived': 0, 'deleted': 0, 'pruned': 0, 'skipped': 0,
+             'file_bytes': 0, 'archive_bytes': 0, 'database_bytes': 0}
+    archive_expires_at = expiry_time(ARCHIVE_RETENTION_DAYS)
+    to_delete = []
+
+    for upload in get_expired_uploads(now):
+        if upload['status'] == 'archived':
+            stats['pruned'] += 1
+            to_delete.append(upload['upload_id'])
+            continue
+
+        files = upload_files(upload)
+        if upload['status'] != 'completed':
+            stats['deleted'] += 1
+            to_delete.append(upload['upload_id'])
+        elif dry_run:
+            stats['archived'] += 1
+        else:
+            questions = get_questions_by_upload_id(upload['upload_id'])
+            text = load_extracted_text(upload['upload_id'])
+            path, offset, length = append_to_archive(upload, questions, text)
+            if not archive_upload(upload, path, offset, length, archive_expires_at):
+                # Changed (e.g. regenerated) since it was read; archived on the next run
+                stats['skipped'] += 1
+                continue
+            stats['archived'] += 1
+
+        if dry_run:
+            stats['file_bytes'] += sum(path.stat().st_size for path in files)
+        else:
+            stats['file_bytes'] += remove_files(files)
+
+    if dry_run:
+        return stats
+
+    delete_uploads(to_delete)
+
+    # Archives no archive record points at any more
+    referenced = {BASE_DIR / path for path in get_archive_paths()}
+    if ARCHIVE_FOLDER.exists():
+        stats['archive_bytes'] = remove_files(
+            [path for path in ARCHIVE_FOLDER.glob('*.ndjson.gz') if path not in referenced]
+        )
+
+    stats['database_bytes'] = reclaim_space()
+    return stats
+
+
+def restore_upload(upload):
+    """Restore an archived upload's questions and extracted text from its archive.
+
+    Args:
+        upload: The upload row (status 'archived')
+
+    Returns:
+        dict with upload_id, status and total_questions, or None if the
+        upload was restored by someone else in the meantime
+    """
+    with open(BASE_DIR / upload['archive_path'], 'rb') as f:
+        f.seek(upload['archive_offset'])
+        member = f.read(upload['archive_length'])
+    data = json.loads(gzip.decompress(member))
+
+    # Written first, so a restored upload always has its text; archives
+    # written before the text was archived have none
+    if data.get('text') is not None:
+        save_extracted_text(upload['upload_id'], data['text'])
+    if not restore_upload_rows(data['upload'], data['questions']):
+        return None
+    return {
+        'upload_id': upload['upload_id'],
+        'status': 'completed',
+        'total_questions': len(data['questions'])
+    }
+
+
+def format_bytes(size):
+    """Human-readable byte count."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be archived and deleted')
+    args = parser.parse_args()
+
+    stats = run_lifecycle(dry_run=args.dry_run)
+    print(f"{'Dry run: would have ' if args.dry_run else ''}archived {stats['archived']} uploads, "
+          f"deleted {stats['deleted']} incomplete uploads and pruned {stats['pruned']} expired archive records")
+    if stats['skipped']:
+        print(f"{stats['skipped']} uploads changed during the run and are left for the next one")
+
+    print(f"Uploaded files and extracted text: {format_bytes(stats['file_bytes'])}")
+    if not args.dry_run:
+        print(f"Expired archives: {format_bytes(stats['archive_bytes'])}")
+        print(f"Database ({DB_PATH.name}): {format_bytes(stats['database_bytes'])}")
+        total = stats['file_bytes'] + stats['archive_bytes'] + stats['database_bytes']
+        print(f"Reclaimed {format_bytes(total)}")
+
+
+if __name__ == '__main__':
+    main()
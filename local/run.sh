@@ -40,5 +40,8 @@ if [ -z "$GEMINI_API_KEY" ]; then
     fi
 fi
 
-# Run the server
+# Run the server (./run.sh --production for gunicorn with multiple workers)
+if [ "$1" = "--production" ]; then
+    exec gunicorn -c gunicorn.conf.py wsgi:app
+fi
 python3 app.py
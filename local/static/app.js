@@ -1,6 +1,110 @@
 /**
  * Quizify Local Frontend Application
  */
+
+// Completed quizzes are cached in IndexedDB and revalidated with ETags
+const QUIZ_CACHE_DB = 'quizify';
+const QUIZ_CACHE_STORE = 'quizzes';
+
+// Question cards rendered per animation frame, so large quizzes don't block the page
+const RENDER_CHUNK_SIZE = 25;
+
+/**
+ * IndexedDB store of completed quizzes keyed by upload_id.
+ * Every method resolves (to null when unavailable) rather than rejecting,
+ * so the app works unchanged where IndexedDB is blocked.
+ */
+class QuizCache {
+    constructor() {
+        this.dbPromise = this.open();
+    }
+
+    open() {
+        return new Promise(resolve => {
+            try {
+                const request = indexedDB.open(QUIZ_CACHE_DB, 1);
+                request.onupgradeneeded = () => {
+                    request.result.createObjectStore(QUIZ_CACHE_STORE, { keyPath: 'upload_id' });
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+            } catch (error) {
+                resolve(null);
+            }
+        });
+    }
+
+    async get(uploadId) {
+        const db = await this.dbPromise;
+        if (!db) return null;
+
+        return new Promise(resolve => {
+            const request = db.transaction(QUIZ_CACHE_STORE).objectStore(QUIZ_CACHE_STORE).get(uploadId);
+            request.onsuccess = () => resolve(request.result || null);
+            request.onerror = () => resolve(null);
+        });
+    }
+
+    async put(uploadId, etag, data) {
+        const db = await this.dbPromise;
+        if (!db) return;
+
+        return new Promise(resolve => {
+            const transaction = db.transaction(QUIZ_CACHE_STORE, 'readwrite');
+            transaction.objectStore(QUIZ_CACHE_STORE).put({ upload_id: uploadId, etag, data, cached_at: Date.now() });
+            transaction.oncomplete = () => resolve();
+            transaction.onerror = () => resolve();
+        });
+    }
+}
+
+/**
+ * Page-level timings. Each measurement is also a performance.measure entry
+ * (visible in DevTools); run quizifyTimings.report() in the console for a summary.
+ */
+const pageTimings = {
+    samples: {},
+
+    start() {
+        return performance.now();
+    },
+
+    end(name, start) {
+        const duration = performance.now() - start;
+        (this.samples[name] = this.samples[name] || []).push(duration);
+        if (performance.measure) {
+            try {
+                performance.measure(`quizify:${name}`, { start, duration });
+            } catch (error) {
+                // Older browsers only support named marks
+            }
+        }
+        return duration;
+    },
+
+    report() {
+        const rows = {};
+        const navigation = performance.getEntriesByType('navigation')[0];
+        if (navigation) {
+            rows['page load'] = { count: 1, avg_ms: +navigation.duration.toFixed(1), p95_ms: +navigation.duration.toFixed(1), max_ms: +navigation.duration.toFixed(1) };
+        }
+
+        Object.entries(this.samples).forEach(([name, samples]) => {
+            const sorted = [...samples].sort((a, b) => a - b);
+            rows[name] = {
+                count: sorted.length,
+                avg_ms: +(sorted.reduce((sum, value) => sum + value, 0) / sorted.length).toFixed(1),
+                p95_ms: +sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * 0.95))].toFixed(1),
+                max_ms: +sorted[sorted.length - 1].toFixed(1)
+            };
+        });
+
+        console.table(rows);
+        return rows;
+    }
+};
+window.quizifyTimings = pageTimings;
+
 class QuizifyApp {
     constructor() {
         // DOM Elements
@@ -26,6 +130,9 @@ class QuizifyApp {
         // State
         this.selectedFile = null;
         this.currentUploadId = null;
+        this.quizCache = new QuizCache();
+        this.uploadItems = new Map();
+        this.renderToken = 0;
 
         // API URL
         this.apiUrl = 'http://localhost:5000';
@@ -61,6 +168,14 @@ class QuizifyApp {
 
         // New upload button
         this.newUploadBtn.addEventListener('click', () => this.resetToUpload());
+
+        // Past uploads (one delegated handler, since items are updated in place)
+        this.pastUploadsContainer.addEventListener('click', (e) => {
+            const item = e.target.closest('.upload-item');
+            if (item) {
+                this.loadUploadQuestions(item.dataset.uploadId);
+            }
+        });
     }
 
     handleDragOver(e) {
@@ -150,15 +265,33 @@ class QuizifyApp {
         }
     }
 
-    async fetchQuestions(uploadId) {
-        const response = await fetch(`${this.apiUrl}/questions/${uploadId}`);
+    async fetchQuestions(uploadId, cached = null) {
+        const start = pageTimings.start();
+        const response = await fetch(`${this.apiUrl}/questions/${uploadId}`, {
+            headers: cached ? { 'If-None-Match': cached.etag } : {}
+        });
+
+        // Cached copy is still current
+        if (response.status === 304 && cached) {
+            pageTimings.end('quiz fetch (not modified)', start);
+            return cached.data;
+        }
 
         if (!response.ok) {
             const error = await response.json();
             throw new Error(error.error || 'Failed to fetch questions');
         }
 
-        return response.json();
+        const data = await response.json();
+        pageTimings.end('quiz fetch', start);
+
+        // Only completed quizzes are cached; in-progress ones are still changing
+        const etag = response.headers.get('ETag');
+        if (data.status === 'completed' && etag) {
+            this.quizCache.put(uploadId, etag, data);
+        }
+
+        return data;
     }
 
     displayQuestions(data) {
@@ -171,28 +304,57 @@ class QuizifyApp {
         this.topicTitle.textContent = data.topic || 'Generated Questions';
         this.fileInfo.textContent = `From: ${data.filename} | ${data.total_questions} questions`;
 
-        // Display MCQs
-        this.mcqContainer.innerHTML = '';
-        if (data.mcqs && data.mcqs.length > 0) {
-            data.mcqs.forEach((mcq, index) => {
-                this.mcqContainer.appendChild(this.createMCQCard(mcq, index + 1));
-            });
-        } else {
-            this.mcqContainer.innerHTML = '<p class="empty-text">No MCQs generated</p>';
-        }
-
-        // Display short questions
-        this.shortContainer.innerHTML = '';
-        if (data.short_questions && data.short_questions.length > 0) {
-            data.short_questions.forEach((sq, index) => {
-                this.shortContainer.appendChild(this.createShortQuestionCard(sq, index + 1));
-            });
-        } else {
-            this.shortContainer.innerHTML = '<p class="empty-text">No short questions generated</p>';
-        }
+        // A newer render supersedes any still in progress
+        const token = ++this.renderToken;
+        const start = pageTimings.start();
 
         // Initialize tab switching
         this.initTabs();
+
+        return Promise.all([
+            this.renderCards(this.mcqContainer, data.mcqs, (mcq, number) => this.createMCQCard(mcq, number), 'No MCQs generated', token),
+            this.renderCards(this.shortContainer, data.short_questions, (sq, number) => this.createShortQuestionCard(sq, number), 'No short questions generated', token)
+        ]).then(() => {
+            if (token === this.renderToken) {
+                pageTimings.end('quiz render', start);
+            }
+        });
+    }
+
+    renderCards(container, items, createCard, emptyText, token) {
+        container.textContent = '';
+
+        if (!items || items.length === 0) {
+            container.innerHTML = `<p class="empty-text">${emptyText}</p>`;
+            return Promise.resolve();
+        }
+
+        // Build cards off-DOM in chunks, appending one fragment per frame
+        return new Promise(resolve => {
+            let index = 0;
+
+            const renderChunk = () => {
+                if (token !== this.renderToken) {
+                    resolve();
+                    return;
+                }
+
+                const fragment = document.createDocumentFragment();
+                const end = Math.min(index + RENDER_CHUNK_SIZE, items.length);
+                for (; index < end; index++) {
+                    fragment.appendChild(createCard(items[index], index + 1));
+                }
+                container.appendChild(fragment);
+
+                if (index < items.length) {
+                    requestAnimationFrame(renderChunk);
+                } else {
+                    resolve();
+                }
+            };
+
+            renderChunk();
+        });
     }
 
     createMCQCard(mcq, number) {
@@ -281,6 +443,7 @@ class QuizifyApp {
 
     async loadPastUploads() {
         try {
+            const start = pageTimings.start();
             const response = await fetch(`${this.apiUrl}/uploads`);
 
             if (!response.ok) {
@@ -288,48 +451,109 @@ class QuizifyApp {
             }
 
             const data = await response.json();
+            pageTimings.end('uploads fetch', start);
             this.displayPastUploads(data.uploads || []);
 
         } catch (error) {
             console.error('Error loading past uploads:', error);
-            this.pastUploadsContainer.innerHTML = '<p class="empty-text">Unable to load recent uploads</p>';
+            this.showPastUploadsMessage('Unable to load recent uploads');
         }
     }
 
     displayPastUploads(uploads) {
         if (uploads.length === 0) {
-            this.pastUploadsContainer.innerHTML = '<p class="empty-text">No uploads yet</p>';
+            this.showPastUploadsMessage('No uploads yet');
             return;
         }
 
-        this.pastUploadsContainer.innerHTML = uploads.map(upload => `
-            <div class="upload-item" data-upload-id="${upload.upload_id}">
-                <div class="upload-item-info">
-                    <div class="upload-item-name">${this.escapeHtml(upload.filename || 'Unknown file')}</div>
-                    <div class="upload-item-meta">${this.formatDate(upload.created_at)} ${upload.topic ? `- ${upload.topic}` : ''}</div>
-                </div>
-                <span class="upload-item-status ${upload.status}">${upload.status}</span>
-            </div>
-        `).join('');
+        const start = pageTimings.start();
+        this.pastUploadsContainer.querySelectorAll('.empty-text').forEach(el => el.remove());
+
+        // Update the list in place: create new items, patch changed ones,
+        // move only out-of-place ones and drop ones no longer listed
+        const listed = new Set();
+        let previous = null;
+
+        uploads.forEach(upload => {
+            listed.add(upload.upload_id);
+            const signature = [upload.filename, upload.created_at, upload.topic, upload.status].join('|');
+            let entry = this.uploadItems.get(upload.upload_id);
+
+            if (!entry) {
+                entry = { element: this.createUploadItem(upload), signature };
+                this.uploadItems.set(upload.upload_id, entry);
+            } else if (entry.signature !== signature) {
+                this.updateUploadItem(entry.element, upload);
+                entry.signature = signature;
+            }
 
-        // Add click handlers
-        this.pastUploadsContainer.querySelectorAll('.upload-item').forEach(item => {
-            item.addEventListener('click', () => {
-                const uploadId = item.dataset.uploadId;
-                this.loadUploadQuestions(uploadId);
-            });
+            const expected = previous ? previous.nextSibling : this.pastUploadsContainer.firstChild;
+            if (entry.element !== expected) {
+                this.pastUploadsContainer.insertBefore(entry.element, expected);
+            }
+            previous = entry.element;
+        });
+
+        this.uploadItems.forEach((entry, uploadId) => {
+            if (!listed.has(uploadId)) {
+                entry.element.remove();
+                this.uploadItems.delete(uploadId);
+            }
         });
+
+        pageTimings.end('uploads render', start);
+    }
+
+    showPastUploadsMessage(message) {
+        this.uploadItems.clear();
+        this.pastUploadsContainer.innerHTML = `<p class="empty-text">${message}</p>`;
+    }
+
+    createUploadItem(upload) {
+        const item = document.createElement('div');
+        item.className = 'upload-item';
+        item.dataset.uploadId = upload.upload_id;
+        item.innerHTML = `
+            <div class="upload-item-info">
+                <div class="upload-item-name"></div>
+                <div class="upload-item-meta"></div>
+            </div>
+            <span class="upload-item-status"></span>
+        `;
+        this.updateUploadItem(item, upload);
+        return item;
+    }
+
+    updateUploadItem(item, upload) {
+        item.querySelector('.upload-item-name').textContent = upload.filename || 'Unknown file';
+        item.querySelector('.upload-item-meta').textContent = `${this.formatDate(upload.created_at)} ${upload.topic ? `- ${upload.topic}` : ''}`;
+
+        const status = item.querySelector('.upload-item-status');
+        status.className = `upload-item-status ${upload.status}`;
+        status.textContent = upload.status;
     }
 
     async loadUploadQuestions(uploadId) {
         try {
-            this.showStatus('Loading questions...');
-            const data = await this.fetchQuestions(uploadId);
+            // Show a cached quiz immediately, then revalidate it
+            const cached = await this.quizCache.get(uploadId);
+            if (cached) {
+                this.displayQuestions(cached.data);
+            } else {
+                this.showStatus('Loading questions...');
+            }
+
+            const data = await this.fetchQuestions(uploadId, cached);
+            if (cached && data === cached.data) {
+                return;
+            }
 
             if (data.status === 'completed') {
                 this.displayQuestions(data);
             } else if (data.status === 'failed') {
                 this.showError(data.error || 'Question generation failed');
+            } else if (data.status === 'archived') {
+                this.showError(`This quiz was archived. Restore it with POST /uploads/${uploadId}/restore to view its questions.`);
             } else {
                 this.showStatus('Questions are still being generated...');
             }
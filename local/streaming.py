@@ -0,0 +1,70 @@
+"""Streaming multipart upload handling for the local Flask server."""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+from flask import Request
+
+
+class HashingFileWriter:
+    """Disk-backed upload stream that hashes content as it is written."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.size = 0
+        self._file = open(path, 'w+b')
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def hexdigest(self) -> str:
+        """SHA-256 of everything written so far."""
+        return self._hash.hexdigest()
+
+    def move_to(self, destination: Path) -> Path:
+        """Close the file and move it to its final location."""
+        self._file.close()
+        os.replace(self.path, destination)
+        self.path = destination
+        return destination
+
+    def discard(self) -> None:
+        """Close the file and delete it if it was never moved."""
+        self._file.close()
+        if self.path.suffix == '.part':
+            self.path.unlink(missing_ok=True)
+
+    def __getattr__(self, name):
+        # read/seek/tell/close etc. go straight to the underlying file
+        return getattr(self._file, name)
+
+
+class StreamingRequest(Request):
+    """Request that writes uploaded files straight to disk.
+
+    Werkzeug's multipart parser hands each file part to the stream returned
+    by ``_get_file_stream`` chunk by chunk, so files are written to
+    ``upload_folder`` and hashed as they arrive instead of being buffered
+    in memory and copied again by ``FileStorage.save``. Oversized bodies are
+    rejected by Flask's ``MAX_CONTENT_LENGTH`` before parsing starts.
+    """
+
+    upload_folder = Path(__file__).parent / 'uploads'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_parts = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        writer = HashingFileWriter(self.upload_folder / f".{uuid.uuid4().hex}.part")
+        self.upload_parts.append(writer)
+        return writer
+
+    def discard_upload_parts(self) -> None:
+        """Delete any partially written or unclaimed upload files."""
+        for writer in self.upload_parts:
+            writer.discard()
@@ -0,0 +1,63 @@
+"""/ready reports busy once every other request thread is in use.
+
+Run with: pytest local/tests   (separately from lambda/tests; both import
+modules of the same names)
+"""
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('QUIZIFY_DB_PATH', os.path.join(tempfile.mkdtemp(), 'quizify.db'))
+
+import app as server  # noqa: E402
+
+
+@pytest.fixture
+def hold_requests(monkeypatch):
+    """Start requests that stay in flight until the test ends."""
+    release = threading.Event()
+    started = threading.Semaphore(0)
+    threads = []
+
+    def slow_health():
+        started.release()
+        release.wait(10)
+        return server.jsonify({'status': 'healthy'})
+
+    monkeypatch.setitem(server.app.view_functions, 'health', slow_health)
+
+    def hold(count):
+        for _ in range(count):
+            thread = threading.Thread(target=lambda: server.app.test_client().get('/health'))
+            thread.start()
+            threads.append(thread)
+            assert started.acquire(timeout=5)
+
+    yield hold
+    release.set()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.skipif(server.SERVER_THREADS < 2, reason='needs a thread besides the /ready request')
+def test_ready_while_another_thread_is_free(hold_requests):
+    hold_requests(server.SERVER_THREADS - 2)
+
+    response = server.app.test_client().get('/ready')
+
+    assert response.status_code == 200
+    assert response.get_json()['requests']['active'] == server.SERVER_THREADS - 2
+
+
+def test_busy_when_other_requests_fill_the_threads(hold_requests):
+    hold_requests(server.SERVER_THREADS - 1)
+
+    response = server.app.test_client().get('/ready')
+
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'busy'
@@ -1,34 +1,141 @@
 """Text extraction from PDF, DOCX, and TXT files."""
+import importlib.util
 import io
+import os
+import signal
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from typing import Optional
 from utils import get_file_extension, clean_text
 
 
+# PDF engine: 'pypdf2' (default), 'pypdf', 'pypdfium2', 'pymupdf', or 'auto'
+# to use the fastest one installed
+PDF_ENGINE = os.environ.get('PDF_ENGINE', 'pypdf2').lower()
+
+# DOCX engine: 'xml' streams word/document.xml directly (falling back to
+# python-docx on failure), 'python-docx' always builds the full Document
+DOCX_ENGINE = os.environ.get('DOCX_ENGINE', 'xml')
+
+# Default extraction time limits in seconds (whole file, single PDF page)
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', '120'))
+PAGE_TIMEOUT = float(os.environ.get('PAGE_TIMEOUT', '10'))
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+
 class TextExtractionError(Exception):
     """Error during text extraction."""
     pass
 
 
-def extract_text(file_path: str = None, file_content: bytes = None, filename: str = None) -> str:
+class ExtractionTimeout(TextExtractionError):
+    """Extraction ran past its time budget."""
+    pass
+
+
+class ExtractionBudget:
+    """Time limits for one extraction.
+
+    PDFs are extracted page by page: a page that runs past ``page_seconds``
+    is skipped, and once the total deadline passes the remaining pages are
+    skipped too. Skipped page numbers (1-based) are kept in
+    ``skipped_pages``. Other file types must finish within the total.
+    """
+
+    def __init__(self, total_seconds: float = EXTRACTION_TIMEOUT, page_seconds: float = PAGE_TIMEOUT):
+        self.deadline = time.monotonic() + total_seconds if total_seconds else None
+        self.page_seconds = page_seconds
+        self.skipped_pages = []
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the total deadline (None if unlimited)."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def page_limit(self) -> Optional[float]:
+        """Seconds the next page may take."""
+        limits = [x for x in (self.remaining(), self.page_seconds) if x is not None]
+        return min(limits) if limits else None
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]):
+    """Raise ExtractionTimeout if the block runs longer than ``seconds``.
+
+    Uses SIGALRM, so it can only interrupt code running on the main thread
+    (as in Lambda); elsewhere the block runs unbounded and callers rely on
+    the checks between pages.
+    """
+    if seconds is not None and seconds <= 0:
+        raise ExtractionTimeout("Extraction time budget exhausted")
+
+    if seconds is None or not hasattr(signal, 'SIGALRM') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise ExtractionTimeout(f"Extraction exceeded {seconds:.1f}s")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def extract_text(
+    file_path: str = None,
+    file_content: bytes = None,
+    filename: str = None,
+    budget: ExtractionBudget = None
+) -> str:
     """Extract text from a file.
 
     Args:
         file_path: Path to local file (optional)
-        file_content: Raw file content as bytes (optional)
+        file_content: Raw file content as bytes or a binary file object (optional)
         filename: Original filename to determine type (required if using file_content)
+        budget: Time limits; skipped PDF pages are recorded on it (optional)
 
     Returns:
         Extracted text as string
     """
     if file_path:
         extension = get_file_extension(file_path)
+        extractor = get_extractor(extension)
+        # Parsers read the open file directly instead of a full in-memory copy
         with open(file_path, 'rb') as f:
-            content = f.read()
+            text = run_extractor(extractor, extension, f, budget)
     elif file_content and filename:
         extension = get_file_extension(filename)
-        content = file_content
+        extractor = get_extractor(extension)
+        text = run_extractor(extractor, extension, file_content, budget)
     else:
         raise TextExtractionError("Must provide either file_path or (file_content and filename)")
 
+    return clean_text(text)
+
+
+def run_extractor(extractor, extension: str, content, budget: ExtractionBudget = None) -> str:
+    """Run an extractor within the budget (PDFs enforce it per page)."""
+    if budget is None:
+        return extractor(content)
+    if extension == 'pdf':
+        return extractor(content, budget=budget)
+    with time_limit(budget.remaining()):
+        return extractor(content)
+
+
+def get_extractor(extension: str):
+    """Get the extractor function for a file extension."""
     extractors = {
         'pdf': extract_from_pdf,
         'docx': extract_from_docx,
@@ -40,40 +147,245 @@ def extract_text(file_path: str = None, file_content: bytes = None, filename: st
     if not extractor:
         raise TextExtractionError(f"Unsupported file type: {extension}. Supported: pdf, docx, txt")
 
-    text = extractor(content)
-    return clean_text(text)
+    return extractor
+
+
+def as_stream(content):
+    """Wrap bytes in a file-like object; binary files are returned as-is."""
+    if isinstance(content, (bytes, bytearray)):
+        return io.BytesIO(content)
+    return content
+
+
+# Each PDF engine yields one zero-argument callable per page that returns
+# the page's text, so a slow page can be timed out and skipped on its own.
+
+def iter_pdf_pages_pypdf2(stream):
+    """Yield page text extractors using PyPDF2."""
+    from PyPDF2 import PdfReader
+
+    for page in PdfReader(stream).pages:
+        yield page.extract_text
+
+
+def iter_pdf_pages_pypdf(stream):
+    """Yield page text extractors using pypdf (PyPDF2's maintained successor)."""
+    from pypdf import PdfReader
+
+    for page in PdfReader(stream).pages:
+        yield page.extract_text
+
+
+def iter_pdf_pages_pypdfium2(stream):
+    """Yield page text extractors using pypdfium2 (PDFium bindings)."""
+    import pypdfium2
 
+    pdf = pypdfium2.PdfDocument(stream)
+
+    def page_text(index):
+        page = pdf[index]
+        text_page = page.get_textpage()
+        try:
+            return text_page.get_text_range()
+        finally:
+            text_page.close()
+            page.close()
 
-def extract_from_pdf(content: bytes) -> str:
-    """Extract text from PDF content."""
     try:
-        from PyPDF2 import PdfReader
+        for index in range(len(pdf)):
+            yield lambda index=index: page_text(index)
+    finally:
+        pdf.close()
+
+
+def iter_pdf_pages_pymupdf(stream):
+    """Yield page text extractors using PyMuPDF (MuPDF bindings)."""
+    import pymupdf
+
+    with pymupdf.open(stream=stream.read(), filetype='pdf') as pdf:
+        for index in range(pdf.page_count):
+            yield lambda index=index: pdf[index].get_text()
+
+
+# name -> (importable module, page iterator)
+PDF_ENGINES = {
+    'pypdf2': ('PyPDF2', iter_pdf_pages_pypdf2),
+    'pypdf': ('pypdf', iter_pdf_pages_pypdf),
+    'pypdfium2': ('pypdfium2', iter_pdf_pages_pypdfium2),
+    'pymupdf': ('pymupdf', iter_pdf_pages_pymupdf),
+}
+
+# Preference order for PDF_ENGINE=auto, fastest first
+PDF_ENGINE_AUTO_ORDER = ['pymupdf', 'pypdfium2', 'pypdf', 'pypdf2']
+
+
+def available_pdf_engines() -> list:
+    """List the PDF engines whose libraries are installed."""
+    return [
+        name for name, (module, _) in PDF_ENGINES.items()
+        if importlib.util.find_spec(module) is not None
+    ]
+
+
+def get_pdf_engine(name: str = None) -> str:
+    """Resolve a PDF engine name ('auto' picks the fastest installed)."""
+    name = (name or PDF_ENGINE).lower()
+
+    if name == 'auto':
+        available = available_pdf_engines()
+        for candidate in PDF_ENGINE_AUTO_ORDER:
+            if candidate in available:
+                return candidate
+        raise TextExtractionError("No PDF library available")
+
+    if name not in PDF_ENGINES:
+        raise TextExtractionError(f"Unknown PDF engine: {name}. Options: auto, {', '.join(PDF_ENGINES)}")
+
+    return name
+
+
+def extract_from_pdf(content, engine: str = None, budget: ExtractionBudget = None) -> str:
+    """Extract text from PDF content (bytes or binary file).
+
+    Args:
+        content: PDF bytes or binary file object
+        engine: PDF engine name (defaults to PDF_ENGINE)
+        budget: Time limits; pages that exceed them are skipped (optional)
+
+    Returns:
+        Extracted text as string
+    """
+    engine = get_pdf_engine(engine)
+    module, iter_pages = PDF_ENGINES[engine]
 
-        reader = PdfReader(io.BytesIO(content))
+    try:
         text_parts = []
 
-        for page in reader.pages:
-            text = page.extract_text()
+        for number, page_text in enumerate(iter_pages(as_stream(content)), start=1):
+            if budget is None:
+                text = page_text()
+            else:
+                try:
+                    with time_limit(budget.page_limit()):
+                        text = page_text()
+                except ExtractionTimeout:
+                    budget.skipped_pages.append(number)
+                    continue
+
             if text:
                 text_parts.append(text)
 
+        if not text_parts and budget is not None and budget.skipped_pages:
+            raise ExtractionTimeout("PDF text extraction timed out before any text was found.")
         if not text_parts:
             raise TextExtractionError("No text could be extracted from PDF. It may be scanned/image-based.")
 
         return '\n\n'.join(text_parts)
 
     except ImportError:
-        raise TextExtractionError("PyPDF2 library not available")
+        raise TextExtractionError(f"{module} library not available")
+    except ExtractionTimeout:
+        raise
     except Exception as e:
         raise TextExtractionError(f"Error extracting PDF text: {str(e)}")
 
 
-def extract_from_docx(content: bytes) -> str:
-    """Extract text from DOCX content."""
+def extract_from_docx(content) -> str:
+    """Extract text from DOCX content (bytes or binary file)."""
+    if DOCX_ENGINE == 'xml':
+        try:
+            return extract_from_docx_xml(content)
+        except ExtractionTimeout:
+            # Out of time: falling back would rerun the document with no limit
+            raise
+        except Exception as e:
+            print(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+            if not isinstance(content, (bytes, bytearray)):
+                content.seek(0)
+
+    return extract_from_docx_python_docx(content)
+
+
+def extract_from_docx_xml(content) -> str:
+    """Extract DOCX text by streaming word/document.xml out of the zip.
+
+    Avoids building python-docx's object graph: the XML is read with an
+    incremental parser and each body element is discarded once handled.
+    Paragraphs and table rows are emitted in document order, and each table
+    cell is read once (python-docx repeats merged cells per grid column).
+    """
+    text_parts = []
+    paragraphs = []  # stack of run-text lists (text boxes nest paragraphs)
+    cells = []  # stack of paragraph-text lists for open table cells
+    rows = []  # stack of cell-text lists for open table rows
+    fallback_depth = 0
+    body = None
+
+    with zipfile.ZipFile(as_stream(content)) as archive:
+        with archive.open('word/document.xml') as xml_file:
+            for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                tag = elem.tag
+
+                if event == 'start':
+                    if tag == MC_FALLBACK:
+                        fallback_depth += 1
+                    elif fallback_depth:
+                        continue
+                    elif tag == W_NS + 'p':
+                        paragraphs.append([])
+                    elif tag == W_NS + 'tc':
+                        cells.append([])
+                    elif tag == W_NS + 'tr':
+                        rows.append([])
+                    elif tag == W_NS + 'body':
+                        body = elem
+                    continue
+
+                if tag == MC_FALLBACK:
+                    # Fallback repeats the text of the preceding Choice
+                    fallback_depth -= 1
+                elif fallback_depth:
+                    pass
+                elif tag == W_NS + 't':
+                    if paragraphs and elem.text:
+                        paragraphs[-1].append(elem.text)
+                elif tag == W_NS + 'tab':
+                    if paragraphs:
+                        paragraphs[-1].append('\t')
+                elif tag in (W_NS + 'br', W_NS + 'cr'):
+                    if paragraphs:
+                        paragraphs[-1].append('\n')
+                elif tag == W_NS + 'p':
+                    text = ''.join(paragraphs.pop())
+                    if cells:
+                        cells[-1].append(text)
+                    elif text.strip():
+                        text_parts.append(text)
+                elif tag == W_NS + 'tc':
+                    cell_text = '\n'.join(cells.pop()).strip()
+                    if rows and cell_text:
+                        rows[-1].append(cell_text)
+                elif tag == W_NS + 'tr':
+                    row_text = rows.pop()
+                    if row_text:
+                        text_parts.append(' | '.join(row_text))
+
+                if body is not None and len(body) and body[0] is elem:
+                    # Finished a top-level block: drop it to keep memory flat
+                    del body[0]
+
+    if not text_parts:
+        raise TextExtractionError("No text could be extracted from document.")
+
+    return '\n\n'.join(text_parts)
+
+
+def extract_from_docx_python_docx(content) -> str:
+    """Extract DOCX text through python-docx's Document model."""
     try:
         from docx import Document
 
-        doc = Document(io.BytesIO(content))
+        doc = Document(as_stream(content))
         text_parts = []
 
         for para in doc.paragraphs:
@@ -94,17 +406,24 @@ def extract_from_docx(content: bytes) -> str:
 
     except ImportError:
         raise TextExtractionError("python-docx library not available")
+    except ExtractionTimeout:
+        raise
     except Exception as e:
         raise TextExtractionError(f"Error extracting DOCX text: {str(e)}")
 
 
-def extract_from_txt(content: bytes) -> str:
-    """Extract text from TXT content."""
+def extract_from_txt(content) -> str:
+    """Extract text from TXT content (bytes or binary file)."""
     try:
+        if not isinstance(content, (bytes, bytearray)):
+            content = content.read()
+
         # Try UTF-8 first, then fall back to latin-1
         try:
             return content.decode('utf-8')
         except UnicodeDecodeError:
             return content.decode('latin-1')
+    except ExtractionTimeout:
+        raise
     except Exception as e:
         raise TextExtractionError(f"Error reading text file: {str(e)}")
@@ -0,0 +1,49 @@
+"""Upload file types and on-disk storage, shared by the server and the CLIs.
+
+Kept free of Flask and server state, so ingest.py and lifecycle.py (and
+their worker processes) can import it cheaply.
+"""
+import gzip
+import os
+import uuid
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).parent
+UPLOAD_FOLDER = BASE_DIR / 'uploads'
+TEXT_FOLDER = BASE_DIR / 'extracted'
+
+ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+
+MAX_QUESTIONS_PER_TYPE = 20
+
+
+def allowed_file(filename):
+    """Check if file extension is allowed."""
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def save_extracted_text(upload_id, text):
+    """Store cleaned extracted text gzip-compressed on disk.
+
+    Written to a temporary file and renamed into place, so readers and
+    concurrent writers never see a partial file.
+    """
+    TEXT_FOLDER.mkdir(exist_ok=True)
+    path = TEXT_FOLDER / f"{upload_id}.txt.gz"
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_extracted_text(upload_id):
+    """Load previously extracted text for an upload, or None if not stored."""
+    text_path = TEXT_FOLDER / f"{upload_id}.txt.gz"
+    if not text_path.exists():
+        return None
+    with gzip.open(text_path, 'rt', encoding='utf-8') as f:
+        return f.read()
@@ -1,4 +1,5 @@
 """Utility functions for Quizify Lambda."""
+import re
 import uuid
 from datetime import datetime, timezone
 
@@ -20,10 +21,14 @@ def get_file_extension(filename: str) -> str:
     return filename.rsplit('.', 1)[-1].lower()
 
 
+def normalize_topic(topic: str) -> str:
+    """Index key for a topic, so "Cell Biology" and "cell-biology " match."""
+    return ' '.join(re.findall(r'\w+', (topic or '').lower())) or 'general'
+
+
 def clean_text(text: str) -> str:
     """Clean extracted text by removing excessive whitespace."""
     # Replace multiple newlines with double newline
-    import re
     text = re.sub(r'\n{3,}', '\n\n', text)
     # Replace multiple spaces with single space
     text = re.sub(r' {2,}', ' ', text)
@@ -0,0 +1,38 @@
+"""WSGI entry point for running the local server in production.
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app the master imports this module once and forks workers from
+it, so the heavy extraction and model libraries imported here are loaded a
+single time and shared copy-on-write instead of per worker and per request.
+"""
+import importlib
+
+from app import app  # noqa: F401
+
+# Imported lazily by text_extractor and question_generator; missing optional
+# engines are skipped
+PRELOAD_MODULES = ('PyPDF2', 'pypdf', 'pypdfium2', 'pymupdf', 'docx', 'google.generativeai')
+
+
+def preload_modules() -> list:
+    """Import the heavy libraries used while processing uploads.
+
+    Only modules are imported: the Gemini client itself is created per call,
+    after the fork, so workers never share its network connections.
+
+    Returns:
+        Names of the modules that were loaded
+    """
+    loaded = []
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except ImportError:
+            pass
+    return loaded
+
+
+preloaded = preload_modules()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark DOCX text extraction engines on large synthetic documents.
+
+Builds DOCX files of increasing size (paragraphs plus tables with
+horizontally and vertically merged cells) and extracts each with the
+streaming XML engine and with python-docx, every run in a fresh process.
+Reports time, peak Python allocations (tracemalloc, measured in a
+separate run so tracing doesn't skew the time), peak RSS growth and the
+characters extracted.
+
+Usage:
+    python scripts/benchmark_docx.py [--paragraphs 20000,100000] [--tables 200]
+"""
+import argparse
+import io
+import multiprocessing
+import resource
+import sys
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambda'))
+
+from text_extractor import extract_from_docx_xml, extract_from_docx_python_docx  # noqa: E402
+
+ENGINES = {
+    'xml': extract_from_docx_xml,
+    'python-docx': extract_from_docx_python_docx
+}
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+SENTENCE = 'Cellular respiration releases energy stored in glucose through glycolysis and the Krebs cycle.'
+
+
+def paragraph(text: str) -> str:
+    """A WordprocessingML paragraph with one run of text."""
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def table(number: int, rows: int = 6, columns: int = 4) -> str:
+    """A table whose first row spans every column and whose first column is merged vertically."""
+    grid = ''.join('<w:gridCol w:w="2000"/>' for _ in range(columns))
+    parts = [f'<w:tbl><w:tblGrid>{grid}</w:tblGrid>']
+    parts.append(
+        f'<w:tr><w:tc><w:tcPr><w:gridSpan w:val="{columns}"/></w:tcPr>'
+        f'{paragraph(f"Table {number}: stages of respiration")}</w:tc></w:tr>'
+    )
+    for row in range(1, rows):
+        merge = '<w:vMerge w:val="restart"/>' if row == 1 else '<w:vMerge/>'
+        cells = [f'<w:tc><w:tcPr>{merge}</w:tcPr>{paragraph("Stage" if row == 1 else "")}</w:tc>']
+        cells += [f'<w:tc>{paragraph(f"r{row}c{column} ATP yield")}</w:tc>' for column in range(1, columns)]
+        parts.append(f'<w:tr>{"".join(cells)}</w:tr>')
+    parts.append('</w:tbl>')
+    return ''.join(parts)
+
+
+def build_docx(paragraphs: int, tables: int) -> bytes:
+    """A DOCX with ``paragraphs`` paragraphs and ``tables`` merged-cell tables spread through them."""
+    every = max(paragraphs // max(tables, 1), 1)
+    body = []
+    for i in range(paragraphs):
+        body.append(paragraph(f'{i + 1}. {SENTENCE}'))
+        if tables and i % every == every - 1 and i // every < tables:
+            body.append(table(i // every + 1))
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W}"><w:body>{"".join(body)}</w:body></w:document>'
+    )
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        archive.writestr('word/document.xml', document)
+    return out.getvalue()
+
+
+def run_engine(engine: str, path: str, trace: bool) -> dict:
+    """Extract one file with one engine (runs in a fresh process)."""
+    extract = ENGINES[engine]
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if trace:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        text = extract(f)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'seconds': elapsed,
+        'rss_mb': max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb, 0) / 1024,
+        'chars': len(text)
+    }
+    if trace:
+        result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paragraphs', default='20000,100000', help='Comma-separated document sizes in paragraphs')
+    parser.add_argument('--tables', type=int, default=200, help='Merged-cell tables per document')
+    parser.add_argument('--workdir', type=Path, default=Path('/tmp/quizify-benchmark-docx'), help='Where to write the files')
+    args = parser.parse_args()
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    context = multiprocessing.get_context('spawn')
+
+    print(f"{'paragraphs':>10} {'file MB':>8} {'engine':<12} {'seconds':>8} {'peak alloc MB':>14} {'RSS MB':>8} {'chars':>10}")
+    for count in (int(n) for n in args.paragraphs.split(',')):
+        path = args.workdir / f'synthetic-{count}.docx'
+        path.write_bytes(build_docx(count, args.tables))
+        size_mb = path.stat().st_size / 1024 / 1024
+
+        for engine in ENGINES:
+            with context.Pool(1) as pool:
+                timed = pool.apply(run_engine, (engine, str(path), False))
+            with context.Pool(1) as pool:
+                traced = pool.apply(run_engine, (engine, str(path), True))
+            print(f"{count:>10} {size_mb:>8.2f} {engine:<12} {timed['seconds']:>8.2f} "
+                  f"{traced['peak_mb']:>14.1f} {timed['rss_mb']:>8.1f} {timed['chars']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Measure short-answer grading throughput.
+
+Grades batches of synthetic answers (each covering a random subset of its
+question's expected points, in shuffled wording) with grading.py and
+reports answers graded per second for each batch size.
+
+Usage:
+    python scripts/benchmark_grading.py [--points 4] [--repeat 5]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'local'))
+from grading import grade_answers  # noqa: E402
+
+WORDS = (
+    'cell membrane protein enzyme energy photosynthesis chlorophyll glucose '
+    'respiration mitochondria nucleus genome mutation evolution selection '
+    'population ecosystem predator climate carbon nitrogen cycle osmosis '
+    'diffusion gradient hormone receptor neuron synapse immune antibody'
+).split()
+
+BATCH_SIZES = (100, 1000, 5000)
+
+
+def make_items(count: int, points_per_question: int, rng: random.Random) -> list:
+    """Answers that mention some of their points, padded with filler words."""
+    items = []
+    for _ in range(count):
+        points = [' '.join(rng.sample(WORDS, 6)) for _ in range(points_per_question)]
+        mentioned = [p.split() for p in points if rng.random() < 0.6]
+        words = [word for point in mentioned for word in point] + rng.sample(WORDS, 10)
+        rng.shuffle(words)
+        items.append({'question_id': None, 'answer': ' '.join(words), 'expected_points': points})
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=4, help='Expected points per question')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per batch size (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'answers':>8} {'best ms':>9} {'answers/s':>10}")
+    for size in BATCH_SIZES:
+        items = make_items(size, args.points, rng)
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            grade_answers(items, {})
+            best = min(best, time.perf_counter() - start)
+        print(f"{size:>8} {best * 1000:>9.1f} {size / best:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
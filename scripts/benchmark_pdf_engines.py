@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark PDF text extraction engines over a corpus of PDFs.
+
+Reports pages/sec, peak memory and text similarity against a reference
+engine, so the fastest engine that doesn't change the text Gemini sees
+can be picked with PDF_ENGINE.
+
+Usage:
+    python scripts/benchmark_pdf_engines.py path/to/pdfs [--engines pypdf2,pymupdf] [--reference pypdf2]
+"""
+import argparse
+import multiprocessing
+import re
+import resource
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambda'))
+
+from text_extractor import PDF_ENGINES, available_pdf_engines  # noqa: E402
+from utils import clean_text  # noqa: E402
+
+
+def run_engine(engine: str, path: str) -> dict:
+    """Extract one file with one engine (runs in a fresh process)."""
+    module, iter_pages = PDF_ENGINES[engine]
+    __import__(module)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        pages = [page_text() or '' for page_text in iter_pages(f)]
+    elapsed = time.perf_counter() - start
+
+    return {
+        'pages': len(pages),
+        'seconds': elapsed,
+        'peak_mb': max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb, 0) / 1024,
+        'text': clean_text('\n\n'.join(pages))
+    }
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-multiset overlap between two texts (1.0 = same words)."""
+    words_a = Counter(re.findall(r'\w+', a.lower()))
+    words_b = Counter(re.findall(r'\w+', b.lower()))
+    total = sum((words_a | words_b).values())
+    return sum((words_a & words_b).values()) / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', type=Path, help='Directory of PDF files (searched recursively)')
+    parser.add_argument('--engines', help='Comma-separated engines (default: all installed)')
+    parser.add_argument('--reference', default='pypdf2', help='Engine whose text is the reference')
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.rglob('*.pdf'))
+    if not files:
+        sys.exit(f"No PDFs found in {args.corpus}")
+
+    engines = args.engines.split(',') if args.engines else available_pdf_engines()
+    if args.reference not in engines:
+        engines.insert(0, args.reference)
+
+    results = {engine: {} for engine in engines}
+    ctx = multiprocessing.get_context('spawn')
+
+    for path in files:
+        for engine in engines:
+            with ctx.Pool(1) as pool:
+                try:
+                    results[engine][path] = pool.apply(run_engine, (engine, str(path)))
+                except Exception as e:
+                    print(f"  {engine} failed on {path.name}: {e}")
+
+    print(f"{len(files)} files, reference engine: {args.reference}\n")
+    print(f"{'engine':<10} {'files':>5} {'pages':>7} {'pages/sec':>10} {'peak MB':>8} {'similarity':>10}")
+
+    reference = results[args.reference]
+    for engine in engines:
+        runs = results[engine]
+        if not runs:
+            print(f"{engine:<10} {'0':>5}")
+            continue
+
+        pages = sum(r['pages'] for r in runs.values())
+        seconds = sum(r['seconds'] for r in runs.values())
+        peak = max(r['peak_mb'] for r in runs.values())
+        scores = [similarity(r['text'], reference[p]['text']) for p, r in runs.items() if p in reference]
+        score = sum(scores) / len(scores) if scores else float('nan')
+
+        print(f"{engine:<10} {len(runs):>5} {pages:>7} {pages / seconds if seconds else 0:>10.1f} {peak:>8.1f} {score:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
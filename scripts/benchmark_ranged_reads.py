@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Measure ranged S3 reads of PDFs against downloading the whole object.
+
+Builds a synthetic multi-page PDF (text plus an embedded image per page),
+stores it in a moto S3 stand-in, and for counting pages and extracting
+text compares reading it through S3ObjectReader with a full get_object:
+bytes fetched against object size, GET requests and time.
+
+moto serves requests in-process, so times leave out network latency; the
+bytes and request counts are what ranged reads change on Lambda.
+
+Usage:
+    python scripts/benchmark_ranged_reads.py [--pages 300] [--image-kb 64]   # needs: pip install moto
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambda'))
+
+BUCKET = 'quizify-benchmark-uploads'
+KEY = 'uploads/benchmark/synthetic.pdf'
+
+
+def build_pdf(pages: int, image_kb: int) -> bytes:
+    """A PDF with a line of text and an uncompressible image on every page."""
+    objects = {
+        1: b'<< /Type /Catalog /Pages 2 0 R >>',
+        3: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    }
+    kids = []
+    for page in range(pages):
+        page_id, content_id, image_id = 4 + page * 3, 5 + page * 3, 6 + page * 3
+        kids.append(f'{page_id} 0 R')
+        text = f'BT /F1 12 Tf 72 720 Td (Page {page + 1}: photosynthesis converts light into chemical energy.) Tj ET'
+        content = zlib.compress(text.encode())
+        objects[content_id] = (
+            f'<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n'.encode() + content + b'\nendstream'
+        )
+        image = os.urandom(image_kb * 1024)
+        objects[image_id] = (
+            f'<< /Type /XObject /Subtype /Image /Width {image_kb * 32} /Height 32 '
+            f'/ColorSpace /DeviceGray /BitsPerComponent 8 /Length {len(image)} >>\nstream\n'.encode()
+            + image + b'\nendstream'
+        )
+        objects[page_id] = (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R '
+            f'/Resources << /Font << /F1 3 0 R >> /XObject << /Im1 {image_id} 0 R >> >> >>'
+        ).encode()
+    objects[2] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {pages} >>'.encode()
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = out.tell()
+        out.write(f'{number} 0 obj\n'.encode() + objects[number] + b'\nendobj\n')
+
+    xref = out.tell()
+    count = max(objects) + 1
+    out.write(f'xref\n0 {count}\n0000000000 65535 f \n'.encode())
+    for number in range(1, count):
+        out.write(f'{offsets[number]:010d} 00000 n \n'.encode())
+    out.write(f'trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+    return out.getvalue()
+
+
+def measure(task, open_source, repeat: int) -> dict:
+    """Best time of ``task(open_source())`` and the fetch stats of that run."""
+    best = None
+    for _ in range(repeat):
+        source, stats = open_source()
+        start = time.perf_counter()
+        task(source)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best['seconds']:
+            best = {'seconds': elapsed, **stats(source)}
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=300, help='Pages in the synthetic PDF')
+    parser.add_argument('--image-kb', type=int, default=64, help='Image size per page (KB)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (best is reported)')
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+    try:
+        from moto import mock_aws
+    except ImportError:
+        sys.exit("moto is required: pip install moto")
+
+    with mock_aws():
+        # Imported inside the mock so their boto3 clients talk to it
+        import boto3
+        from s3_client import open_object
+        from scheduling import pdf_page_count
+        from text_extractor import extract_text
+
+        body = build_pdf(args.pages, args.image_kb)
+        s3 = boto3.client('s3')
+        s3.create_bucket(Bucket=BUCKET)
+        s3.put_object(Bucket=BUCKET, Key=KEY, Body=body)
+        size = len(body)
+
+        def ranged():
+            return open_object(BUCKET, KEY, size=size), lambda f: f.raw.stats()
+
+        def full():
+            # The download is part of what each full-object run costs
+            start = time.perf_counter()
+            data = s3.get_object(Bucket=BUCKET, Key=KEY)['Body'].read()
+            download = time.perf_counter() - start
+            return io.BytesIO(data), lambda f: {'bytes_fetched': size, 'requests': 1, 'download_seconds': download}
+
+        def extract(source):
+            extract_text(file_content=source, filename='synthetic.pdf')
+
+        cases = [
+            ('page count', pdf_page_count),
+            ('extract text', extract)
+        ]
+
+        print(f"{args.pages}-page PDF, {size / 1024 / 1024:.1f} MB\n")
+        print(f"{'task':<14} {'read':<8} {'fetched MB':>10} {'of object':>10} {'requests':>9} {'ms':>9}")
+        for name, task in cases:
+            for label, opener in (('ranged', ranged), ('full', full)):
+                result = measure(task, opener, args.repeat)
+                seconds = result['seconds'] + result.get('download_seconds', 0)
+                print(f"{name:<14} {label:<8} {result['bytes_fetched'] / 1024 / 1024:>10.2f} "
+                      f"{result['bytes_fetched'] / size:>10.1%} {result['requests']:>9} {seconds * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Simulate upload scheduling policies under a mixed workload.
+
+Jobs arrive at random (mostly short handouts, some chapters, a few
+textbooks) and are served by a fixed number of workers. Each policy orders
+the waiting jobs with the scheduler's own JobQueue, using the cost estimate
+from scheduling.py while actual run times vary around it. Reports mean and
+p95 completion time (queueing plus processing) per job size.
+
+Usage:
+    python scripts/benchmark_scheduling.py [--jobs 5000] [--workers 4] [--load 0.85]
+"""
+import argparse
+import heapq
+import math
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'local'))
+import scheduling  # noqa: E402
+from scheduling import JobQueue, estimate_cost  # noqa: E402
+
+# (name, share of jobs, page range)
+WORKLOAD = [
+    ('handout', 0.80, (1, 3)),
+    ('chapter', 0.15, (20, 60)),
+    ('textbook', 0.05, (200, 400))
+]
+
+# name -> (use estimated cost, aging rate)
+POLICIES = {
+    'FIFO': (False, 1.0),
+    'SJF (no aging)': (True, 0.0),
+    'SJF + aging': (True, scheduling.AGING_RATE)
+}
+
+
+def make_jobs(count: int, workers: int, load: float, seed: int) -> list:
+    """Random jobs with arrival times giving the requested utilisation."""
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        name, _, (low, high) = rng.choices(WORKLOAD, weights=[w[1] for w in WORKLOAD])[0]
+        pages = rng.randint(low, high)
+        estimate = estimate_cost(pages * 60 * 1024, 'pdf', pages)
+        # Actual run times are within about 2x of the estimate either way
+        jobs.append({'kind': name, 'estimate': estimate, 'service': estimate * rng.lognormvariate(0, 0.35)})
+
+    mean_service = statistics.mean(job['service'] for job in jobs)
+    rate = load * workers / mean_service
+    now = 0.0
+    for job in jobs:
+        now += rng.expovariate(rate)
+        job['arrival'] = now
+    return jobs
+
+
+def simulate(jobs: list, workers: int, use_cost: bool, aging_rate: float) -> None:
+    """Run the jobs through a JobQueue, setting each job's start and finish."""
+    scheduling.AGING_RATE = aging_rate
+    queue = JobQueue()
+    running = []
+    free = workers
+    index = 0
+
+    while index < len(jobs) or len(queue) or running:
+        next_arrival = jobs[index]['arrival'] if index < len(jobs) else math.inf
+        if running and running[0] < next_arrival:
+            now = heapq.heappop(running)
+            free += 1
+        else:
+            now = next_arrival
+            job = jobs[index]
+            queue.push(job, job['estimate'] if use_cost else 0.0, now=now)
+            index += 1
+
+        while free and len(queue):
+            job = queue.pop(now=now)
+            job['start'] = now
+            job['finish'] = now + job['service']
+            heapq.heappush(running, job['finish'])
+            free -= 1
+
+
+def summarise(jobs: list) -> dict:
+    """Mean and p95 completion time, and max wait, overall and per job kind."""
+    groups = {'all': jobs}
+    for name, _, _ in WORKLOAD:
+        groups[name] = [job for job in jobs if job['kind'] == name]
+
+    summary = {}
+    for name, group in groups.items():
+        times = sorted(job['finish'] - job['arrival'] for job in group)
+        summary[name] = (
+            statistics.mean(times),
+            times[min(len(times) - 1, int(len(times) * 0.95))],
+            max(job['start'] - job['arrival'] for job in group)
+        )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=5000, help='Number of simulated uploads')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent processing slots')
+    parser.add_argument('--load', type=float, default=0.85, help='Target utilisation (0-1)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    print(f"{args.jobs} jobs, {args.workers} workers, {args.load:.0%} load\n")
+    print(f"{'policy':<16} {'jobs':<9} {'mean s':>8} {'p95 s':>8} {'max wait s':>11}")
+
+    for policy, (use_cost, aging_rate) in POLICIES.items():
+        jobs = make_jobs(args.jobs, args.workers, args.load, args.seed)
+        simulate(jobs, args.workers, use_cost, aging_rate)
+        for name, (mean, p95, max_wait) in summarise(jobs).items():
+            print(f"{policy:<16} {name:<9} {mean:>8.1f} {p95:>8.1f} {max_wait:>11.1f}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
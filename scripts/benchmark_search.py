@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark question search: the FTS5 index versus a LIKE scan.
+
+Fills a temporary database with synthetic questions, then times the same
+queries both ways (first page of 20 results plus the total match count).
+
+Usage:
+    python scripts/benchmark_search.py [--questions 100000] [--repeat 5]
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+QUERIES = ['photosynthesis', 'bayes theorem', 'mitochondria energy', 'market equilibrium', 'zzzz']
+
+TOPIC_WORDS = [
+    'photosynthesis', 'chlorophyll', 'mitochondria', 'energy', 'bayes', 'theorem',
+    'probability', 'market', 'equilibrium', 'demand', 'supply', 'enzyme', 'protein',
+    'vector', 'matrix', 'derivative', 'integral', 'revolution', 'treaty', 'empire'
+]
+
+
+def make_vocabulary(size: int) -> list:
+    """Random lowercase words, with the topic words queries hit fairly common."""
+    rng = random.Random(1)
+    letters = 'abcdefghijklmnopqrstuvwxy'
+    words = sorted({''.join(rng.choices(letters, k=rng.randint(3, 10))) for _ in range(size)})
+    return words[:200] + TOPIC_WORDS + words[200:]
+
+
+def populate(count: int, database, per_upload: int = 100) -> None:
+    """Write synthetic questions through the normal bulk save path."""
+    rng = random.Random(2)
+    vocabulary = make_vocabulary(20000)
+    # Zipf-like weights so some words are common and most are rare
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+    def sentence(n):
+        return ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=n))
+
+    batch = []
+    for upload in range(count // per_upload):
+        batch.append({
+            'upload_id': f'bench-{upload}',
+            'filename': f'notes-{upload}.pdf',
+            'status': 'completed',
+            'questions_data': {
+                'topic': 'Benchmark',
+                'mcqs': [{
+                    'question': sentence(14) + '?',
+                    'options': [f'{letter}) {sentence(4)}' for letter in 'ABCD'],
+                    'correct_answer': 'A',
+                    'explanation': sentence(20)
+                } for _ in range(per_upload // 2)],
+                'short_questions': [{
+                    'question': sentence(12) + '?',
+                    'expected_points': [sentence(6) for _ in range(3)]
+                } for _ in range(per_upload - per_upload // 2)]
+            }
+        })
+        if len(batch) == 50:
+            database.save_upload_results(batch)
+            batch = []
+    if batch:
+        database.save_upload_results(batch)
+
+
+def like_search(db_path, text: str, limit: int = 20):
+    """The pre-index approach: substring match on every column of every row."""
+    words = text.lower().split()
+    clause = ' AND '.join(
+        '(question LIKE ? OR options LIKE ? OR explanation LIKE ? OR expected_points LIKE ?)' for _ in words
+    )
+    params = [f'%{word}%' for word in words for _ in range(4)]
+
+    conn = sqlite3.connect(db_path)
+    total = conn.execute(f'SELECT count(*) FROM questions WHERE {clause}', params).fetchone()[0]
+    rows = conn.execute(f'SELECT * FROM questions WHERE {clause} LIMIT ?', params + [limit]).fetchall()
+    conn.close()
+    return rows, total
+
+
+def timed(fn, repeat: int) -> tuple:
+    """Median latency in ms over repeat runs, and the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=100000, help='Number of synthetic questions')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query (median is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['QUIZIFY_DB_PATH'] = str(Path(tmp) / 'bench.db')
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'local'))
+        import database  # noqa: E402  (reads QUIZIFY_DB_PATH on import)
+
+        start = time.perf_counter()
+        populate(args.questions, database)
+        print(f"Inserted {args.questions} questions in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(database.DB_PATH) / 1e6:.0f} MB database)\n")
+
+        print(f"{'query':<22} {'matches':>8} {'FTS5 ms':>9} {'LIKE ms':>9} {'speedup':>8}")
+        for query in QUERIES:
+            fts_ms, (_, fts_total) = timed(lambda: database.search_questions(query), args.repeat)
+            like_ms, (_, like_total) = timed(lambda: like_search(database.DB_PATH, query), args.repeat)
+            # LIKE also matches substrings of longer words, so counts can differ
+            print(f"{query:<22} {fts_total:>8} {fts_ms:>9.2f} {like_ms:>9.2f} {like_ms / fts_ms:>7.0f}x"
+                  f"{'' if fts_total == like_total else f'  (LIKE: {like_total})'}")
+
+
+if __name__ == '__main__':
+    main()
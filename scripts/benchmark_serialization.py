@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Measure JSON encode time and response sizes for question payloads.
+
+Builds GET /questions-style payloads as DynamoDB returns them (every
+number a Decimal) and, for each size, compares encoding with orjson and
+with json.dumps(default=...), then reports the raw body size and its
+gzip and brotli sizes against COMPRESSION_MIN_BYTES, below which
+responses are sent uncompressed.
+
+Usage:
+    python scripts/benchmark_serialization.py [--repeat 200]   # orjson and brotli are optional
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambda'))
+import serialization  # noqa: E402
+from serialization import COMPRESSION_MIN_BYTES, json_default  # noqa: E402
+
+QUESTION_COUNTS = (1, 10, 50, 200, 1000)
+
+WORDS = (
+    'cell membrane protein enzyme energy photosynthesis chlorophyll glucose '
+    'respiration mitochondria nucleus genome mutation evolution selection '
+    'population ecosystem predator climate carbon nitrogen cycle osmosis'
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """A random sentence of ``words`` biology words."""
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def make_payload(count: int, rng: random.Random) -> dict:
+    """A questions response with ``count`` questions, numbers as Decimal."""
+    questions = []
+    for i in range(count):
+        question = {
+            'question_id': f'{i:08x}-0000-4000-8000-000000000000',
+            'upload_id': '00000000-0000-4000-8000-000000000000',
+            'question': sentence(rng, 14),
+            'topic': 'Cell Biology',
+            'created_at': '2026-01-01T00:00:00',
+            'expires_at': Decimal(1798761600),
+            'position': Decimal(i),
+            'score': Decimal('0.875'),
+        }
+        if i % 2:
+            question.update(type='SHORT', difficulty='medium',
+                            expected_points=[sentence(rng, 8) for _ in range(3)])
+        else:
+            question.update(type='MCQ', correct_answer='B', explanation=sentence(rng, 20),
+                            options=[f'{letter}) {sentence(rng, 5)}' for letter in 'ABCD'])
+        questions.append(question)
+    return {'upload_id': '00000000-0000-4000-8000-000000000000', 'status': 'completed',
+            'questions': questions, 'total_questions': Decimal(count)}
+
+
+def stdlib_dumps(data) -> bytes:
+    """serialization.dumps without orjson."""
+    return json.dumps(data, default=json_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def orjson_dumps(data) -> bytes:
+    """serialization.dumps with orjson."""
+    return serialization.orjson.dumps(data, default=json_default, option=serialization.orjson.OPT_NON_STR_KEYS)
+
+
+def best_time(function, data, repeat: int) -> float:
+    """Best of ``repeat`` calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='Timed encodes per payload (best is reported)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    args = parser.parse_args()
+
+    encoders = {'json': stdlib_dumps}
+    if serialization.orjson is not None:
+        encoders['orjson'] = orjson_dumps
+    else:
+        print("orjson not installed; timing json.dumps only")
+    if serialization.brotli is None:
+        print("brotli not installed; brotli sizes not reported")
+
+    rng = random.Random(args.seed)
+    print(f"Compression threshold: {COMPRESSION_MIN_BYTES} bytes\n")
+    print(f"{'questions':>9} " + ' '.join(f"{name + ' us':>10}" for name in encoders)
+          + f" {'raw B':>9} {'gzip B':>9} {'br B':>9} {'sent as':>8}")
+
+    for count in QUESTION_COUNTS:
+        data = make_payload(count, rng)
+        body = stdlib_dumps(data)
+        if 'orjson' in encoders and orjson_dumps(data) != body:
+            print(f"warning: orjson and json output differ for {count} questions")
+
+        times = [best_time(encode, data, args.repeat) * 1e6 for encode in encoders.values()]
+        gzip_size = len(gzip.compress(body, compresslevel=6))
+        br_size = len(serialization.brotli.compress(body, quality=5)) if serialization.brotli else None
+        _, sent_as = serialization.compress(body, 'br, gzip')
+
+        print(f"{count:>9} " + ' '.join(f"{t:>10.1f}" for t in times)
+              + f" {len(body):>9} {gzip_size:>9} {br_size if br_size is not None else '-':>9} {sent_as or 'raw':>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""Load-test the Flask and Lambda APIs through their real routes.
+
+Question generation is replaced by a deterministic stub with a fixed delay,
+so the numbers measure routing, persistence and serialization rather than
+the model. Targets:
+
+    local   the Flask app on a threaded WSGI server in this process, driven
+            over HTTP, with a throwaway database and upload folders
+    lambda  handler.lambda_handler called with synthetic API Gateway and S3
+            events, against DynamoDB and S3 mocked by moto (pip install moto)
+
+Routes: upload (POST /upload locally, an S3 upload event on Lambda),
+questions (GET /questions/<id>), uploads (GET /uploads) and health
+(GET /health), mixed by --mix weights.
+
+With --rate, requests arrive at that average rate (Poisson) however fast
+responses come back, and latency is measured from each request's scheduled
+start, so queueing shows up in the numbers. With --rate 0, each of the
+--concurrency workers sends its next request as soon as the last returns.
+
+Usage:
+    python scripts/load_test.py local --concurrency 16 --rate 200 --duration 30
+    python scripts/load_test.py lambda --requests 2000 --mix upload=1,questions=5,uploads=2,health=2
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ROUTES = ('upload', 'questions', 'uploads', 'health')
+DEFAULT_MIX = 'upload=1,questions=5,uploads=2,health=2'
+
+# Uploads made before timing starts, so questions requests have targets
+SEED_UPLOADS = 5
+
+WORDS = (
+    'cell membrane protein enzyme energy photosynthesis chlorophyll glucose '
+    'respiration mitochondria nucleus genome mutation evolution selection '
+    'population ecosystem predator climate carbon nitrogen cycle osmosis '
+    'diffusion gradient hormone receptor neuron synapse immune antibody '
+    'virus bacteria membrane transport vesicle ribosome translation'
+).split()
+
+
+def make_document(seed: int) -> bytes:
+    """Unique lecture-notes text, so uploads aren't deduplicated by content."""
+    rng = random.Random(seed)
+    sentences = [' '.join(rng.sample(WORDS, 12)).capitalize() + '.' for _ in range(20)]
+    return f"Lecture notes {seed}. {' '.join(sentences)}".encode('utf-8')
+
+
+def make_stub_generator(latency: float):
+    """Deterministic stand-in for generate_questions that sleeps ``latency`` seconds."""
+
+    def generate_questions(text, num_mcqs=5, num_short=5, topic=None):
+        time.sleep(latency)
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+        def question(kind, index):
+            rng = random.Random(f'{digest}:{kind}:{index}')
+            return ' '.join(rng.sample(WORDS, 8)).capitalize() + '?'
+
+        return {
+            'topic': topic or 'Biology',
+            'mcqs': [{
+                'question': question('mcq', i),
+                'options': ['A) ' + WORDS[i], 'B) ' + WORDS[i + 1], 'C) ' + WORDS[i + 2], 'D) ' + WORDS[i + 3]],
+                'correct_answer': 'A',
+                'explanation': question('explanation', i)
+            } for i in range(num_mcqs)],
+            'short_questions': [{
+                'question': question('short', i),
+                'expected_points': [question('point', i * 3 + j) for j in range(3)],
+                'difficulty': 'medium'
+            } for i in range(num_short)]
+        }
+
+    return generate_questions
+
+
+class LocalTarget:
+    """The Flask app served over HTTP on an ephemeral port."""
+
+    def __init__(self, workdir: Path, model_latency: float):
+        os.environ['QUIZIFY_DB_PATH'] = str(workdir / 'loadtest.db')
+        sys.path.insert(0, str(ROOT / 'local'))
+        import app as app_module  # noqa: E402  (reads QUIZIFY_DB_PATH on import)
+        import uploads
+        from streaming import StreamingRequest
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        for name in ('uploads', 'extracted'):
+            (workdir / name).mkdir()
+        app_module.UPLOAD_FOLDER = uploads.UPLOAD_FOLDER = StreamingRequest.upload_folder = workdir / 'uploads'
+        uploads.TEXT_FOLDER = workdir / 'extracted'
+        app_module.generate_questions = make_stub_generator(model_latency)
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        self.server = make_server('127.0.0.1', 0, app_module.app, threaded=True, request_handler=QuietHandler)
+        self.port = self.server.server_port
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _send(self, method: str, path: str, body: bytes = None, headers: dict = None):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=120)
+        try:
+            connection.request(method, path, body=body, headers=dict(headers or {}, **{'Accept-Encoding': 'gzip'}))
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def upload(self, seed: int):
+        boundary = uuid.uuid4().hex
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="notes-{seed}.txt"\r\n'
+            f'Content-Type: text/plain\r\n\r\n'
+        ).encode('utf-8') + make_document(seed) + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        status, data = self._send('POST', '/upload', body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+        upload_id = json.loads(data).get('upload_id') if status == 200 else None
+        return status, upload_id
+
+    def questions(self, upload_id: str):
+        return self._send('GET', f'/questions/{upload_id}')[0]
+
+    def uploads(self):
+        return self._send('GET', '/uploads')[0]
+
+    def health(self):
+        return self._send('GET', '/health')[0]
+
+    def close(self):
+        self.server.shutdown()
+
+
+class LambdaTarget:
+    """handler.lambda_handler against moto-mocked DynamoDB and S3."""
+
+    BUCKET = 'quizify-loadtest-uploads'
+
+    def __init__(self, workdir: Path, model_latency: float):
+        try:
+            from moto import mock_aws
+        except ImportError:
+            sys.exit("The lambda target needs moto: pip install moto")
+
+        os.environ.update(
+            AWS_DEFAULT_REGION='us-east-1', AWS_ACCESS_KEY_ID='loadtest', AWS_SECRET_ACCESS_KEY='loadtest',
+            UPLOADS_BUCKET=self.BUCKET
+        )
+        for name in ('PROCESSING_QUEUE_URL', 'LARGE_JOB_QUEUE_URL'):
+            os.environ.pop(name, None)
+
+        self.mock = mock_aws()
+        self.mock.start()
+
+        import boto3
+        self.s3 = boto3.client('s3')
+        self.s3.create_bucket(Bucket=self.BUCKET)
+        self._create_tables(boto3.client('dynamodb'))
+
+        sys.path.insert(0, str(ROOT / 'lambda'))
+        import handler  # noqa: E402  (reads table names and bucket on import)
+        handler.generate_questions = make_stub_generator(model_latency)
+        self.handler = handler
+
+    @staticmethod
+    def _create_tables(dynamodb):
+        """Tables as defined in terraform/dynamodb.tf."""
+        def create(name, hash_key, attributes=(), indexes=()):
+            dynamodb.create_table(
+                TableName=f'quizify-dev-{name}',
+                BillingMode='PAY_PER_REQUEST',
+                KeySchema=[{'AttributeName': hash_key, 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': a, 'AttributeType': 'S'} for a in (hash_key, *attributes)],
+                **({'GlobalSecondaryIndexes': list(indexes)} if indexes else {})
+            )
+
+        def index(name, hash_key, range_key=None, projection='ALL'):
+            keys = [{'AttributeName': hash_key, 'KeyType': 'HASH'}]
+            if range_key:
+                keys.append({'AttributeName': range_key, 'KeyType': 'RANGE'})
+            return {'IndexName': name, 'KeySchema': keys, 'Projection': {'ProjectionType': projection}}
+
+        create('questions', 'question_id', ('upload_id', 'created_at', 'topic_key', 'type_difficulty'), [
+            index('upload_id-created_at-index', 'upload_id', 'created_at'),
+            index('topic_key-type_difficulty-index', 'topic_key', 'type_difficulty', 'KEYS_ONLY')
+        ])
+        create('uploads', 'upload_id', ('created_at', 'archive_day'), [
+            index('created_at-index', 'created_at'),
+            index('archive_day-index', 'archive_day', projection='KEYS_ONLY')
+        ])
+        create('content-hashes', 'content_hash')
+        create('batches', 'batch_id')
+
+    def _api(self, path: str, path_parameters: dict = None):
+        event = {
+            'requestContext': {'http': {'method': 'GET'}},
+            'rawPath': path,
+            'pathParameters': path_parameters,
+            'headers': {'accept-encoding': 'gzip'}
+        }
+        return self.handler.lambda_handler(event, LambdaContext())['statusCode']
+
+    def upload(self, seed: int):
+        upload_id = str(uuid.uuid4())
+        key = f'uploads/{upload_id}/notes-{seed}.txt'
+        body = make_document(seed)
+        response = self.s3.put_object(Bucket=self.BUCKET, Key=key, Body=body)
+        event = {'Records': [{
+            'eventSource': 'aws:s3',
+            's3': {
+                'bucket': {'name': self.BUCKET},
+                'object': {'key': key, 'size': len(body), 'eTag': response['ETag'].strip('"')}
+            }
+        }]}
+        status = self.handler.lambda_handler(event, LambdaContext()).get('statusCode', 200)
+        return status, upload_id if status == 200 else None
+
+    def questions(self, upload_id: str):
+        return self._api(f'/questions/{upload_id}', {'upload_id': upload_id})
+
+    def uploads(self):
+        return self._api('/uploads')
+
+    def health(self):
+        return self._api('/health')
+
+    def close(self):
+        self.mock.stop()
+
+
+class LambdaContext:
+    """Minimal stand-in for the Lambda context object."""
+
+    def __init__(self):
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.monotonic() + 300
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int((self._deadline - time.monotonic()) * 1000)
+
+
+class LoadTest:
+    """Sends a weighted mix of route requests and records each outcome."""
+
+    def __init__(self, target, mix: dict, seed: int):
+        self.target = target
+        self.routes = list(mix)
+        self.weights = [mix[route] for route in self.routes]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.upload_ids = []
+        self.next_document = 0
+        self.results = {route: [] for route in ROUTES}
+
+    def _document_seed(self) -> int:
+        with self.lock:
+            self.next_document += 1
+            return self.next_document
+
+    def seed_uploads(self, count: int) -> None:
+        for _ in range(count):
+            status, upload_id = self.target.upload(self._document_seed())
+            if upload_id:
+                self.upload_ids.append(upload_id)
+        if not self.upload_ids:
+            sys.exit("Could not create seed uploads; is the target working?")
+
+    def pick_route(self) -> str:
+        with self.lock:
+            return self.rng.choices(self.routes, weights=self.weights)[0]
+
+    def send(self, route: str, scheduled: float) -> None:
+        """Send one request and record (latency ms, status); status 0 is an exception."""
+        try:
+            if route == 'upload':
+                status, upload_id = self.target.upload(self._document_seed())
+                if upload_id:
+                    with self.lock:
+                        self.upload_ids.append(upload_id)
+            elif route == 'questions':
+                with self.lock:
+                    upload_id = self.rng.choice(self.upload_ids)
+                status = self.target.questions(upload_id)
+            else:
+                status = getattr(self.target, route)()
+        except Exception as e:
+            print(f"{route} request failed: {e}", file=sys.stderr)
+            status = 0
+
+        latency = (time.perf_counter() - scheduled) * 1000
+        with self.lock:
+            self.results[route].append((latency, status))
+
+    def run_open(self, rate: float, concurrency: int, duration: float, max_requests: int) -> float:
+        """Poisson arrivals at ``rate`` per second; returns elapsed seconds."""
+        start = time.perf_counter()
+        scheduled = start
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(max_requests):
+                scheduled += self.rng.expovariate(rate)
+                if scheduled - start > duration:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, self.pick_route(), scheduled)
+        return time.perf_counter() - start
+
+    def run_closed(self, concurrency: int, duration: float, max_requests: int) -> float:
+        """``concurrency`` workers sending back to back; returns elapsed seconds."""
+        start = time.perf_counter()
+        remaining = [max_requests]
+
+        def worker():
+            while time.perf_counter() - start < duration:
+                with self.lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                self.send(self.pick_route(), time.perf_counter())
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(int(round(p / 100 * len(values))) - 1, 0))]
+
+
+def summarise(results: dict, elapsed: float) -> dict:
+    """Per-route throughput, latency percentiles and error rate."""
+    summary = {}
+    for route, samples in list(results.items()) + [('all', [s for v in results.values() for s in v])]:
+        if not samples:
+            continue
+        latencies = sorted(latency for latency, _ in samples)
+        statuses = {}
+        for _, status in samples:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        errors = sum(count for status, count in statuses.items() if status == '0' or int(status) >= 400)
+        summary[route] = {
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50), 1),
+            'p95_ms': round(percentile(latencies, 95), 1),
+            'p99_ms': round(percentile(latencies, 99), 1),
+            'max_ms': round(latencies[-1], 1),
+            'error_rate': round(errors / len(samples), 4),
+            'statuses': statuses
+        }
+    return summary
+
+
+def parse_mix(text: str) -> dict:
+    """Parse route=weight pairs, e.g. 'upload=1,questions=5'."""
+    mix = {}
+    for part in text.split(','):
+        route, _, weight = part.partition('=')
+        route = route.strip()
+        if route not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown route '{route}' (routes: {', '.join(ROUTES)})")
+        try:
+            mix[route] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"weight for '{route}' must be a number")
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("at least one route needs a positive weight")
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('target', choices=('local', 'lambda'), help='API to drive')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at most')
+    parser.add_argument('--rate', type=float, default=0, help='Arrivals per second (0 = closed loop)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds to send requests for')
+    parser.add_argument('--requests', type=int, default=10 ** 9, help='Stop after this many requests')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f'Route weights (default {DEFAULT_MIX})')
+    parser.add_argument('--model-latency', type=float, default=0.0, help='Seconds the stubbed model takes per call')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--json', type=Path, help='Also write the summary to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull:
+        # The servers log every request to stdout
+        with redirect_stdout(devnull):
+            target = (LocalTarget if args.target == 'local' else LambdaTarget)(Path(tmp), args.model_latency)
+            test = LoadTest(target, args.mix, args.seed)
+            test.seed_uploads(SEED_UPLOADS)
+
+            if args.rate > 0:
+                elapsed = test.run_open(args.rate, max(args.concurrency, 1), args.duration, args.requests)
+            else:
+                elapsed = test.run_closed(max(args.concurrency, 1), args.duration, args.requests)
+            target.close()
+
+    summary = summarise(test.results, elapsed)
+    mode = f"{args.rate:g}/s arrivals" if args.rate > 0 else "closed loop"
+    print(f"{args.target}: {mode}, concurrency {args.concurrency}, {elapsed:.1f}s\n")
+    print(f"{'route':<10} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}  statuses")
+    for route, row in summary.items():
+        print(f"{route:<10} {row['requests']:>8} {row['throughput_rps']:>8.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} {row['error_rate']:>7.1%}  "
+              f"{' '.join(f'{status}:{count}' for status, count in sorted(row['statuses'].items()))}")
+
+    if args.json:
+        args.json.write_text(json.dumps({'target': args.target, 'args': {
+            'concurrency': args.concurrency, 'rate': args.rate, 'duration': args.duration,
+            'mix': args.mix, 'model_latency': args.model_latency
+        }, 'elapsed_seconds': round(elapsed, 2), 'routes': summary}, indent=2))
+
+    sys.exit(1 if summary.get('all', {}).get('error_rate', 1) > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,10 +4,11 @@ resource "aws_apigatewayv2_api" "main" {
   protocol_type = "HTTP"
 
   cors_configuration {
-    allow_origins = ["*"] # Restrict in production
-    allow_methods = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
-    allow_headers = ["Content-Type", "Authorization", "X-Requested-With"]
-    max_age       = 300
+    allow_origins  = ["*"] # Restrict in production
+    allow_methods  = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+    allow_headers  = ["Content-Type", "Authorization", "X-Requested-With", "If-None-Match"]
+    expose_headers = ["X-Next-Cursor", "ETag", "Retry-After"]
+    max_age        = 300
   }
 }
 
@@ -46,6 +47,27 @@ resource "aws_apigatewayv2_route" "presigned_url" {
   target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
 }
 
+# Route: POST /multipart-upload (initiate)
+resource "aws_apigatewayv2_route" "multipart_create" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /multipart-upload"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: POST /multipart-upload/complete
+resource "aws_apigatewayv2_route" "multipart_complete" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /multipart-upload/complete"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: POST /multipart-upload/abort
+resource "aws_apigatewayv2_route" "multipart_abort" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /multipart-upload/abort"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
 # Route: GET /questions/{upload_id}
 resource "aws_apigatewayv2_route" "get_questions" {
   api_id    = aws_apigatewayv2_api.main.id
@@ -60,6 +82,62 @@ resource "aws_apigatewayv2_route" "list_uploads" {
   target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
 }
 
+# Route: POST /uploads/{upload_id}/regenerate
+resource "aws_apigatewayv2_route" "regenerate" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /uploads/{upload_id}/regenerate"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: POST /uploads/{upload_id}/restore
+resource "aws_apigatewayv2_route" "restore" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /uploads/{upload_id}/restore"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: POST /uploads/batch
+resource "aws_apigatewayv2_route" "create_batch" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /uploads/batch"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: GET /uploads/batch/{batch_id}
+resource "aws_apigatewayv2_route" "get_batch" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "GET /uploads/batch/{batch_id}"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: GET /questions?ids=a,b,c
+resource "aws_apigatewayv2_route" "get_questions_batch" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "GET /questions"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: GET /export
+resource "aws_apigatewayv2_route" "export" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "GET /export"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: POST /grade
+resource "aws_apigatewayv2_route" "grade" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /grade"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
+# Route: POST /quizzes/compose
+resource "aws_apigatewayv2_route" "compose_quiz" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /quizzes/compose"
+  target    = "integrations/${aws_apigatewayv2_integration.lambda.id}"
+}
+
 # Route: GET /health
 resource "aws_apigatewayv2_route" "health" {
   api_id    = aws_apigatewayv2_api.main.id
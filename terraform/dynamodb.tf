@@ -19,6 +19,16 @@ resource "aws_dynamodb_table" "questions" {
     type = "S"
   }
 
+  attribute {
+    name = "topic_key"
+    type = "S"
+  }
+
+  attribute {
+    name = "type_difficulty"
+    type = "S"
+  }
+
   # Global Secondary Index for querying by upload_id
   global_secondary_index {
     name            = "upload_id-created_at-index"
@@ -27,6 +37,21 @@ resource "aws_dynamodb_table" "questions" {
     projection_type = "ALL"
   }
 
+  # Keys-only index of questions by normalized topic, for composing quizzes
+  # across uploads (sort key "MCQ#" or "SHORT#<difficulty>")
+  global_secondary_index {
+    name            = "topic_key-type_difficulty-index"
+    hash_key        = "topic_key"
+    range_key       = "type_difficulty"
+    projection_type = "KEYS_ONLY"
+  }
+
+  # Expire items at the end of the retention period (see lifecycle.py)
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
   tags = {
     Name = "${local.name_prefix}-questions"
   }
@@ -48,6 +73,11 @@ resource "aws_dynamodb_table" "uploads" {
     type = "S"
   }
 
+  attribute {
+    name = "archive_day"
+    type = "S"
+  }
+
   # Global Secondary Index for listing uploads by date
   global_secondary_index {
     name            = "created_at-index"
@@ -55,7 +85,80 @@ resource "aws_dynamodb_table" "uploads" {
     projection_type = "ALL"
   }
 
+  # Keys-only index of uploads by the day they are due for archival
+  global_secondary_index {
+    name            = "archive_day-index"
+    hash_key        = "archive_day"
+    projection_type = "KEYS_ONLY"
+  }
+
+  # Expire items at the end of the retention period (see lifecycle.py)
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
   tags = {
     Name = "${local.name_prefix}-uploads"
   }
 }
+
+# DynamoDB table mapping document content hashes to completed uploads
+resource "aws_dynamodb_table" "content_hashes" {
+  name         = "${local.name_prefix}-content-hashes"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "content_hash"
+
+  attribute {
+    name = "content_hash"
+    type = "S"
+  }
+
+  # Expire items at the end of the retention period (see lifecycle.py)
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name = "${local.name_prefix}-content-hashes"
+  }
+}
+
+# Generation slots - leases capping concurrent Gemini calls across invocations
+resource "aws_dynamodb_table" "generation_slots" {
+  name         = "${local.name_prefix}-generation-slots"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "slot_id"
+
+  attribute {
+    name = "slot_id"
+    type = "S"
+  }
+
+  tags = {
+    Name = "${local.name_prefix}-generation-slots"
+  }
+}
+
+# Batches Table - groups the uploads of a multi-file upload
+resource "aws_dynamodb_table" "batches" {
+  name         = "${local.name_prefix}-batches"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "batch_id"
+
+  attribute {
+    name = "batch_id"
+    type = "S"
+  }
+
+  # Expire items at the end of the retention period (see lifecycle.py)
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name = "${local.name_prefix}-batches"
+  }
+}
@@ -0,0 +1,23 @@
+# Daily run archiving uploads before their retention period ends
+resource "aws_cloudwatch_event_rule" "archive_uploads" {
+  name                = "${local.name_prefix}-archive-uploads"
+  description         = "Archive uploads nearing the end of their retention period"
+  schedule_expression = "cron(0 3 * * ? *)"
+
+  tags = {
+    Name = "${local.name_prefix}-archive-uploads"
+  }
+}
+
+resource "aws_cloudwatch_event_target" "archive_uploads" {
+  rule = aws_cloudwatch_event_rule.archive_uploads.name
+  arn  = aws_lambda_function.processor.arn
+}
+
+resource "aws_lambda_permission" "archive_uploads" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.processor.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.archive_uploads.arn
+}
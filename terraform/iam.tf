@@ -50,7 +50,8 @@ resource "aws_iam_role_policy" "lambda_s3" {
         Action = [
           "s3:GetObject",
           "s3:PutObject",
-          "s3:DeleteObject"
+          "s3:DeleteObject",
+          "s3:AbortMultipartUpload"
         ]
         Resource = "${aws_s3_bucket.uploads.arn}/*"
       },
@@ -81,15 +82,70 @@ resource "aws_iam_role_policy" "lambda_dynamodb" {
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:BatchGetItem"
         ]
         Resource = [
           aws_dynamodb_table.questions.arn,
           "${aws_dynamodb_table.questions.arn}/index/*",
           aws_dynamodb_table.uploads.arn,
-          "${aws_dynamodb_table.uploads.arn}/index/*"
+          "${aws_dynamodb_table.uploads.arn}/index/*",
+          aws_dynamodb_table.content_hashes.arn,
+          aws_dynamodb_table.batches.arn,
+          aws_dynamodb_table.generation_slots.arn
         ]
       }
     ]
   })
 }
+
+# Processing queue policy
+resource "aws_iam_role_policy" "lambda_sqs" {
+  name = "${local.name_prefix}-lambda-sqs"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = [
+          aws_sqs_queue.processing.arn,
+          aws_sqs_queue.large_jobs.arn
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:SendMessage"
+        ]
+        Resource = aws_sqs_queue.large_jobs.arn
+      }
+    ]
+  })
+}
+
+# Self-invoke policy for asynchronous question regeneration
+resource "aws_iam_role_policy" "lambda_invoke" {
+  name = "${local.name_prefix}-lambda-invoke"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:InvokeFunction"
+        ]
+        Resource = aws_lambda_function.processor.arn
+      }
+    ]
+  })
+}
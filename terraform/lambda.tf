@@ -44,28 +44,52 @@ resource "aws_lambda_function" "processor" {
 
   environment {
     variables = {
-      GEMINI_API_KEY   = var.gemini_api_key
-      DYNAMODB_TABLE   = aws_dynamodb_table.questions.name
-      UPLOADS_TABLE    = aws_dynamodb_table.uploads.name
-      UPLOADS_BUCKET   = aws_s3_bucket.uploads.id
-      AWS_REGION_NAME  = var.aws_region
+      GEMINI_API_KEY             = var.gemini_api_key
+      DYNAMODB_TABLE             = aws_dynamodb_table.questions.name
+      UPLOADS_TABLE              = aws_dynamodb_table.uploads.name
+      CONTENT_HASH_TABLE         = aws_dynamodb_table.content_hashes.name
+      BATCHES_TABLE              = aws_dynamodb_table.batches.name
+      GENERATION_SLOTS_TABLE     = aws_dynamodb_table.generation_slots.name
+      UPLOADS_BUCKET             = aws_s3_bucket.uploads.id
+      AWS_REGION_NAME            = var.aws_region
+      PROCESSING_QUEUE_URL       = aws_sqs_queue.processing.url
+      MAX_QUEUED_UPLOADS         = var.max_queued_uploads
+      MAX_PROCESSING_CONCURRENCY = var.max_processing_concurrency
+      MAX_GENERATION_CONCURRENCY = var.max_generation_concurrency
+      LARGE_JOB_QUEUE_URL        = aws_sqs_queue.large_jobs.url
+      UPLOAD_RETENTION_DAYS      = var.data_retention_days
+      ARCHIVE_RETENTION_DAYS     = var.archive_retention_days
     }
   }
 
   depends_on = [
     aws_iam_role_policy.lambda_logs,
     aws_iam_role_policy.lambda_s3,
-    aws_iam_role_policy.lambda_dynamodb
+    aws_iam_role_policy.lambda_dynamodb,
+    aws_iam_role_policy.lambda_sqs
   ]
 }
 
-# Permission for S3 to invoke Lambda
-resource "aws_lambda_permission" "s3_invoke" {
-  statement_id  = "AllowS3Invoke"
-  action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.processor.function_name
-  principal     = "s3.amazonaws.com"
-  source_arn    = aws_s3_bucket.uploads.arn
+# Process queued upload notifications, at most max_processing_concurrency at a time
+resource "aws_lambda_event_source_mapping" "processing_queue" {
+  event_source_arn = aws_sqs_queue.processing.arn
+  function_name    = aws_lambda_function.processor.arn
+  batch_size       = 1
+
+  scaling_config {
+    maximum_concurrency = var.max_processing_concurrency
+  }
+}
+
+# Process large uploads in their own lane, at most max_large_job_concurrency at a time
+resource "aws_lambda_event_source_mapping" "large_jobs_queue" {
+  event_source_arn = aws_sqs_queue.large_jobs.arn
+  function_name    = aws_lambda_function.processor.arn
+  batch_size       = 1
+
+  scaling_config {
+    maximum_concurrency = var.max_large_job_concurrency
+  }
 }
 
 # Permission for API Gateway to invoke Lambda
@@ -47,3 +47,8 @@ output "aws_region" {
   description = "AWS region"
   value       = var.aws_region
 }
+
+output "processing_queue_url" {
+  description = "SQS queue of uploads waiting to be processed"
+  value       = aws_sqs_queue.processing.url
+}
@@ -15,6 +15,75 @@ resource "aws_s3_bucket_cors_configuration" "uploads_cors" {
   }
 }
 
+# Clean up parts of multipart uploads that were never completed, expire
+# uploaded files and extracted text with their DynamoDB items, and move
+# archives of expired uploads (see lifecycle.py) to cheaper storage
+resource "aws_s3_bucket_lifecycle_configuration" "uploads" {
+  bucket = aws_s3_bucket.uploads.id
+
+  rule {
+    id     = "abort-incomplete-multipart-uploads"
+    status = "Enabled"
+
+    filter {
+      prefix = "uploads/"
+    }
+
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+  }
+
+  rule {
+    id     = "expire-uploads"
+    status = "Enabled"
+
+    filter {
+      prefix = "uploads/"
+    }
+
+    expiration {
+      days = var.data_retention_days
+    }
+  }
+
+  rule {
+    id     = "expire-extracted"
+    status = "Enabled"
+
+    filter {
+      prefix = "extracted/"
+    }
+
+    expiration {
+      days = var.data_retention_days
+    }
+  }
+
+  rule {
+    id     = "archives"
+    status = "Enabled"
+
+    filter {
+      prefix = "archives/"
+    }
+
+    transition {
+      days          = 30
+      storage_class = "STANDARD_IA"
+    }
+
+    transition {
+      days          = 90
+      storage_class = "GLACIER_IR"
+    }
+
+    expiration {
+      days = var.archive_retention_days
+    }
+  }
+}
+
 resource "aws_s3_bucket_public_access_block" "uploads" {
   bucket = aws_s3_bucket.uploads.id
 
@@ -82,15 +151,15 @@ resource "aws_s3_bucket_public_access_block" "lambda_artifacts" {
   restrict_public_buckets = true
 }
 
-# S3 notification for Lambda trigger
+# S3 notification to the processing queue (see sqs.tf)
 resource "aws_s3_bucket_notification" "uploads_notification" {
   bucket = aws_s3_bucket.uploads.id
 
-  lambda_function {
-    lambda_function_arn = aws_lambda_function.processor.arn
-    events              = ["s3:ObjectCreated:*"]
-    filter_prefix       = "uploads/"
+  queue {
+    queue_arn     = aws_sqs_queue.processing.arn
+    events        = ["s3:ObjectCreated:*"]
+    filter_prefix = "uploads/"
   }
 
-  depends_on = [aws_lambda_permission.s3_invoke]
+  depends_on = [aws_sqs_queue_policy.processing]
 }
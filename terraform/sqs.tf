@@ -0,0 +1,71 @@
+# Queue of S3 upload notifications, drained by the processor with bounded
+# concurrency so bursts of uploads wait instead of overloading the model quota
+resource "aws_sqs_queue" "processing" {
+  name = "${local.name_prefix}-processing"
+
+  # Six times the processor's 300 s timeout, as AWS recommends for Lambda
+  # sources; also the delay before a failed upload is retried
+  visibility_timeout_seconds = 1800
+  message_retention_seconds  = 86400 # 1 day
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.processing_dlq.arn
+    maxReceiveCount     = 3
+  })
+
+  tags = {
+    Name = "${local.name_prefix}-processing"
+  }
+}
+
+# Uploads the processor estimates to be slow (large PDFs) are moved here and
+# processed with their own concurrency, so they neither delay short uploads
+# nor get starved by them
+resource "aws_sqs_queue" "large_jobs" {
+  name                       = "${local.name_prefix}-large-jobs"
+  visibility_timeout_seconds = 1800
+  message_retention_seconds  = 86400 # 1 day
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.processing_dlq.arn
+    maxReceiveCount     = 3
+  })
+
+  tags = {
+    Name = "${local.name_prefix}-large-jobs"
+  }
+}
+
+# Notifications that failed processing repeatedly
+resource "aws_sqs_queue" "processing_dlq" {
+  name                      = "${local.name_prefix}-processing-dlq"
+  message_retention_seconds = 1209600 # 14 days
+
+  tags = {
+    Name = "${local.name_prefix}-processing-dlq"
+  }
+}
+
+# Allow the uploads bucket to send notifications to the queue
+resource "aws_sqs_queue_policy" "processing" {
+  queue_url = aws_sqs_queue.processing.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Principal = {
+          Service = "s3.amazonaws.com"
+        }
+        Action   = "sqs:SendMessage"
+        Resource = aws_sqs_queue.processing.arn
+        Condition = {
+          ArnEquals = {
+            "aws:SourceArn" = aws_s3_bucket.uploads.arn
+          }
+        }
+      }
+    ]
+  })
+}
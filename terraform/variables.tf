@@ -21,3 +21,39 @@ variable "environment" {
   type        = string
   default     = "dev"
 }
+
+variable "max_processing_concurrency" {
+  description = "Uploads processed at once (Lambda SQS sources need at least 2)"
+  type        = number
+  default     = 10
+}
+
+variable "max_large_job_concurrency" {
+  description = "Large uploads (estimated slow, e.g. long PDFs) processed at once, in addition to max_processing_concurrency"
+  type        = number
+  default     = 2
+}
+
+variable "max_generation_concurrency" {
+  description = "Gemini calls in flight at once across all invocations (0 for no limit); extraction is limited only by the queue concurrency"
+  type        = number
+  default     = 6
+}
+
+variable "max_queued_uploads" {
+  description = "Uploads waiting in the processing queue before new ones get 429"
+  type        = number
+  default     = 200
+}
+
+variable "data_retention_days" {
+  description = "Days uploads, their questions and files are kept (archived 7 days before they expire)"
+  type        = number
+  default     = 180
+}
+
+variable "archive_retention_days" {
+  description = "Days archives of expired uploads are kept"
+  type        = number
+  default     = 730
+}